@@ -1,8 +1,14 @@
 import streamlit as st
 import asyncio
 import nest_asyncio
+import os # Import os for file path operations
 import random
-import re # Import regex for salary parsing
+import sys # Import sys to reach the shared modules package
+
+# Shared helpers live in job-agent-mcp/modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "..", "job-agent-mcp")))
+# Salary strings -> annual (min, max) in SALARY_BASE_CURRENCY
+from modules.salary import parse_salary
 
 # Ensure nest_asyncio is applied if not already done in the session
 nest_asyncio.apply()
@@ -21,17 +27,6 @@ class Agent:
         self.instruction = instruction
         self.tools = tools
 
-# Helper function to parse salary from string
-def parse_salary(salary_str: str) -> int:
-    if not salary_str: return 0
-    # Remove non-numeric characters except comma, then remove comma, then convert to int
-    numeric_str = re.sub(r'[^\\d,]', '', salary_str)
-    numeric_str = numeric_str.replace(',', '')
-    try:
-        return int(numeric_str)
-    except ValueError:
-        return 0
-
 # Re-create dummy functions for independent execution of this cell if needed
 def job_search(query: str, max_results: int = 5) -> list:
     sample_jobs = [
@@ -117,14 +112,15 @@ class CoordinatorAgent(Agent):
         def score_job(job: dict) -> int:
             score = 0
             job_text = (job.get('title', '') + ' ' + job.get('description', '')).lower()
-            job_salary = parse_salary(job.get('salary', ''))
+            # Top of the posted range; None when the posting has no salary
+            _, job_salary = parse_salary(job.get('salary', ''))
 
             # Skill matching
             matched_skills_count = sum(1 for skill in candidate_skills if skill in job_text)
             score += matched_skills_count * 10 # Each skill match adds 10 points
 
             # Salary matching
-            if job_salary >= salary_expectation:
+            if job_salary is not None and job_salary >= salary_expectation:
                 score += 5 # Meeting salary expectation adds 5 points
 
             # Prioritize 'Senior Engineer' in title if specifically searched for and available
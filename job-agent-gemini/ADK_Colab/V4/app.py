@@ -1,7 +1,6 @@
 import streamlit as st
 import os # Import os for file path operations
-import io # Import io for handling in-memory binary streams
-import PyPDF2 # Import PyPDF2 for PDF text extraction
+import sys # Import sys to reach the shared modules package
 from dotenv import load_dotenv
 
 # Assuming `extract_text_from_url` is defined elsewhere or will be defined above this block.
@@ -21,26 +20,19 @@ from dotenv import load_dotenv
 import asyncio
 import nest_asyncio
 import random
-import re # Import regex for salary parsing
-import json # Import json for parsing LLM output
 import google.generativeai as gen
 import requests
-from bs4 import BeautifulSoup
+
+# Shared resume/JD helpers live in job-agent-mcp/modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "job-agent-mcp")))
+from modules.uploads import extract_text_from_upload
+from modules.web_fetch import PageFetcher
+from modules.snapshots import SnapshotStore
+from modules.report_schema import ReportValidationError, describe_report_fields, parse_report
 
 # Ensure nest_asyncio is applied if not already done in the session
 nest_asyncio.apply()
 
-# Helper function to parse salary from string (might not be used in current workflow but kept for consistency)
-def parse_salary(salary_str: str) -> int:
-    if not salary_str: return 0
-    # Remove non-numeric characters except comma, then remove comma, then convert to int
-    numeric_str = re.sub(r'[^\\d,]', '', salary_str)
-    numeric_str = numeric_str.replace(',', '')
-    try:
-        return int(numeric_str)
-    except ValueError:
-        return 0
-
 # Assuming Tool, Agent are defined in previous cells and are available in scope.
 # Re-defining them here for clarity in this single block if notebook state is reset
 class Tool:
@@ -55,29 +47,20 @@ class Agent:
         self.instruction = instruction
         self.tools = tools
 
+# One pooled HTTP session plus an on-disk HTTP cache (Cache-Control/ETag/Last-Modified) and
+# extracted-text cache shared across reruns, so re-analysing a posting skips the network.
+# Fetched pages are also snapshotted (JOB_SNAPSHOT_DIR); JOB_FETCH_OFFLINE=1 replays them
+# without any network access.
+@st.cache_resource
+def get_page_fetcher():
+    return PageFetcher(timeout=10, snapshots=SnapshotStore(),
+                       offline=os.getenv("JOB_FETCH_OFFLINE", "0") == "1")
+
 # Helper function to extract text from URL
 def extract_text_from_url(url: str) -> str:
     """Extracts text content from a given URL, typically for a job description."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script and style elements
-        for script_or_style in soup(['script', 'style']):
-            script_or_style.extract()
-
-        # Get text and clean it
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        return get_page_fetcher().fetch_text(url)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching URL {url}: {e}")
         return ""
@@ -139,15 +122,8 @@ Here is the Job Description:
 
 Please perform the following steps and provide your output as a JSON object ONLY. Do not include any other text or explanation outside the JSON.
 
-JSON Schema:
-{{
-    "candidate_skills": ["string"], # List of key technical and soft skills explicitly mentioned in the resume.
-    "required_job_skills": ["string"], # List of essential technical and soft skills mentioned in the job description.
-    "matched_skills": ["string"], # Skills present in both the resume and the job description.
-    "missing_skills": ["string"], # Skills required by the job description but NOT found in the resume.
-    "additional_skills": ["string"], # Skills present in the resume but not explicitly required by the job description.
-    "overall_fit_summary": "string" # A brief summary of how well the candidate's skills align with the job requirements.
-}}
+Fill in these fields of the JSON report:
+{describe_report_fields()}
 """
 
     try:
@@ -155,7 +131,8 @@ JSON Schema:
         if llm_model is None:
             return "Error: LLM model not initialized."
 
-        response = llm_model.generate_content(prompt)
+        # JSON mode: the legacy google.generativeai SDK returns the report without prose or fences
+        response = llm_model.generate_content(prompt, generation_config=gen.GenerationConfig(response_mime_type="application/json"))
         return response.text
     except Exception as e:
         return f"Error during LLM analysis: {e}"
@@ -172,14 +149,10 @@ def analyze_resume_job_description_full(resume_text: str, job_description_text:
         return {"analysis_status": "failure", "message": analysis_report}
     else:
         try:
-            # Remove markdown code block fences if present
-            cleaned_report = analysis_report.strip()
-            if cleaned_report.startswith('```json') and cleaned_report.endswith('```'):
-                cleaned_report = cleaned_report[len('```json'):-len('```')].strip()
-
-            parsed_report = json.loads(cleaned_report)
+            # Validated against the shared report schema; near-valid JSON is repaired
+            parsed_report = parse_report(analysis_report).to_dict()
             return {"analysis_status": "success", "message": "LLM-based analysis completed and parsed.", "parsed_report": parsed_report}
-        except json.JSONDecodeError as e:
+        except ReportValidationError as e:
             return {"analysis_status": "failure", "message": f"Failed to parse LLM output as JSON: {e}", "raw_report": analysis_report}
         except Exception as e:
             return {"analysis_status": "failure", "message": f"An unexpected error occurred during JSON parsing: {e}", "raw_report": analysis_report}
@@ -271,9 +244,9 @@ job_url_input = st.sidebar.text_input(
 )
 
 uploaded_resume_file = st.sidebar.file_uploader(
-    "Upload Your Resume (PDF)",
-    type=["pdf"],
-    help="Upload your resume in PDF format."
+    "Upload Your Resume (PDF or DOCX)",
+    type=["pdf", "docx"],
+    help="Upload your resume in PDF or DOCX format."
 )
 
 # 6. Basic validation for inputs
@@ -293,13 +266,13 @@ if uploaded_resume_file is not None:
 if st.sidebar.button("Run Analysis", disabled=(not is_valid_job_url or not is_resume_uploaded)):
     if is_valid_job_url and is_resume_uploaded:
         with st.spinner("Processing resume and fetching job description..."):
-            # Read uploaded PDF file
+            # Read uploaded resume file
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_resume_file.getvalue()))
-                resume_text = "".join([page.extract_text() for page in pdf_reader.pages])
+                # Parse straight from the upload buffer instead of copying it via getvalue()
+                resume_text = extract_text_from_upload(uploaded_resume_file)
                 st.success("Resume extracted successfully.")
             except Exception as e:
-                st.error(f"Error reading resume PDF: {e}")
+                st.error(f"Error reading resume: {e}")
                 resume_text = ""
 
             # Fetch job description from URL
@@ -1,34 +1,32 @@
 import streamlit as st
 import os
-import io
-import PyPDF2
+import sys
 import asyncio
 import nest_asyncio
 import random
-import re
 import json
-import openai
-from openai import OpenAI
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+# Shared resume/JD helpers live in job-agent-mcp/modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "job-agent-mcp")))
+from modules.uploads import extract_text_from_upload
+from modules.web_fetch import PageFetcher
+from modules.snapshots import SnapshotStore
+from modules.compaction import compact_prompt_inputs
+from modules.llm_cache import ResponseCache
+from modules.llm_client import OpenAIProvider, RateLimiter
+from modules.llm_router import STREAM_RESTART, ProviderRouter, cache_model_id, is_json_response, providers_from_env
+from modules.json_stream import IncrementalJSONObjectParser
+from modules.report_schema import (REPORT_FIELD_DESCRIPTIONS, REPORT_JSON_SCHEMA, SKILL_LIST_FIELDS, SUMMARY_JSON_SCHEMA,
+                                   ReportValidationError, coerce_report_field, describe_report_fields, parse_report)
+from modules.skill_matcher import match_skills
+from modules.llm_metrics import METRICS
 # Load .env file
 load_dotenv()
 
 # Ensure nest_asyncio is applied if not already done in the session
 nest_asyncio.apply()
 
-# Helper function to parse salary from string (might not be used in current workflow but kept for consistency)
-def parse_salary(salary_str: str) -> int:
-    if not salary_str: return 0
-    # Remove non-numeric characters except comma, then remove comma, then convert to int
-    numeric_str = re.sub(r'[^\\d,]', '', salary_str)
-    numeric_str = numeric_str.replace(',', '')
-    try:
-        return int(numeric_str)
-    except ValueError:
-        return 0
-
 # Tool and Agent class definitions
 class Tool:
     def __init__(self, func, name, description):
@@ -42,30 +40,20 @@ class Agent:
         self.instruction = instruction
         self.tools = tools
 
+# One pooled HTTP session plus an on-disk HTTP cache (Cache-Control/ETag/Last-Modified) and
+# extracted-text cache shared across reruns, so re-analysing a posting skips the network.
+# Fetched pages are also snapshotted (JOB_SNAPSHOT_DIR); JOB_FETCH_OFFLINE=1 replays them
+# without any network access.
+@st.cache_resource
+def get_page_fetcher():
+    return PageFetcher(timeout=10, snapshots=SnapshotStore(),
+                       offline=os.getenv("JOB_FETCH_OFFLINE", "0") == "1")
+
 # Helper function to extract text from URL
 def extract_text_from_url(url: str) -> str:
     """Extracts text content from a given URL, typically for a job description."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        # Modified: Increased timeout from 10 to 30 seconds
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script and style elements
-        for script_or_style in soup(['script', 'style']):
-            script_or_style.extract()
-
-        # Get text and clean it
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        return get_page_fetcher().fetch_text(url)
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching URL {url}: {e}") # Use st.error for Streamlit
         return ""
@@ -74,8 +62,17 @@ def extract_text_from_url(url: str) -> str:
         return ""
 
 # OpenAI Model setup
-openai_client = None
 llm_model_name = "gpt-4.1-mini" # Default to a commonly available OpenAI model
+# Bump whenever the analysis prompt changes so cached reports from the old prompt are not reused
+PROMPT_VERSION = "skills-gaps-v5"
+
+# Disk-backed cache of raw LLM reports; identical resume/JD pairs skip the LLM call.
+# st.cache_resource keeps one SQLite connection across Streamlit reruns.
+@st.cache_resource
+def get_llm_cache():
+    return ResponseCache()
+
+llm_cache = get_llm_cache()
 
 # Configure the OpenAI client
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -86,83 +83,182 @@ if not OPENAI_API_KEY or OPENAI_API_KEY == "YOUR_OPENAI_API_KEY_HERE":
     st.sidebar.warning("Please provide your OpenAI API Key to continue. (Set as environment variable or in st.secrets)")
     st.stop() # Stop the app if API key is missing
 
-try:
-    openai_client = OpenAI(api_key=OPENAI_API_KEY)
-    # st.sidebar.success(f"OpenAI client initialized with model: {llm_model_name}") # Suppress this print in the final UI
-except Exception as e:
-    st.sidebar.error(f"Error initializing OpenAI client: {e}. Please check your API key and network connection.")
-    st.stop()
-
-def analyze_skills_and_gaps(resume_text: str, job_description_text: str) -> str:
-    """Analyzes a candidate's resume against a job description using the LLM to identify skills and gaps."""
-    system_prompt = """You are an expert HR analyst. Your task is to compare a candidate's resume with a job description. \
+# Async OpenAI provider, cached as a resource so the rate limiter's request/token budgets
+# are shared across Streamlit reruns and sessions. The SDK client itself is created lazily.
+@st.cache_resource
+def get_llm_provider():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=200_000, max_in_flight=4)
+    primary = OpenAIProvider(model=llm_model_name, api_key=OPENAI_API_KEY, limiter=limiter)
+    # Any other provider with an API key in the environment (GOOGLE_API_KEY, OPENAI_API_KEY,
+    # GROQ_API_KEY) joins a router that picks the fastest healthy one and hedges slow calls
+    fallbacks = providers_from_env(exclude=(primary.name,))
+    if not fallbacks:
+        return primary
+    return ProviderRouter([primary] + fallbacks, validator=is_json_response)
+
+llm_provider = get_llm_provider()
+
+# Prometheus metrics for every LLM call (tokens, latency, cost, cache hits) at
+# http://<host>:$LLM_METRICS_PORT/metrics; started once per server process.
+@st.cache_resource
+def start_metrics_exporter():
+    port = os.getenv("LLM_METRICS_PORT")
+    return METRICS.serve(int(port)) if port else None
+
+start_metrics_exporter()
+
+ANALYSIS_SYSTEM_PROMPT = """You are an expert HR analyst. Your task is to compare a candidate's resume with a job description. \
     Provide your output as a JSON object ONLY. Do not include any other text or explanation outside the JSON."""
 
-    user_prompt = f"""Here is the candidate's Resume:
+def build_resume_prefix(resume_text: str) -> str:
+    """The resume part of every analysis prompt. It leads the user message and is identical
+    across jobs, so the provider can serve it from its prompt cache."""
+    return f"""Here is the candidate's Resume:
 ---
 {resume_text}
 ---
+"""
 
+def build_analysis_prompt(job_description_text: str) -> str:
+    """Builds the user prompt, after the resume prefix, for the skills/gaps analysis of one job description."""
+    return f"""
 Here is the Job Description:
 ---
 {job_description_text}
 ---
 
-JSON Schema:
-{{
-    "candidate_skills": ["string"], # List of key technical and soft skills explicitly mentioned in the resume.
-    "required_job_skills": ["string"], # List of essential technical and soft skills mentioned in the job description.
-    "matched_skills": ["string"], # Skills present in both the resume and the job description.
-    "missing_skills": ["string"], # Skills required by the job description but NOT found in the resume.
-    "additional_skills": ["string"], # Skills present in the resume but not explicitly required by the job description.
-    "overall_fit_summary": "string" # A brief summary of how well the candidate's skills align with the job requirements.
-}}
+Fill in these fields of the JSON report:
+{describe_report_fields()}
 """
 
-    try:
-        if openai_client is None:
-            return "Error: OpenAI client not initialized."
-
-        response = openai_client.chat.completions.create(
-            model=llm_model_name,
-            response_format={ "type": "json_object" }, # Specify JSON output
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Error during LLM analysis: {e}"
+def build_summary_prompt(job_description_text: str, skill_report) -> str:
+    """Builds the user prompt, after the resume prefix, asking only for overall_fit_summary; the skill lists were matched locally."""
+    return f"""
+Here is the Job Description:
+---
+{job_description_text}
+---
 
-def analyze_resume_job_description_full(resume_text: str, job_description_text: str) -> dict:
-    """Performs a full resume and job description analysis using the LLM.
-    This function replaces the placeholder and calls analyze_skills_and_gaps.
+Skill matching has already been done:
+Matched skills: {', '.join(skill_report.matched_skills) or 'none'}
+Missing skills: {', '.join(skill_report.missing_skills) or 'none'}
+Additional skills: {', '.join(skill_report.additional_skills) or 'none'}
+
+Summarise how well the resume fits this job. Fill in only this field of the JSON report:
+- "overall_fit_summary" (string): {REPORT_FIELD_DESCRIPTIONS['overall_fit_summary']}
+"""
+
+async def analyze_skills_and_gaps(resume_text: str, job_description_text: str, skill_report=None):
+    """Analyzes a candidate's resume against a job description using the LLM to identify skills and gaps.
+    Streams the raw model output as text chunks. Given a locally matched skill_report, only
+    overall_fit_summary is requested.
     """
+    if skill_report is not None:
+        prompt, schema = build_summary_prompt(job_description_text, skill_report), SUMMARY_JSON_SCHEMA
+    else:
+        prompt, schema = build_analysis_prompt(job_description_text), REPORT_JSON_SCHEMA
+    # Awaited on the async client so run_live does not block the event loop
+    # System prompt + resume form a stable prefix that repeat analyses of the same resume reuse
+    async for chunk in llm_provider.stream(prompt, system=ANALYSIS_SYSTEM_PROMPT, response_schema=schema, # Structured JSON output
+                                           prefix=build_resume_prefix(resume_text)):
+        yield chunk
+
+async def analyze_resume_job_description_stream(resume_text: str, job_description_text: str, fast_mode: bool = False):
+    """Streams a full resume and job description analysis.
+    Yields ("field", key, value) as each top-level field of the JSON report closes, then
+    ("result", analysis_result) with the same dict analyze_resume_job_description_full returns.
+    ("restart", message) means the provider router discarded invalid output; the fields that
+    follow replace the ones yielded before it.
+
+    Skill lists come from the local dictionary matcher; the LLM only writes the summary,
+    or is skipped entirely in fast_mode. If the matcher finds no required skills in the
+    job description, the LLM produces the whole report instead.
+    """
+    # Deterministic skill matching takes milliseconds, so it runs before any cache or LLM work
+    skill_report = match_skills(resume_text, job_description_text)
+    if fast_mode:
+        parsed_report = skill_report.to_dict()
+        for key, value in parsed_report.items():
+            yield ("field", key, value)
+        yield ("result", {"analysis_status": "success", "message": "Fast mode: skills matched locally, no LLM call made.", "parsed_report": parsed_report, "cache_hit": False})
+        return
+
     # Use st.info for Streamlit progress updates
     st.info(f"Initiating LLM-based analysis for resume (length: {len(resume_text)}) and job description (length: {len(job_description_text)}).")
-    analysis_report = analyze_skills_and_gaps(resume_text, job_description_text)
+    cache_key = ResponseCache.make_key(cache_model_id(llm_provider), PROMPT_VERSION, resume_text, job_description_text)
+    cached_report = llm_cache.get(cache_key)
+    METRICS.record_cache_lookup(cached_report is not None)
+    if cached_report is not None:
+        try:
+            parsed_report = parse_report(cached_report).to_dict()
+            for key, value in parsed_report.items():
+                yield ("field", key, value)
+            yield ("result", {"analysis_status": "success", "message": "Analysis loaded from cache.", "parsed_report": parsed_report, "cache_hit": True})
+            return
+        except ReportValidationError:
+            pass
+
+    # Dedupe, strip page boilerplate and keep only the relevant sections within a token budget
+    compacted = compact_prompt_inputs(resume_text, job_description_text)
+    compaction_message = f"Prompt compacted from ~{compacted.tokens_before} to ~{compacted.tokens_after} tokens."
+    st.info(compaction_message)
 
-    if "Error during LLM analysis" in analysis_report:
-        return {"analysis_status": "failure", "message": analysis_report}
+    if not skill_report.required_job_skills:
+        # Nothing in the job description matched the skill dictionary; the LLM extracts the skills too
+        skill_report = None
     else:
-        try:
-            cleaned_report = analysis_report.strip()
-            if cleaned_report.startswith('```json') and cleaned_report.endswith('```'):
-                cleaned_report = cleaned_report[len('```json'):-len('```')].strip()
-
-            parsed_report = json.loads(cleaned_report)
-            return {"analysis_status": "success", "message": "LLM-based analysis completed and parsed.", "parsed_report": parsed_report}
-        except json.JSONDecodeError as e:
-            return {"analysis_status": "failure", "message": f"Failed to parse LLM output as JSON: {e}", "raw_report": analysis_report}
-        except Exception as e:
-            return {"analysis_status": "failure", "message": f"An unexpected error occurred during JSON parsing: {e}", "raw_report": analysis_report}
+        for key in SKILL_LIST_FIELDS:
+            yield ("field", key, getattr(skill_report, key))
+
+    # Fields are parsed as soon as their value closes, so the report renders while the model is still writing
+    parser = IncrementalJSONObjectParser()
+    try:
+        async for chunk in analyze_skills_and_gaps(compacted.resume_text, compacted.job_description_text, skill_report):
+            if chunk is STREAM_RESTART:
+                # The router dropped an invalid answer; another provider's follows from the start
+                parser = IncrementalJSONObjectParser()
+                yield ("restart", "The model's output was invalid, so the analysis was retried with another provider.")
+                continue
+            for key, value in parser.feed(chunk):
+                yield ("field", key, coerce_report_field(key, value))
+    except Exception as e:
+        yield ("result", {"analysis_status": "failure", "message": f"Error during LLM analysis: {e}"})
+        return
+
+    analysis_report = parser.text
+    try:
+        # Validated against the report schema; near-valid JSON is repaired instead of re-requested
+        report = parse_report(analysis_report)
+        if skill_report is not None:
+            skill_report.overall_fit_summary = report.overall_fit_summary
+            skill_report.repaired = report.repaired
+            report = skill_report
+        parsed_report = report.to_dict()
+        # Only reports that validate are cached, stored in canonical form
+        llm_cache.set(cache_key, json.dumps(parsed_report))
+        repair_note = " (output repaired)" if report.repaired else ""
+        yield ("result", {"analysis_status": "success", "message": f"LLM-based analysis completed and parsed{repair_note}. {compaction_message}", "parsed_report": parsed_report, "cache_hit": False,
+                          "token_counts": {"before": compacted.tokens_before, "after": compacted.tokens_after}})
+    except ReportValidationError as e:
+        yield ("result", {"analysis_status": "failure", "message": f"Failed to parse LLM output as JSON: {e}", "raw_report": analysis_report})
+    except Exception as e:
+        yield ("result", {"analysis_status": "failure", "message": f"An unexpected error occurred during JSON parsing: {e}", "raw_report": analysis_report})
+
+async def analyze_resume_job_description_full(resume_text: str, job_description_text: str, fast_mode: bool = False) -> dict:
+    """Performs a full resume and job description analysis using the LLM.
+    Consumes analyze_resume_job_description_stream and returns only its final result.
+    """
+    analysis_result = {"analysis_status": "failure", "message": "LLM analysis produced no result."}
+    async for event in analyze_resume_job_description_stream(resume_text, job_description_text, fast_mode=fast_mode):
+        if event[0] == "result":
+            analysis_result = event[1]
+    return analysis_result
 
 # Re-define Tool instances
 analysis_tool = Tool(
-    func=analyze_resume_job_description_full,
+    func=analyze_resume_job_description_stream,
     name="analyze_resume_job_description",
-    description="Analyzes a candidate's resume against a job description to identify skills and gaps using an LLM."
+    description="Analyzes a candidate's resume against a job description to identify skills and gaps using an LLM, streaming each report field as it completes."
 )
 
 # Re-define Agent instances
@@ -172,13 +268,37 @@ candidate_agent = Agent(
     tools=[analysis_tool]
 )
 
+# Report sections in display order: (field, heading, highlighted as a gap)
+REPORT_SECTIONS = [
+    ("candidate_skills", "Candidate Skills", False),
+    ("required_job_skills", "Required Job Skills", False),
+    ("matched_skills", "Matched Skills", False),
+    ("missing_skills", "Missing Skills (Gaps)", True),
+    ("additional_skills", "Additional Skills", False),
+]
+
+def render_report_field_html(key: str, value) -> str:
+    """Renders one field of a parsed skills/gaps report; returns "" for unknown or empty fields."""
+    if key == 'overall_fit_summary':
+        return f"<p><b>Overall Fit Summary:</b> {value}</p>"
+    section = next((section for section in REPORT_SECTIONS if section[0] == key), None)
+    if section is None or not value:
+        return ""
+    _, heading, is_gap = section
+    style = " style=\"color:red;\"" if is_gap else ""
+    field_html_parts = [f"<h4{style}>{heading}:</h4><ul>"]
+    for skill in value:
+        field_html_parts.append(f"<li{style}>{skill}</li>")
+    field_html_parts.append("</ul>")
+    return "\n".join(field_html_parts)
+
 # Redefine CoordinatorAgent to reflect new workflow
 class CoordinatorAgent(Agent):
     def __init__(self, name: str, instruction: str, tools: list = None, sub_agents: list = None):
         super().__init__(name, instruction, tools if tools is not None else [])
         self.sub_agents = sub_agents if sub_agents is not None else []
 
-    async def run_live(self, resume_text: str, job_description_text: str):
+    async def run_live(self, resume_text: str, job_description_text: str, fast_mode: bool = False):
         yield f"🚀 CoordinatorAgent '{self.name}' initiating resume and job description analysis..."
 
         candidate_agent_found = next((agent for agent in self.sub_agents if agent.name == "candidate_agent"), None)
@@ -193,61 +313,26 @@ class CoordinatorAgent(Agent):
 
         yield f"⚙️ Delegating analysis to {candidate_agent_found.name} using {analysis_tool_instance.name} tool..."
         try:
-            analysis_result = analysis_tool_instance.func(resume_text, job_description_text)
+            analysis_result = {}
+            report_started = False
+            async for event in analysis_tool_instance.func(resume_text, job_description_text, fast_mode=fast_mode):
+                if event[0] == "result":
+                    analysis_result = event[1]
+                    continue
+                if event[0] == "restart":
+                    yield f"⚠️ {event[1]}"
+                    continue
+                _, key, value = event
+                field_html = render_report_field_html(key, value)
+                if not field_html:
+                    continue
+                if not report_started:
+                    yield "<h2>Analysis Report</h2>"
+                    report_started = True
+                yield field_html # Each field is shown as soon as the model finishes writing it
+
             if analysis_result.get('analysis_status') == 'success':
                 yield f"✅ Analysis complete: {analysis_result.get('message', 'No message provided.')}"
-                yield "<h2>Analysis Report</h2>" # Moved here to display after initial messages
-
-                parsed_report = analysis_result.get('parsed_report', {})
-
-                report_html_parts = []
-
-                # Overall Fit Summary
-                overall_fit_summary = parsed_report.get('overall_fit_summary', 'N/A')
-                report_html_parts.append(f"<p><b>Overall Fit Summary:</b> {overall_fit_summary}</p>")
-
-                # Candidate Skills
-                candidate_skills = parsed_report.get('candidate_skills', [])
-                if candidate_skills:
-                    report_html_parts.append("<h4>Candidate Skills:</h4><ul>")
-                    for skill in candidate_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Required Job Skills
-                required_job_skills = parsed_report.get('required_job_skills', [])
-                if required_job_skills:
-                    report_html_parts.append("<h4>Required Job Skills:</h4><ul>")
-                    for skill in required_job_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Matched Skills
-                matched_skills = parsed_report.get('matched_skills', [])
-                if matched_skills:
-                    report_html_parts.append("<h4>Matched Skills:</h4><ul>")
-                    for skill in matched_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Missing Skills
-                missing_skills = parsed_report.get('missing_skills', [])
-                if missing_skills:
-                    report_html_parts.append("<h4 style=\"color:red;\">Missing Skills (Gaps):</h4><ul>")
-                    for skill in missing_skills:
-                        report_html_parts.append(f"<li style=\"color:red;\">{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Additional Skills
-                additional_skills = parsed_report.get('additional_skills', [])
-                if additional_skills:
-                    report_html_parts.append("<h4>Additional Skills:</h4><ul>")
-                    for skill in additional_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                yield "\n".join(report_html_parts) # Yield the complete HTML string
-
             else:
                 yield f"❌ Analysis failed: {analysis_result.get('message', 'Unknown error.')}"
                 if 'raw_report' in analysis_result:
@@ -281,9 +366,14 @@ job_url_input = st.sidebar.text_input(
 )
 
 uploaded_resume_file = st.sidebar.file_uploader(
-    "Upload Your Resume (PDF)",
-    type=["pdf"],
-    help="Upload your resume in PDF format."
+    "Upload Your Resume (PDF or DOCX)",
+    type=["pdf", "docx"],
+    help="Upload your resume in PDF or DOCX format."
+)
+
+fast_mode = st.sidebar.checkbox(
+    "Fast mode (no LLM)",
+    help="Match skills locally with the skill dictionary and skip the LLM. Results in milliseconds, with a template summary."
 )
 
 is_valid_job_url = False
@@ -302,11 +392,11 @@ if st.sidebar.button("Run Analysis", disabled=(not is_valid_job_url or not is_re
         with st.spinner("Processing resume and fetching job description..."):
             resume_text = ""
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_resume_file.getvalue()))
-                resume_text = "".join([page.extract_text() for page in pdf_reader.pages])
+                # Parse straight from the upload buffer instead of copying it via getvalue()
+                resume_text = extract_text_from_upload(uploaded_resume_file)
                 st.success("Resume extracted successfully.")
             except Exception as e:
-                st.error(f"Error reading resume PDF: {e}")
+                st.error(f"Error reading resume: {e}")
                 resume_text = ""
 
             job_description_text = ""
@@ -328,24 +418,29 @@ if st.sidebar.button("Run Analysis", disabled=(not is_valid_job_url or not is_re
 
             async def run_analysis_workflow_streamlit(res_text: str, jd_text: str):
                 output_lines = []
-                total_steps = 7
+                total_steps = 10
                 current_step = 0
-                async for step_output in root_agent.run_live(res_text, jd_text):
+                async for step_output in root_agent.run_live(res_text, jd_text, fast_mode=fast_mode):
                     output_lines.append(step_output)
                     status_text.text(step_output)
                     current_step += 1
                     progress_bar.progress(min(current_step / total_steps, 1.0))
+                    # Show report fields as soon as they stream in
+                    report_container.markdown("\n".join(output_lines), unsafe_allow_html=True)
                 return output_lines
 
             st.write("Starting AI analysis...")
             full_report_lines = []
             # Use asyncio.run to execute the async generator
-            for step_output in asyncio.run(run_analysis_workflow_streamlit(resume_text, job_description_text)):
-                 full_report_lines.append(step_output)
+            with METRICS.run() as run_metrics:
+                for step_output in asyncio.run(run_analysis_workflow_streamlit(resume_text, job_description_text)):
+                     full_report_lines.append(step_output)
 
             progress_bar.empty()
             status_text.empty()
             report_container.markdown("\n".join(full_report_lines), unsafe_allow_html=True)
+            st.sidebar.subheader("LLM usage (this run)")
+            st.sidebar.markdown(run_metrics.summary_markdown())
 
         else:
             st.error("Analysis cannot be performed due to missing resume text or job description text.")
@@ -1,16 +1,31 @@
 import streamlit as st
 import os
-import io
-import PyPDF2
+import sys
 import asyncio
+import atexit
 import nest_asyncio
 import random
-import re
 import json
-from google import genai
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+# Shared resume/JD helpers live in job-agent-mcp/modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "job-agent-mcp")))
+from modules.uploads import extract_text_from_upload
+from modules.web_fetch import PageFetcher
+from modules.snapshots import SnapshotStore
+from modules.crawler import AsyncCrawler
+from modules.dedup import cluster_near_duplicates
+from modules.compaction import compact_prompt_inputs
+from modules.llm_cache import ResponseCache
+from modules.llm_client import ContextCacheTracker, GeminiProvider, RateLimiter, estimate_tokens
+from modules.llm_router import STREAM_RESTART, ProviderRouter, cache_model_id, is_json_response, providers_from_env
+from modules.json_stream import IncrementalJSONObjectParser
+from modules.report_schema import (BATCH_REPORT_JSON_SCHEMA, BATCH_SUMMARY_JSON_SCHEMA, REPORT_FIELD_DESCRIPTIONS, REPORT_JSON_SCHEMA, SKILL_LIST_FIELDS,
+                                   SUMMARY_JSON_SCHEMA, ReportValidationError, coerce_report_field, describe_report_fields,
+                                   parse_batch_reports, parse_report)
+from modules.skill_matcher import match_skills
+from modules.resume_sections import resume_hash
+from modules.llm_metrics import METRICS
 # Load .env file
 load_dotenv()
 
@@ -34,17 +49,6 @@ else:
 
 nest_asyncio.apply()
 
-# Helper function to parse salary from string (might not be used in current workflow but kept for consistency)
-def parse_salary(salary_str: str) -> int:
-    if not salary_str: return 0
-    # Remove non-numeric characters except comma, then remove comma, then convert to int
-    numeric_str = re.sub(r'[^\\d,]', '', salary_str)
-    numeric_str = numeric_str.replace(',', '')
-    try:
-        return int(numeric_str)
-    except ValueError:
-        return 0
-
 # Tool and Agent class definitions
 class Tool:
     def __init__(self, func, name, description):
@@ -58,30 +62,28 @@ class Agent:
         self.instruction = instruction
         self.tools = tools
 
+# One pooled HTTP session plus an on-disk HTTP cache (Cache-Control/ETag/Last-Modified) and
+# extracted-text cache shared across reruns, so re-analysing a posting skips the network.
+# Fetched pages are also snapshotted (JOB_SNAPSHOT_DIR); JOB_FETCH_OFFLINE=1 replays them
+# without any network access.
+@st.cache_resource
+def get_page_fetcher():
+    return PageFetcher(timeout=30, snapshots=SnapshotStore(),
+                       offline=os.getenv("JOB_FETCH_OFFLINE", "0") == "1")
+
+# Batch mode fetches all job URLs concurrently (per-host limits, robots.txt, politeness delays)
+# through the same HTTP cache. Set RESPECT_ROBOTS_TXT=0 to fetch pages robots.txt disallows.
+@st.cache_resource
+def get_job_crawler():
+    fetcher = get_page_fetcher()
+    return AsyncCrawler(cache=fetcher.cache, timeout=30, snapshots=fetcher.snapshots, offline=fetcher.offline,
+                        respect_robots=os.getenv("RESPECT_ROBOTS_TXT", "1") != "0")
+
 # Helper function to extract text from URL
 def extract_text_from_url(url: str) -> str:
     """Extracts text content from a given URL, typically for a job description."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/50 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        # Modified: Increased timeout from 10 to 30 seconds
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Remove script and style elements
-        for script_or_style in soup(['script', 'style']):
-            script_or_style.extract()
-
-        # Get text and clean it
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        return text
+        return get_page_fetcher().fetch_text(url)
     except requests.exceptions.RequestException as e:
         if IS_STREAMLIT_RUNNING:
             st.error(f"Error fetching URL {url}: {e}")
@@ -96,94 +98,450 @@ def extract_text_from_url(url: str) -> str:
         return ""
 
 llm_model_name = "gemini-2.5-flash" # Using a suitable Gemini model
+# Bump whenever the analysis prompt changes so cached reports from the old prompt are not reused
+PROMPT_VERSION = "skills-gaps-v5"
+# Batch reports come from a multi-job prompt, so they are cached apart from single-job ones
+BATCH_PROMPT_VERSION = "skills-gaps-batch-v2"
 
-# Configure the Gemini client for google-genai 1.52.0+
+# Disk-backed cache of raw LLM reports; identical resume/JD pairs skip the LLM call.
+# st.cache_resource keeps one SQLite connection across Streamlit reruns.
+@st.cache_resource
+def get_llm_cache():
+    return ResponseCache()
+
+llm_cache = get_llm_cache()
+
+# Configure the async Gemini provider (google-genai 1.52.0+). Cached as a resource so the
+# rate limiter's request/token budgets are shared across Streamlit reruns and sessions.
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-gemini_model = genai.Client(api_key=GOOGLE_API_KEY)
 
-def analyze_skills_and_gaps(resume_text: str, job_description_text: str) -> str:
-    """Analyzes a candidate's resume against a job description using the LLM to identify skills and gaps."""
-    # Modified: Combine system prompt into user prompt for Gemini's single-turn API
-    full_prompt = f"""
-    You are an expert HR analyst. Your task is to compare a candidate's resume with a job description.
-    Provide your output as a JSON object ONLY. Do not include any other text or explanation outside the JSON.
+def _delete_context_caches_at_exit(provider):
+    try:
+        asyncio.run(provider.delete_context_caches())
+    except Exception:
+        pass
+
+@st.cache_resource
+def get_llm_provider():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=250_000, max_in_flight=4)
+    primary = GeminiProvider(model=llm_model_name, api_key=GOOGLE_API_KEY, limiter=limiter)
+    # Cached contents left over when the server stops are deleted instead of waiting out their TTL
+    atexit.register(_delete_context_caches_at_exit, primary)
+    # Any other provider with an API key in the environment (GOOGLE_API_KEY, OPENAI_API_KEY,
+    # GROQ_API_KEY) joins a router that picks the fastest healthy one and hedges slow calls
+    fallbacks = providers_from_env(exclude=(primary.name,))
+    if not fallbacks:
+        return primary
+    return ProviderRouter([primary] + fallbacks, validator=is_json_response)
+
+llm_provider = get_llm_provider()
+
+# Prometheus metrics for every LLM call (tokens, latency, cost, cache hits) at
+# http://<host>:$LLM_METRICS_PORT/metrics; started once per server process.
+@st.cache_resource
+def start_metrics_exporter():
+    port = os.getenv("LLM_METRICS_PORT")
+    return METRICS.serve(int(port)) if port else None
+
+start_metrics_exporter()
+
+# System instructions and resume come first in every analysis request and are identical across
+# jobs, so Gemini serves them from cached content instead of re-reading the resume each time
+ANALYSIS_SYSTEM_PROMPT = """You are an expert HR analyst. Your task is to compare a candidate's resume with job descriptions.
+Provide your output as a JSON object ONLY. Do not include any other text or explanation outside the JSON."""
+
+# Resume prefixes sent to the provider, per Streamlit session (per process outside Streamlit)
+_CONTEXT_CACHES = ContextCacheTracker(ANALYSIS_SYSTEM_PROMPT)
+
+def session_context_caches() -> ContextCacheTracker:
+    if IS_STREAMLIT_RUNNING:
+        return st.session_state.setdefault("context_caches", ContextCacheTracker(ANALYSIS_SYSTEM_PROMPT))
+    return _CONTEXT_CACHES
+
+def track_resume_prefix(prefix: str) -> str:
+    return session_context_caches().track(prefix)
+
+async def release_stale_context_caches(resume_text: str) -> int:
+    """
+    Deletes the Gemini cached contents holding this session's previous resume once it
+    moves on to a different one, rather than leaving them until their TTL runs out.
+    """
+    providers = getattr(llm_provider, "providers", [llm_provider])
+    return await session_context_caches().release(resume_hash(resume_text), providers)
 
+def build_resume_prefix(resume_text: str) -> str:
+    """The resume part of every analysis prompt, sent as the provider's cacheable prefix."""
+    return f"""
     Here is the candidate's Resume:
     ---
     {resume_text}
     ---
+    """
 
+def build_analysis_prompt(job_description_text: str) -> str:
+    """Builds the skills/gaps analysis prompt for one job description, sent after the resume prefix."""
+    return f"""
     Here is the Job Description:
     ---
     {job_description_text}
     ---
 
-    JSON Schema:
-    {{
-        "candidate_skills": ["string"], # List of key technical and soft skills explicitly mentioned in the resume.
-        "required_job_skills": ["string"], # List of essential technical and soft skills mentioned in the job description.
-        "matched_skills": ["string"], # Skills present in both the resume and the job description.
-        "missing_skills": ["string"], # Skills required by the job description but NOT found in the resume.
-        "additional_skills": ["string"], # Skills present in the resume but not explicitly required by the job description.
-        "overall_fit_summary": "string" # A brief summary of how well the candidate's skills align with the job requirements.
-    }}
+    Fill in these fields of the JSON report:
+{describe_report_fields()}
     """
 
-    try:
-        response = gemini_model.models.generate_content(
-            model=llm_model_name,
-            contents=full_prompt
-        )
-        return response.text
-    except Exception as e:
-        return f"Error during LLM analysis: {e}"
+def describe_skill_report(skill_report) -> str:
+    """The locally matched skill lists, as told to the LLM when it only writes the summary."""
+    return f"""    Matched skills: {', '.join(skill_report.matched_skills) or 'none'}
+    Missing skills: {', '.join(skill_report.missing_skills) or 'none'}
+    Additional skills: {', '.join(skill_report.additional_skills) or 'none'}"""
 
-def analyze_resume_job_description_full(resume_text: str, job_description_text: str) -> dict:
-    """Performs a full resume and job description analysis using the LLM.
-    This function replaces the placeholder and calls analyze_skills_and_gaps.
+def build_summary_prompt(job_description_text: str, skill_report) -> str:
+    """Builds the prompt asking only for overall_fit_summary; the skill lists were matched locally."""
+    return f"""
+    Here is the Job Description:
+    ---
+    {job_description_text}
+    ---
+
+    Skill matching has already been done:
+{describe_skill_report(skill_report)}
+
+    Summarise how well the resume fits this job. Fill in only this field of the JSON report:
+    - "overall_fit_summary" (string): {REPORT_FIELD_DESCRIPTIONS['overall_fit_summary']}
     """
+
+async def analyze_skills_and_gaps(resume_text: str, job_description_text: str, skill_report=None):
+    """Analyzes a candidate's resume against a job description using the LLM to identify skills and gaps.
+    Streams the raw model output as text chunks. Given a locally matched skill_report, only
+    overall_fit_summary is requested.
+    """
+    if skill_report is not None:
+        prompt, schema = build_summary_prompt(job_description_text, skill_report), SUMMARY_JSON_SCHEMA
+    else:
+        prompt, schema = build_analysis_prompt(job_description_text), REPORT_JSON_SCHEMA
+    # Awaited on the async client so run_live does not block the event loop
+    # The report schema is passed natively, so the provider constrains the output shape
+    async for chunk in llm_provider.stream(prompt, system=ANALYSIS_SYSTEM_PROMPT, response_schema=schema,
+                                           prefix=track_resume_prefix(build_resume_prefix(resume_text))):
+        yield chunk
+
+async def analyze_resume_job_description_stream(resume_text: str, job_description_text: str, fast_mode: bool = False):
+    """Streams a full resume and job description analysis.
+    Yields ("field", key, value) as each top-level field of the JSON report closes, then
+    ("result", analysis_result) with the same dict analyze_resume_job_description_full returns.
+    ("restart", message) means the provider router discarded invalid output; the fields that
+    follow replace the ones yielded before it.
+
+    Skill lists come from the local dictionary matcher; the LLM only writes the summary,
+    or is skipped entirely in fast_mode. If the matcher finds no required skills in the
+    job description, the LLM produces the whole report instead.
+    """
+    # Deterministic skill matching takes milliseconds, so it runs before any cache or LLM work
+    skill_report = match_skills(resume_text, job_description_text)
+    if fast_mode:
+        parsed_report = skill_report.to_dict()
+        for key, value in parsed_report.items():
+            yield ("field", key, value)
+        yield ("result", {"analysis_status": "success", "message": "Fast mode: skills matched locally, no LLM call made.", "parsed_report": parsed_report, "cache_hit": False})
+        return
+
     if IS_STREAMLIT_RUNNING:
         st.info(f"Initiating LLM-based analysis for resume (length: {len(resume_text)}) and job description (length: {len(job_description_text)}).")
     else:
         print(f"Initiating LLM-based analysis for resume (length: {len(resume_text)}) and job description (length: {len(job_description_text)}).")
-    analysis_report = analyze_skills_and_gaps(resume_text, job_description_text)
+    cache_key = ResponseCache.make_key(cache_model_id(llm_provider), PROMPT_VERSION, resume_text, job_description_text)
+    cached_report = llm_cache.get(cache_key)
+    METRICS.record_cache_lookup(cached_report is not None)
+    if cached_report is not None:
+        try:
+            parsed_report = parse_report(cached_report).to_dict()
+            for key, value in parsed_report.items():
+                yield ("field", key, value)
+            yield ("result", {"analysis_status": "success", "message": "Analysis loaded from cache.", "parsed_report": parsed_report, "cache_hit": True})
+            return
+        except ReportValidationError:
+            pass
 
-    if "Error during LLM analysis" in analysis_report:
-        return {"analysis_status": "failure", "message": analysis_report}
+    # Dedupe, strip page boilerplate and keep only the relevant sections within a token budget
+    compacted = compact_prompt_inputs(resume_text, job_description_text)
+    compaction_message = f"Prompt compacted from ~{compacted.tokens_before} to ~{compacted.tokens_after} tokens."
+    if IS_STREAMLIT_RUNNING:
+        st.info(compaction_message)
     else:
-        try:
-            cleaned_report = analysis_report.strip()
-            if cleaned_report.startswith('```json') and cleaned_report.endswith('```'):
-                cleaned_report = cleaned_report[len('```json'):-len('```')].strip()
-
-            parsed_report = json.loads(cleaned_report)
-            return {"analysis_status": "success", "message": "LLM-based analysis completed and parsed.", "parsed_report": parsed_report}
-        except json.JSONDecodeError as e:
-            return {"analysis_status": "failure", "message": f"Failed to parse LLM output as JSON: {e}", "raw_report": analysis_report}
-        except Exception as e:
-            return {"analysis_status": "failure", "message": f"An unexpected error occurred during JSON parsing: {e}", "raw_report": analysis_report}
+        print(compaction_message)
+
+    if not skill_report.required_job_skills:
+        # Nothing in the job description matched the skill dictionary; the LLM extracts the skills too
+        skill_report = None
+    else:
+        for key in SKILL_LIST_FIELDS:
+            yield ("field", key, getattr(skill_report, key))
+
+    # Fields are parsed as soon as their value closes, so the report renders while the model is still writing
+    parser = IncrementalJSONObjectParser()
+    try:
+        async for chunk in analyze_skills_and_gaps(compacted.resume_text, compacted.job_description_text, skill_report):
+            if chunk is STREAM_RESTART:
+                # The router dropped an invalid answer; another provider's follows from the start
+                parser = IncrementalJSONObjectParser()
+                yield ("restart", "The model's output was invalid, so the analysis was retried with another provider.")
+                continue
+            for key, value in parser.feed(chunk):
+                yield ("field", key, coerce_report_field(key, value))
+    except Exception as e:
+        yield ("result", {"analysis_status": "failure", "message": f"Error during LLM analysis: {e}"})
+        return
+
+    analysis_report = parser.text
+    try:
+        # Validated against the report schema; near-valid JSON is repaired instead of re-requested
+        report = parse_report(analysis_report)
+        if skill_report is not None:
+            skill_report.overall_fit_summary = report.overall_fit_summary
+            skill_report.repaired = report.repaired
+            report = skill_report
+        parsed_report = report.to_dict()
+        # Only reports that validate are cached, stored in canonical form
+        llm_cache.set(cache_key, json.dumps(parsed_report))
+        repair_note = " (output repaired)" if report.repaired else ""
+        yield ("result", {"analysis_status": "success", "message": f"LLM-based analysis completed and parsed{repair_note}. {compaction_message}", "parsed_report": parsed_report, "cache_hit": False,
+                          "token_counts": {"before": compacted.tokens_before, "after": compacted.tokens_after}})
+    except ReportValidationError as e:
+        yield ("result", {"analysis_status": "failure", "message": f"Failed to parse LLM output as JSON: {e}", "raw_report": analysis_report})
+    except Exception as e:
+        yield ("result", {"analysis_status": "failure", "message": f"An unexpected error occurred during JSON parsing: {e}", "raw_report": analysis_report})
+
+async def analyze_resume_job_description_full(resume_text: str, job_description_text: str, fast_mode: bool = False) -> dict:
+    """Performs a full resume and job description analysis using the LLM.
+    Consumes analyze_resume_job_description_stream and returns only its final result.
+    """
+    analysis_result = {"analysis_status": "failure", "message": "LLM analysis produced no result."}
+    async for event in analyze_resume_job_description_stream(resume_text, job_description_text, fast_mode=fast_mode):
+        if event[0] == "result":
+            analysis_result = event[1]
+    return analysis_result
+
+# Batch mode: job descriptions compared per LLM request. The resume is sent once per request,
+# as the same cached prefix the single-job analysis uses.
+JOBS_PER_REQUEST = 3
+
+def build_batch_prompt(resume_text: str, job_description_texts: list, skill_reports: list = None):
+    """Builds one request comparing the resume against several job descriptions.
+    Given the locally matched skill_reports (one per job), only overall_fit_summary is requested per job.
+    Returns the resume prefix and the prompt, with the estimated input tokens before and after compaction.
+    """
+    compacted = [compact_prompt_inputs(resume_text, text) for text in job_description_texts]
+    tokens_before = estimate_tokens(resume_text) + sum(estimate_tokens(text) for text in job_description_texts)
+    resume_text = compacted[0].resume_text
+    job_description_texts = [c.job_description_text for c in compacted]
+    tokens_after = estimate_tokens(resume_text) + sum(estimate_tokens(text) for text in job_description_texts)
+    job_sections = "\n".join(
+        f"""
+    Job Description {index}:
+    ---
+    {text}
+    ---
+""" + (f"""{describe_skill_report(skill_reports[index - 1])}
+""" if skill_reports else "") for index, text in enumerate(job_description_texts, start=1)
+    )
+    if skill_reports:
+        fields = f'''    Skill matching has already been done; the matched, missing and additional skills are listed under each job description.
+    Return a "reports" list with one entry per job description, in the same order. Each entry has
+    "job_index" (the number of the job description it is about) and only this field:
+    - "overall_fit_summary" (string): {REPORT_FIELD_DESCRIPTIONS['overall_fit_summary']}'''
+    else:
+        fields = f'''    Return a "reports" list with one entry per job description, in the same order. Each entry has
+    "job_index" (the number of the job description it is about) and these fields:
+{describe_report_fields()}'''
+    prompt = f"""
+    Compare the resume with EACH of the job descriptions below.
+{job_sections}
+{fields}
+    """
+    return build_resume_prefix(resume_text), prompt, tokens_before, tokens_after
+
+async def fetch_job_descriptions(job_urls: list) -> list:
+    """Fetches all job description URLs concurrently; failed fetches come back as ""."""
+    results = await get_job_crawler().fetch_all(job_urls)
+    for result in results:
+        if not result.ok:
+            if IS_STREAMLIT_RUNNING:
+                st.error(f"Error fetching URL {result.url}: {result.error}")
+            else:
+                print(f"Error fetching URL {result.url}: {result.error}")
+    return [result.text for result in results]
+
+async def _analyze_job_group(resume_text: str, group: list) -> list:
+    """Analyzes up to JOBS_PER_REQUEST (url, job_description_text, skill_report) entries in one LLM call.
+    The entries either all have a locally matched skill_report, whose overall_fit_summary the LLM
+    writes, or all have None (no dictionary skills in the job description) and get a full LLM report.
+    """
+    skill_reports = [skill_report for _, _, skill_report in group]
+    summary_only = skill_reports[0] is not None
+    prefix, prompt, tokens_before, tokens_after = build_batch_prompt(resume_text, [text for _, text, _ in group],
+                                                                     skill_reports if summary_only else None)
+    compaction_message = f"Prompt for {len(group)} jobs compacted from ~{tokens_before} to ~{tokens_after} tokens."
+    try:
+        response = await llm_provider.generate(prompt, system=ANALYSIS_SYSTEM_PROMPT,
+                                               response_schema=BATCH_SUMMARY_JSON_SCHEMA if summary_only else BATCH_REPORT_JSON_SCHEMA,
+                                               prefix=track_resume_prefix(prefix))
+        by_index = parse_batch_reports(response.text)
+    except Exception as e:
+        return [(url, {"analysis_status": "failure", "message": f"Error during LLM analysis: {e}"}) for url, _, _ in group]
+
+    results = []
+    for index, (url, text, skill_report) in enumerate(group, start=1):
+        report = by_index.get(index)
+        if report is None:
+            results.append((url, {"analysis_status": "failure", "message": "LLM output did not include a valid report for this job."}))
+            continue
+        if skill_report is not None:
+            skill_report.overall_fit_summary = report.overall_fit_summary
+            skill_report.repaired = report.repaired
+            report = skill_report
+        report = report.to_dict()
+        cache_key = ResponseCache.make_key(cache_model_id(llm_provider), BATCH_PROMPT_VERSION, resume_text, text)
+        llm_cache.set(cache_key, json.dumps(report))
+        results.append((url, {"analysis_status": "success", "message": f"LLM-based analysis completed and parsed. {compaction_message}", "parsed_report": report, "cache_hit": False,
+                              "token_counts": {"before": tokens_before, "after": tokens_after}}))
+    return results
+
+async def analyze_resume_against_jobs(resume_text: str, job_urls: list, fast_mode: bool = False):
+    """Analyzes one resume against many job URLs.
+
+    Job pages are fetched concurrently and near-duplicate postings (reposts, agencies,
+    one posting per location) are grouped: only the first of each group is analysed, and
+    the others are yielded with its report and "duplicate_of" set.
+    Yields (url, analysis_result) pairs as each one completes.
+    """
+    job_description_texts = await fetch_job_descriptions(job_urls)
+    unique_urls, unique_texts, duplicates = [], [], {}
+    for cluster in cluster_near_duplicates(job_description_texts):
+        url = job_urls[cluster[0]]
+        unique_urls.append(url)
+        unique_texts.append(job_description_texts[cluster[0]])
+        duplicates[url] = [job_urls[i] for i in cluster[1:]]
+
+    async for url, result in _analyze_unique_jobs(resume_text, unique_urls, unique_texts, fast_mode):
+        members = duplicates[url]
+        if not members or result.get("analysis_status") != "success":
+            yield url, result
+            for duplicate_url in members:
+                yield duplicate_url, result
+            continue
+        yield url, {**result, "duplicates": members,
+                    "message": f"{result['message']} Also covers {len(members)} near-duplicate posting(s)."}
+        for duplicate_url in members:
+            yield duplicate_url, {**result, "duplicate_of": url, "message": f"Near-duplicate of {url}; its analysis is reused."}
+
+async def _analyze_unique_jobs(resume_text: str, job_urls: list, job_description_texts: list, fast_mode: bool = False):
+    """
+    Cached reports are yielded straight away. Skill lists of the remaining jobs are
+    matched locally, as in the single-job analysis, and their summaries are requested
+    JOBS_PER_REQUEST at a time in concurrent LLM requests; jobs in which the matcher
+    finds no skills get full LLM reports instead. In fast_mode every job is matched
+    locally and no LLM call is made.
+    """
+    if fast_mode:
+        for url, text in zip(job_urls, job_description_texts):
+            if not text:
+                yield url, {"analysis_status": "failure", "message": "Failed to fetch job description. Please check the URL."}
+                continue
+            yield url, {"analysis_status": "success", "message": "Fast mode: skills matched locally, no LLM call made.", "parsed_report": match_skills(resume_text, text).to_dict(), "cache_hit": False}
+        return
+
+    pending = []
+    for url, text in zip(job_urls, job_description_texts):
+        if not text:
+            yield url, {"analysis_status": "failure", "message": "Failed to fetch job description. Please check the URL."}
+            continue
+        cached_report = llm_cache.get(ResponseCache.make_key(cache_model_id(llm_provider), BATCH_PROMPT_VERSION, resume_text, text))
+        METRICS.record_cache_lookup(cached_report is not None)
+        if cached_report is not None:
+            try:
+                yield url, {"analysis_status": "success", "message": "Analysis loaded from cache.", "parsed_report": parse_report(cached_report).to_dict(), "cache_hit": True}
+                continue
+            except ReportValidationError:
+                pass
+        skill_report = match_skills(resume_text, text)
+        pending.append((url, text, skill_report if skill_report.required_job_skills else None))
+
+    # Summary-only and full-report jobs need different prompts, so they are grouped apart
+    summary_jobs = [job for job in pending if job[2] is not None]
+    full_jobs = [job for job in pending if job[2] is None]
+    groups = [jobs[i:i + JOBS_PER_REQUEST] for jobs in (summary_jobs, full_jobs) for i in range(0, len(jobs), JOBS_PER_REQUEST)]
+    for finished in asyncio.as_completed([_analyze_job_group(resume_text, group) for group in groups]):
+        for url, result in await finished:
+            yield url, result
 
 # Re-define Tool instances
 analysis_tool = Tool(
-    func=analyze_resume_job_description_full,
+    func=analyze_resume_job_description_stream,
     name="analyze_resume_job_description",
-    description="Analyzes a candidate's resume against a job description to identify skills and gaps using an LLM."
+    description="Analyzes a candidate's resume against a job description to identify skills and gaps using an LLM, streaming each report field as it completes."
+)
+
+batch_analysis_tool = Tool(
+    func=analyze_resume_against_jobs,
+    name="analyze_resume_against_jobs",
+    description="Analyzes a candidate's resume against several job description URLs, streaming a report per job."
 )
 
 # Re-define Agent instances
 candidate_agent = Agent(
     name="candidate_agent",
     instruction="I manage candidate profiles and analyze resumes against job descriptions.",
-    tools=[analysis_tool]
+    tools=[analysis_tool, batch_analysis_tool]
 )
 
+# Report sections in display order: (field, heading, highlighted as a gap)
+REPORT_SECTIONS = [
+    ("candidate_skills", "Candidate Skills", False),
+    ("required_job_skills", "Required Job Skills", False),
+    ("matched_skills", "Matched Skills", False),
+    ("missing_skills", "Missing Skills (Gaps)", True),
+    ("additional_skills", "Additional Skills", False),
+]
+
+def render_report_field_html(key: str, value) -> str:
+    """Renders one field of a parsed skills/gaps report; returns "" for unknown or empty fields."""
+    if key == 'overall_fit_summary':
+        return f"<p><b>Overall Fit Summary:</b> {value}</p>"
+    section = next((section for section in REPORT_SECTIONS if section[0] == key), None)
+    if section is None or not value:
+        return ""
+    _, heading, is_gap = section
+    style = " style=\"color:red;\"" if is_gap else ""
+    field_html_parts = [f"<h4{style}>{heading}:</h4><ul>"]
+    for skill in value:
+        field_html_parts.append(f"<li{style}>{skill}</li>")
+    field_html_parts.append("</ul>")
+    return "\n".join(field_html_parts)
+
+def render_report_html(parsed_report: dict) -> str:
+    """Renders a parsed skills/gaps report as the HTML shown in the Streamlit report."""
+    report_html_parts = [render_report_field_html('overall_fit_summary', parsed_report.get('overall_fit_summary', 'N/A'))]
+    for key, _, _ in REPORT_SECTIONS:
+        field_html = render_report_field_html(key, parsed_report.get(key, []))
+        if field_html:
+            report_html_parts.append(field_html)
+    return "\n".join(report_html_parts)
+
 # Redefine CoordinatorAgent to reflect new workflow
 class CoordinatorAgent(Agent):
     def __init__(self, name: str, instruction: str, tools: list = None, sub_agents: list = None):
         super().__init__(name, instruction, tools if tools is not None else [])
         self.sub_agents = sub_agents if sub_agents is not None else []
 
-    async def run_live(self, resume_text: str, job_description_text: str):
+    async def run_live(self, resume_text: str, job_description_text: str = "", job_urls: list = None, fast_mode: bool = False):
+        # A new resume makes the previous one's cached prefixes useless (CLI and batch runs included)
+        await release_stale_context_caches(resume_text)
+        if job_urls:
+            async for step_output in self.run_live_batch(resume_text, job_urls, fast_mode=fast_mode):
+                yield step_output
+            return
+
         yield f"🚀 CoordinatorAgent '{self.name}' initiating resume and job description analysis..."
 
         candidate_agent_found = next((agent for agent in self.sub_agents if agent.name == "candidate_agent"), None)
@@ -198,61 +556,26 @@ class CoordinatorAgent(Agent):
 
         yield f"⚙️ Delegating analysis to {candidate_agent_found.name} using {analysis_tool_instance.name} tool..."
         try:
-            analysis_result = analysis_tool_instance.func(resume_text, job_description_text)
+            analysis_result = {}
+            report_started = False
+            async for event in analysis_tool_instance.func(resume_text, job_description_text, fast_mode=fast_mode):
+                if event[0] == "result":
+                    analysis_result = event[1]
+                    continue
+                if event[0] == "restart":
+                    yield f"⚠️ {event[1]}"
+                    continue
+                _, key, value = event
+                field_html = render_report_field_html(key, value)
+                if not field_html:
+                    continue
+                if not report_started:
+                    yield "<h2>Analysis Report</h2>"
+                    report_started = True
+                yield field_html # Each field is shown as soon as the model finishes writing it
+
             if analysis_result.get('analysis_status') == 'success':
                 yield f"✅ Analysis complete: {analysis_result.get('message', 'No message provided.')}"
-                yield "<h2>Analysis Report</h2>" # Moved here to display after initial messages
-
-                parsed_report = analysis_result.get('parsed_report', {})
-
-                report_html_parts = []
-
-                # Overall Fit Summary
-                overall_fit_summary = parsed_report.get('overall_fit_summary', 'N/A')
-                report_html_parts.append(f"<p><b>Overall Fit Summary:</b> {overall_fit_summary}</p>")
-
-                # Candidate Skills
-                candidate_skills = parsed_report.get('candidate_skills', [])
-                if candidate_skills:
-                    report_html_parts.append("<h4>Candidate Skills:</h4><ul>")
-                    for skill in candidate_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Required Job Skills
-                required_job_skills = parsed_report.get('required_job_skills', [])
-                if required_job_skills:
-                    report_html_parts.append("<h4>Required Job Skills:</h4><ul>")
-                    for skill in required_job_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Matched Skills
-                matched_skills = parsed_report.get('matched_skills', [])
-                if matched_skills:
-                    report_html_parts.append("<h4>Matched Skills:</h4><ul>")
-                    for skill in matched_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Missing Skills
-                missing_skills = parsed_report.get('missing_skills', [])
-                if missing_skills:
-                    report_html_parts.append("<h4 style=\"color:red;\">Missing Skills (Gaps):</h4><ul>")
-                    for skill in missing_skills:
-                        report_html_parts.append(f"<li style=\"color:red;\">{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                # Additional Skills
-                additional_skills = parsed_report.get('additional_skills', [])
-                if additional_skills:
-                    report_html_parts.append("<h4>Additional Skills:</h4><ul>")
-                    for skill in additional_skills:
-                        report_html_parts.append(f"<li>{skill}</li>")
-                    report_html_parts.append("</ul>")
-
-                yield "\n".join(report_html_parts) # Yield the complete HTML string
-
             else:
                 yield f"❌ Analysis failed: {analysis_result.get('message', 'Unknown error.')}"
                 if 'raw_report' in analysis_result:
@@ -261,6 +584,35 @@ class CoordinatorAgent(Agent):
             yield f"❌ Error during analysis: {e}"
             return
 
+    async def run_live_batch(self, resume_text: str, job_urls: list, fast_mode: bool = False):
+        yield f"🚀 CoordinatorAgent '{self.name}' initiating batch analysis of {len(job_urls)} job descriptions..."
+
+        candidate_agent_found = next((agent for agent in self.sub_agents if agent.name == "candidate_agent"), None)
+        if not candidate_agent_found:
+            yield "❌ Error: candidate_agent not found."
+            return
+
+        batch_tool_instance = next((tool for tool in candidate_agent_found.tools if tool.name == "analyze_resume_against_jobs"), None)
+        if not batch_tool_instance:
+            yield "❌ Error: analyze_resume_against_jobs tool not found for candidate_agent."
+            return
+
+        yield f"⚙️ Delegating analysis to {candidate_agent_found.name} using {batch_tool_instance.name} tool..."
+        yield "<h2>Analysis Reports</h2>"
+        completed = 0
+        try:
+            async for url, analysis_result in batch_tool_instance.func(resume_text, job_urls, fast_mode=fast_mode):
+                completed += 1
+                header = f"<h3>Job {completed} of {len(job_urls)}: <a href=\"{url}\">{url}</a></h3>"
+                if analysis_result.get('analysis_status') == 'success':
+                    yield header + f"<p><i>{analysis_result.get('message', '')}</i></p>" + render_report_html(analysis_result.get('parsed_report', {}))
+                else:
+                    yield header + f"<p>❌ Analysis failed: {analysis_result.get('message', 'Unknown error.')}</p>"
+        except Exception as e:
+            yield f"❌ Error during batch analysis: {e}"
+            return
+        yield f"✅ Batch analysis complete: {completed} of {len(job_urls)} jobs processed."
+
 # Re-instantiate the CoordinatorAgent with the new class definition and updated sub-agents
 root_agent = CoordinatorAgent(
     name="root_agent",
@@ -286,13 +638,36 @@ job_url_input = st.sidebar.text_input(
 )
 
 uploaded_resume_file = st.sidebar.file_uploader(
-    "Upload Your Resume (PDF)",
-    type=["pdf"],
-    help="Upload your resume in PDF format."
+    "Upload Your Resume (PDF or DOCX)",
+    type=["pdf", "docx"],
+    help="Upload your resume in PDF or DOCX format."
+)
+
+fast_mode = st.sidebar.checkbox(
+    "Fast mode (no LLM)",
+    help="Match skills locally with the skill dictionary and skip the LLM. Results in milliseconds, with a template summary."
 )
 
+batch_mode = st.sidebar.checkbox(
+    "Batch mode: compare several jobs",
+    help="Analyze your resume against a list of job description URLs in one run."
+)
+batch_urls_input = ""
+if batch_mode:
+    batch_urls_input = st.sidebar.text_area(
+        "Job Description URLs (one per line)",
+        help="Paste 10-30 job posting URLs; reports stream in as each job completes."
+    )
+
+job_urls = []
 is_valid_job_url = False
-if job_url_input:
+if batch_mode:
+    job_urls = list(dict.fromkeys(line.strip() for line in batch_urls_input.splitlines() if line.strip()))
+    invalid_urls = [url for url in job_urls if not (url.startswith("http://") or url.startswith("https://"))]
+    if invalid_urls:
+        st.sidebar.error(f"Please enter valid URLs (starting with http:// or https://): {', '.join(invalid_urls)}")
+    is_valid_job_url = bool(job_urls) and not invalid_urls
+elif job_url_input:
     if job_url_input.startswith("http://") or job_url_input.startswith("https://"):
         is_valid_job_url = True
     else:
@@ -307,50 +682,56 @@ if st.sidebar.button("Run Analysis", disabled=(not is_valid_job_url or not is_re
         with st.spinner("Processing resume and fetching job description..."):
             resume_text = ""
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_resume_file.getvalue()))
-                resume_text = "".join([page.extract_text() for page in pdf_reader.pages])
+                # Parse straight from the upload buffer instead of copying it via getvalue()
+                resume_text = extract_text_from_upload(uploaded_resume_file)
                 st.success("Resume extracted successfully.")
             except Exception as e:
-                st.error(f"Error reading resume PDF: {e}")
+                st.error(f"Error reading resume: {e}")
                 resume_text = ""
 
             job_description_text = ""
-            try:
-                job_description_text = extract_text_from_url(job_url_input)
-                if job_description_text:
-                    st.success("Job description fetched successfully.")
-                else:
-                    st.error("Failed to fetch job description. Please check the URL.")
-            except Exception as e:
-                st.error(f"Error fetching job description from URL: {e}")
-                job_description_text = ""
-
-        if resume_text and job_description_text:
+            if not batch_mode: # In batch mode the agent fetches all job URLs concurrently
+                try:
+                    job_description_text = extract_text_from_url(job_url_input)
+                    if job_description_text:
+                        st.success("Job description fetched successfully.")
+                    else:
+                        st.error("Failed to fetch job description. Please check the URL.")
+                except Exception as e:
+                    st.error(f"Error fetching job description from URL: {e}")
+                    job_description_text = ""
+
+        if resume_text and (job_description_text or batch_mode):
             # st.subheader("Analysis Report") # Removed this line
             progress_bar = st.progress(0)
             status_text = st.empty()
             report_container = st.empty()
 
-            async def run_analysis_workflow_streamlit(res_text: str, jd_text: str):
+            async def run_analysis_workflow_streamlit(res_text: str, jd_text: str, urls: list):
                 output_lines = []
-                total_steps = 7
+                total_steps = 5 + len(urls) if urls else 10
                 current_step = 0
-                async for step_output in root_agent.run_live(res_text, jd_text):
+                async for step_output in root_agent.run_live(res_text, jd_text, job_urls=urls, fast_mode=fast_mode):
                     output_lines.append(step_output)
                     status_text.text(step_output)
                     current_step += 1
                     progress_bar.progress(min(current_step / total_steps, 1.0))
+                    # Show each job's report as soon as it arrives
+                    report_container.markdown("\n".join(output_lines), unsafe_allow_html=True)
                 return output_lines
 
             st.write("Starting AI analysis...")
             full_report_lines = []
             # Use asyncio.run to execute the async generator
-            for step_output in asyncio.run(run_analysis_workflow_streamlit(resume_text, job_description_text)):
-                 full_report_lines.append(step_output)
+            with METRICS.run() as run_metrics:
+                for step_output in asyncio.run(run_analysis_workflow_streamlit(resume_text, job_description_text, job_urls if batch_mode else None)):
+                     full_report_lines.append(step_output)
 
             progress_bar.empty()
             status_text.empty()
             report_container.markdown("\n".join(full_report_lines), unsafe_allow_html=True)
+            st.sidebar.subheader("LLM usage (this run)")
+            st.sidebar.markdown(run_metrics.summary_markdown())
 
         else:
             st.error("Analysis cannot be performed due to missing resume text or job description text.")
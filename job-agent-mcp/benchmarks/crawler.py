@@ -0,0 +1,80 @@
+# benchmarks/crawler.py
+"""
+Fetches job pages from local fixture sites with modules.crawler.AsyncCrawler and,
+for comparison, one at a time with web_fetch.PageFetcher (what
+extract_text_from_url does in a loop).
+
+Each fixture site (tests/fixture_site.py, also used by tests/test_crawler.py) is an
+HTTP server on its own localhost port that serves saved job pages with a random delay
+(`--min-delay`..`--max-delay` seconds), a robots.txt, a redirect loop, an oversized
+page and a disallowed path. The crawl should take about as long as the slowest few
+pages, not their sum, and must agree with PageFetcher on every page's text.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.crawler path/to/pages/ [--sites 10] [--urls 100]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+
+from benchmarks.html_text import load_pages
+from modules.crawler import AsyncCrawler
+from modules.web_fetch import HTTPCache, PageFetcher
+from tests.fixture_site import start_fixture_site
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="Saved job pages (directories or .html files)")
+    parser.add_argument("--sites", type=int, default=10, help="Number of fixture sites (hosts)")
+    parser.add_argument("--urls", type=int, default=100, help="Number of job URLs to fetch")
+    parser.add_argument("--min-delay", type=float, default=0.02)
+    parser.add_argument("--max-delay", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    pages = [html for _, html in load_pages(args.paths)]
+    if not pages:
+        sys.exit("no pages found")
+    rng = random.Random(0)
+    delays = [rng.uniform(args.min_delay, args.max_delay) for _ in pages]
+    max_bytes = 1024 * 1024
+    sites = [start_fixture_site(pages, delays, max_bytes) for _ in range(args.sites)]
+    urls = [f"{sites[i % len(sites)][1]}/jobs/{i % len(pages)}" for i in range(args.urls)]
+    edge_cases = {f"{sites[0][1]}/loop/0": "more than 5 redirects",
+                  f"{sites[0][1]}/huge": "byte limit",
+                  f"{sites[0][1]}/private/jobs/0": "disallowed by robots.txt"}
+
+    fetcher = PageFetcher(cache_path=":memory:")
+    start = time.perf_counter()
+    sequential = [fetcher.fetch_text(url) for url in urls]
+    sequential_time = time.perf_counter() - start
+
+    crawler = AsyncCrawler(cache=HTTPCache(":memory:"), max_redirects=5, max_bytes=max_bytes)
+    start = time.perf_counter()
+    results = asyncio.run(crawler.fetch_all(urls + list(edge_cases)))
+    crawl_time = time.perf_counter() - start
+
+    page_delays = sorted((delays[i % len(pages)] for i in range(args.urls)), reverse=True)
+    print(f"{args.urls} URLs on {args.sites} sites, server delay {page_delays[-1]:.2f}-{page_delays[0]:.2f}s "
+          f"(sum {sum(page_delays):.1f}s)")
+    print(f"{'sequential PageFetcher':<26}{sequential_time:>7.2f}s")
+    print(f"{'AsyncCrawler':<26}{crawl_time:>7.2f}s  ({sequential_time / crawl_time:.0f}x faster; "
+          f"slowest page {page_delays[0]:.2f}s)")
+
+    mismatches = sum(result.text != text for result, text in zip(results, sequential))
+    print(f"text identical to PageFetcher: {args.urls - mismatches}/{args.urls}")
+    for result in results[args.urls:]:
+        expected = edge_cases[result.url]
+        verdict = "ok" if result.error and expected in result.error else "UNEXPECTED"
+        print(f"  {verdict:<11}/{result.url.split('/', 3)[-1]}: {result.error}")
+
+    for server, _ in sites:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1:])
@@ -0,0 +1,80 @@
+# benchmarks/dedup.py
+"""
+Checks modules.dedup.cluster_near_duplicates against exact pairwise Jaccard
+similarity on job texts extracted from saved pages. Each page gets `--copies`
+reposts (another location and company line, a dropped sentence, an agency
+footer), as they appear in feeds and URL lists.
+
+Reports how many near-duplicate pairs (exact shingle Jaccard >= threshold) land
+in the same cluster, how many clustered pairs are below it, and the time taken
+against the exact all-pairs comparison.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.dedup path/to/pages/ [--copies 3] [--threshold 0.8]
+"""
+import argparse
+import random
+import sys
+import time
+from itertools import combinations
+
+from benchmarks.html_text import load_pages
+from modules.dedup import DEFAULT_THRESHOLD, cluster_near_duplicates, shingle_hashes
+from modules.main_content import extract_job_text
+
+CITIES = ["Singapore", "London", "Berlin", "Remote (EU)", "New York", "Toronto"]
+AGENCIES = ["TalentBridge Recruitment", "Apex Staffing", "HireWell Partners"]
+
+
+def repost(text: str, rng: random.Random) -> str:
+    lines = text.split("\n")
+    if len(lines) > 4:
+        del lines[rng.randrange(2, len(lines))]
+    lines.insert(1, f"Location: {rng.choice(CITIES)}")
+    lines.append(f"Posted by {rng.choice(AGENCIES)} on behalf of our client. Apply today.")
+    return "\n".join(lines)
+
+
+def jaccard(a, b) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate clustering versus exact pairwise Jaccard.")
+    parser.add_argument("paths", nargs="+", help="Saved job pages (directories or .html files)")
+    parser.add_argument("--copies", type=int, default=3, help="Reposts generated per page")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    pages = load_pages(args.paths)
+    if not pages:
+        sys.exit("no pages found")
+    rng = random.Random(0)
+    texts = []
+    for _, html in pages:
+        text = extract_job_text(html)
+        texts += [text] + [repost(text, rng) for _ in range(args.copies)]
+
+    start = time.perf_counter()
+    clusters = cluster_near_duplicates(texts, args.threshold)
+    cluster_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    shingles = [set(shingle_hashes(text).tolist()) for text in texts]
+    similar = {(i, j) for i, j in combinations(range(len(texts)), 2) if jaccard(shingles[i], shingles[j]) >= args.threshold}
+    exact_time = time.perf_counter() - start
+
+    clustered = {pair for cluster in clusters for pair in combinations(cluster, 2)}
+    found = len(similar & clustered)
+    print(f"{len(texts)} job texts ({len(pages)} pages + {args.copies} reposts each) -> {len(clusters)} clusters")
+    print(f"{'MinHash LSH clustering':<26}{cluster_time:>8.3f}s")
+    print(f"{'exact all-pairs Jaccard':<26}{exact_time:>8.3f}s")
+    print(f"near-duplicate pairs (Jaccard >= {args.threshold}) in one cluster: {found}/{len(similar)}")
+    # Clusters are transitive, so a few clustered pairs can sit below the threshold through a chain
+    print(f"clustered pairs below the threshold: {len(clustered - similar)}/{len(clustered)}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1:])
@@ -0,0 +1,67 @@
+# benchmarks/html_text.py
+"""
+Times modules.html_text.html_to_text (BeautifulSoup, html.parser) against the
+streaming html_to_text_fast on saved job pages, and checks output parity: with
+only script and style dropped, the fast path must produce the same text.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.html_text path/to/pages/ [page.html ...]
+
+tests/pages/ holds a few saved pages; tests/test_html_text.py asserts the same parity on them.
+"""
+import sys
+import time
+from pathlib import Path
+
+from modules.html_text import etree, html_to_text, html_to_text_fast
+
+
+def load_pages(paths):
+    pages = []
+    for path in map(Path, paths):
+        files = sorted(path.glob("*.htm*")) if path.is_dir() else [path]
+        pages += [(file.name, file.read_text(encoding="utf-8", errors="replace")) for file in files]
+    return pages
+
+
+def timed(func, pages, repeat: int = 3):
+    """Best-of-`repeat` seconds for one pass over all pages, with that pass's outputs."""
+    best, outputs = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(html) for _, html in pages]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+
+def main(paths):
+    pages = load_pages(paths)
+    if not pages:
+        sys.exit("no pages found")
+    size_mib = sum(len(html) for _, html in pages) / 1024 / 1024
+    print(f"{len(pages)} pages, {size_mib:.1f} MiB; fast path parser: {'lxml' if etree is not None else 'html.parser'}")
+
+    reference_time, reference = timed(html_to_text, pages)
+    parity_time, parity = timed(lambda html: html_to_text_fast(html, drop_tags=("script", "style")), pages)
+    fast_time, fast = timed(html_to_text_fast, pages)
+
+    print(f"{'extractor':<36}{'ms/page':>9}{'MiB/s':>8}{'speedup':>9}")
+    for label, elapsed in (("html_to_text (bs4)", reference_time),
+                           ("html_to_text_fast (script, style)", parity_time),
+                           ("html_to_text_fast (default)", fast_time)):
+        print(f"{label:<36}{elapsed / len(pages) * 1000:>9.2f}{size_mib / elapsed:>8.1f}{reference_time / elapsed:>8.1f}x")
+
+    mismatches = [name for (name, _), ref, out in zip(pages, reference, parity) if ref != out]
+    print(f"parity with html_to_text: {len(pages) - len(mismatches)}/{len(pages)} pages identical")
+    for name in mismatches[:10]:
+        print(f"  differs: {name}")
+    ref_chars, fast_chars = sum(map(len, reference)), sum(map(len, fast))
+    print(f"text per page: {ref_chars / len(pages):.0f} chars -> {fast_chars / len(pages):.0f} chars "
+          f"with nav/footer/noscript dropped ({1 - fast_chars / ref_chars:.0%} less)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1:])
@@ -0,0 +1,98 @@
+# benchmarks/job_table.py
+"""
+Times "salary >= expectation AND location in X, ranked by similarity" (plus a
+skill-coverage score) over synthetic jobs with modules.job_table.JobTable,
+against the same query as a loop over job dicts, and checks both return the
+same top jobs.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.job_table [--rows 1000000] [--dim 64] [--loop-rows 100000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from modules.job_table import JobTable
+
+CITIES = ["Singapore", "London", "Berlin", "Remote", "New York", "Toronto", "Sydney", "Paris", "Tokyo", "Austin"]
+
+
+def synthetic_table(rows: int, dim: int, seed: int = 0) -> JobTable:
+    rng = np.random.default_rng(seed)
+    salary_min = rng.integers(40, 200, rows).astype(np.float64) * 1000
+    salary_min[rng.random(rows) < 0.2] = np.nan  # postings without a salary
+    companies = [f"Company {i}" for i in range(rows // 50 + 1)]
+    return JobTable(
+        salary_min=salary_min,
+        salary_max=salary_min * 1.25,
+        location_id=rng.integers(0, len(CITIES), rows),
+        company_id=rng.integers(0, len(companies), rows),
+        posted_at=1.7e9 + rng.random(rows) * 90 * 86400,
+        skill_bits=rng.integers(0, 2 ** 63, (rows, 2), dtype=np.uint64) & rng.integers(0, 2 ** 63, (rows, 2), dtype=np.uint64),
+        locations=CITIES,
+        companies=companies,
+        embeddings=rng.standard_normal((rows, dim), dtype=np.float32),
+    )
+
+
+def as_dicts(table: JobTable, rows: int) -> list:
+    return [{"salary_max": float(table.salary_max[i]), "location": table.locations[table.location_id[i]],
+             "embedding": table.embeddings[i]} for i in range(rows)]
+
+
+def loop_rank(jobs, query, expectation, locations, k):
+    scored = []
+    for i, job in enumerate(jobs):
+        if job["salary_max"] >= expectation and job["location"] in locations:
+            scored.append((float(np.dot(job["embedding"], query)), i))
+    scored.sort(reverse=True)
+    return [i for _, i in scored[:k]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=64, help="Embedding dimension (all-MiniLM-L6-v2 uses 384)")
+    parser.add_argument("--loop-rows", type=int, default=100_000, help="Rows for the job-dict loop baseline")
+    parser.add_argument("-k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    table = synthetic_table(args.rows, args.dim)
+    print(f"{args.rows:,} jobs, {args.dim}-dim embeddings, built in {time.perf_counter() - start:.1f}s")
+    query = table.embeddings[0] + 0.5 * np.random.default_rng(1).standard_normal(args.dim).astype(np.float32)
+    query /= np.linalg.norm(query)
+    expectation, wanted = 150_000, ["Singapore", "Remote", "London"]
+    resume_skills = list(range(0, 128, 3))
+
+    def table_query():
+        mask = table.salary_at_least(expectation) & table.location_in(wanted)
+        return table.rank(query, args.k, mask), table.skill_coverage(resume_skills)
+
+    table_query()
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        top, _ = table_query()
+        timings.append(time.perf_counter() - start)
+    print(f"{'JobTable filter + rank + coverage':<36}{min(timings) * 1000:>9.1f} ms  ({args.rows:,} rows)")
+
+    loop_rows = min(args.loop_rows, args.rows)
+    jobs = as_dicts(table, loop_rows)
+    start = time.perf_counter()
+    loop_top = loop_rank(jobs, query, expectation, set(wanted), args.k)
+    loop_time = time.perf_counter() - start
+    print(f"{'loop over job dicts':<36}{loop_time * 1000:>9.1f} ms  ({loop_rows:,} rows, "
+          f"~{loop_time * args.rows / loop_rows * 1000:,.0f} ms for {args.rows:,})")
+
+    mask = table.salary_at_least(expectation)[:loop_rows] & table.location_in(wanted)[:loop_rows]
+    rows = np.flatnonzero(mask)
+    subset_top = JobTable.top_k(table.similarity(query, rows), args.k, rows).tolist()
+    print(f"top {args.k} identical to the loop on the first {loop_rows:,} rows: {subset_top == loop_top}")
+    print(f"full-table matches: {int((table.salary_at_least(expectation) & table.location_in(wanted)).sum()):,}; "
+          f"best: row {top[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/llm_router_hedging.py
+"""
+Simulates a provider having a bad minute (slow tail, 503s) with local fake
+providers and compares end-to-end latency of calling it directly against
+ProviderRouter with and without hedging. No API keys or network needed.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.llm_router_hedging [requests]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from modules.llm_client import FakeProvider
+from modules.llm_router import ProviderRouter, is_json_response
+
+REPORT = '{"overall_fit_summary": "ok", "matched_skills": [], "missing_skills": []}'
+
+
+def make_providers(seed: int):
+    rng = random.Random(seed)
+
+    def flaky_latency():
+        # Usually 50 ms, but one call in five stalls for 0.5-1 s
+        return rng.uniform(0.5, 1.0) if rng.random() < 0.2 else rng.uniform(0.04, 0.06)
+
+    primary = FakeProvider("gemini", text=REPORT, latency=flaky_latency, error_rate=0.05, seed=seed)
+    secondary = FakeProvider("openai", text=REPORT, latency=lambda: rng.uniform(0.08, 0.12), seed=seed + 1)
+    return primary, secondary
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def measure(client, requests: int):
+    latencies, failures = [], 0
+    for _ in range(requests):
+        start = time.monotonic()
+        try:
+            await client.generate("Compare this resume with this job description.", json_mode=True)
+            latencies.append(time.monotonic() - start)
+        except Exception:
+            failures += 1
+    return latencies, failures
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    setups = {
+        "primary only": lambda p, s: p,
+        "router, no hedge": lambda p, s: ProviderRouter([p, s], hedge=False, validator=is_json_response, prior_latency=0.1),
+        "router, hedged": lambda p, s: ProviderRouter([p, s], hedge=True, validator=is_json_response, prior_latency=0.1),
+    }
+    print(f"{'setup':<18}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'failed':>8}")
+    for label, build in setups.items():
+        latencies, failures = asyncio.run(measure(build(*make_providers(seed=7)), requests))
+        p50, p95, p99 = (percentile(latencies, f) * 1000 for f in (0.5, 0.95, 0.99))
+        print(f"{label:<18}{p50:>9.0f}{p95:>9.0f}{p99:>9.0f}{failures:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/main_content.py
+"""
+Measures how much text modules.main_content.extract_job_text keeps from saved job
+pages compared with whole-page text (html_to_text and html_to_text_fast), and
+which strategy (JSON-LD JobPosting, main-content scoring, full-page fallback)
+each page used.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.main_content path/to/pages/ [page.html ...] [--show N]
+"""
+import sys
+import time
+from collections import Counter
+
+from benchmarks.html_text import load_pages
+from modules.html_text import html_to_text, html_to_text_fast
+from modules.llm_client import estimate_tokens
+from modules.main_content import extract_job_content
+
+
+def main(paths, show: int = 0):
+    pages = load_pages(paths)
+    if not pages:
+        sys.exit("no pages found")
+    full = [html_to_text(html) for _, html in pages]
+    fast = [html_to_text_fast(html) for _, html in pages]
+    start = time.perf_counter()
+    extracted = [extract_job_content(html) for _, html in pages]
+    elapsed = time.perf_counter() - start
+
+    full_chars = sum(map(len, full))
+    print(f"{len(pages)} pages; main-content extraction {elapsed / len(pages) * 1000:.2f} ms/page")
+    print(f"{'text':<34}{'chars/page':>11}{'tokens/page':>12}{'vs page':>9}")
+    for label, texts in (("html_to_text (whole page)", full),
+                         ("html_to_text_fast (no nav/footer)", fast),
+                         ("extract_job_text", [text for text, _ in extracted])):
+        chars = sum(map(len, texts))
+        tokens = sum(map(estimate_tokens, texts))
+        print(f"{label:<34}{chars / len(pages):>11.0f}{tokens / len(pages):>12.0f}{chars / full_chars - 1:>9.0%}")
+    sources = Counter(source for _, source in extracted)
+    print("source: " + ", ".join(f"{source} {count}" for source, count in sources.most_common()))
+    for (name, _), (text, source) in list(zip(pages, extracted))[:show]:
+        print(f"\n=== {name} ({source}, {len(text)} chars)\n{text}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    show = 0
+    if "--show" in args:
+        index = args.index("--show")
+        show = int(args[index + 1])
+        del args[index:index + 2]
+    if not args:
+        sys.exit(__doc__)
+    main(args, show)
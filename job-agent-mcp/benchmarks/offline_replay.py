@@ -0,0 +1,66 @@
+# benchmarks/offline_replay.py
+"""
+Replays the job-page side of the analyzer pipeline from snapshots, with no network:
+job text for every snapshotted URL (or those in a URL file) is served by an
+offline PageFetcher, re-extracted from the stored page bodies to time the
+extractor, and matched against a resume with the local skill matcher (the apps'
+fast mode). Capture pages first with `python -m modules.snapshots capture`.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.offline_replay resume.txt [job_urls.txt] [--dir SNAPSHOT_DIR]
+"""
+import argparse
+import sys
+import time
+
+from modules.crawler import read_url_list
+from modules.main_content import extract_job_text
+from modules.skill_matcher import match_skills
+from modules.snapshots import DEFAULT_SNAPSHOT_DIR, SnapshotStore
+from modules.web_fetch import PageFetcher, page_text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay job pages from snapshots and time each stage.")
+    parser.add_argument("resume", help="Plain-text resume to match the jobs against")
+    parser.add_argument("url_file", nargs="?", help="Job URLs to replay (default: every snapshotted URL)")
+    parser.add_argument("--dir", default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory (JOB_SNAPSHOT_DIR)")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.dir)
+    urls = read_url_list(args.url_file) if args.url_file else store.urls()
+    if not urls:
+        sys.exit("no snapshots to replay")
+    with open(args.resume, encoding="utf-8") as f:
+        resume_text = f.read()
+    fetcher = PageFetcher(cache_path=":memory:", snapshots=store, offline=True)
+
+    start = time.perf_counter()
+    texts = [fetcher.fetch_text(url) for url in urls]
+    load_time = time.perf_counter() - start
+
+    pages = [store.page(store.latest(url)) for url in urls]
+    start = time.perf_counter()
+    reextracted = [page_text(None, page, extract_job_text) for page in pages]
+    extract_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reports = [match_skills(resume_text, text) for text in texts]
+    match_time = time.perf_counter() - start
+
+    print(f"{len(urls)} snapshotted job pages, {sum(len(page.body) for page in pages) / 1024 / 1024:.1f} MiB")
+    print(f"{'stage':<28}{'total s':>9}{'ms/job':>9}")
+    for label, elapsed in (("load text from snapshots", load_time),
+                           ("re-extract from raw pages", extract_time),
+                           ("match skills (fast mode)", match_time)):
+        print(f"{label:<28}{elapsed:>9.3f}{elapsed / len(urls) * 1000:>9.2f}")
+    changed = sum(text != again for text, again in zip(texts, reextracted))
+    print(f"text differing from the snapshot after re-extraction: {changed}/{len(urls)}")
+    missing = sum(len(report.missing_skills) for report in reports) / len(reports)
+    print(f"average missing skills per job: {missing:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+# benchmarks/salary.py
+"""
+Compares modules.salary with the apps' old parse_salary (re.sub(r'[^\\d,]', ...)
+on every call) on sample salary strings, checks the parsed bounds of the strings
+in CHECKS, then times parsing a synthetic column
+of salaries drawn from a few hundred formats, as a job feed repeats them:
+
+- the old per-call parse_salary
+- modules.salary parsing every row without the cache
+- modules.salary.parse_salaries (each distinct string parsed once)
+
+Run from job-agent-mcp/:
+    python -m benchmarks.salary [--rows 200000] [--formats 300]
+"""
+import argparse
+import random
+import re
+import time
+
+from modules.salary import _parse_text, parse_salaries, parse_salary
+
+SAMPLES = [
+    "$120k–$150k",
+    "SGD 8,000/month",
+    "S$5,000 - S$7,000 per month",
+    "USD 90,000 - 110,000 a year",
+    "£45 per hour",
+    "120-150k",
+    "RM 6000 monthly",
+    "Negotiable",
+    "Up to $150,000 + 10% bonus",
+    "From SGD 4,500 per month, 5 days work week",
+    "$100k plus 401k match",
+]
+# Expected annual (min, max) in SGD: only joined amounts form a range, the first
+# amount or range with a currency, k or period next to it is the salary, percentages
+# and other numbers are ignored, and the nearest period word applies
+CHECKS = {
+    "$120k–$150k": (120_000, 150_000),
+    "SGD 8,000/month": (96_000, 96_000),
+    "S$5,000 - S$7,000 per month": (60_000, 84_000),
+    "120-150k": (120_000, 150_000),
+    "SGD 4,500 to 6,000 monthly": (54_000, 72_000),
+    "Up to $150,000 + 10% bonus": (None, 150_000),
+    "3-5 years experience, $6,000/month": (72_000, 72_000),
+    "SGD 60.000 - 70.000": (60_000, 70_000),
+    "Salary: 8000 - 10000": (None, None),
+    "From SGD 4,500 per month, 5 days work week": (54_000, 54_000),
+    "$100k plus 401k match": (100_000, 100_000),
+}
+TEMPLATES = [
+    "SGD {low:,} - {high:,} per month",
+    "S${low:,} - S${high:,}/mth",
+    "${low_k}k–${high_k}k",
+    "USD {low:,} - {high:,} a year",
+    "£{hourly} per hour",
+    "{low_k}-{high_k}k p.a.",
+    "RM {low:,} monthly",
+    "Competitive",
+]
+
+
+def legacy_parse_salary(salary_str: str) -> int:
+    """The parse_salary the V2-V6 apps defined."""
+    if not salary_str: return 0
+    numeric_str = re.sub(r'[^\\d,]', '', salary_str)
+    numeric_str = numeric_str.replace(',', '')
+    try:
+        return int(numeric_str)
+    except ValueError:
+        return 0
+
+
+def synthetic_column(rows: int, formats: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    distinct = []
+    for _ in range(formats):
+        low = rng.randrange(30, 150) * 100
+        values = {"low": low, "high": low + rng.randrange(5, 40) * 100, "low_k": low // 50,
+                  "high_k": low // 50 + rng.randrange(10, 40), "hourly": rng.randrange(20, 90)}
+        distinct.append(rng.choice(TEMPLATES).format(**values))
+    return [rng.choice(distinct) for _ in range(rows)]
+
+
+def timed(label: str, func, rows: int):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38}{elapsed * 1000:>9.1f} ms  ({elapsed / rows * 1e9:,.0f} ns/row)")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--formats", type=int, default=300, help="Distinct salary strings in the column")
+    args = parser.parse_args(argv)
+
+    print(f"{'salary':<44}{'old parse_salary':>18}  annual min/max (base currency)")
+    for sample in SAMPLES:
+        low, high = parse_salary(sample)
+        parsed = "none" if high is None else " - ".join("?" if bound is None else f"{bound:,.0f}" for bound in (low, high))
+        print(f"{sample:<44}{legacy_parse_salary(sample):>18}  {parsed}")
+
+    parsed = {sample: parse_salary(sample, "SGD", base="SGD") for sample in CHECKS}
+    wrong = [(sample, expected, parsed[sample]) for sample, expected in CHECKS.items() if parsed[sample] != expected]
+    print(f"\nchecks: {len(CHECKS) - len(wrong)}/{len(CHECKS)} as expected")
+    for sample, expected, got in wrong:
+        print(f"  {sample!r}: expected {expected}, got {got}")
+
+    column = synthetic_column(args.rows, args.formats)
+    print(f"\n{args.rows:,} salaries, {len(set(column))} distinct")
+    timed("old parse_salary per row", lambda: [legacy_parse_salary(value) for value in column], args.rows)
+    uncached = _parse_text.__wrapped__
+    timed("parse_salary per row, no cache", lambda: [uncached(value, "SGD", "year", "SGD") for value in column],
+          args.rows)
+    salary_min, _ = timed("parse_salaries (column)", lambda: parse_salaries(column), args.rows)
+    print(f"rows with a salary: {int((salary_min == salary_min).sum()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/upload_memory.py
+"""
+Compares per-upload peak memory of the old getvalue()/BytesIO resume path
+with modules.uploads.extract_text_from_upload.
+
+Run from job-agent-mcp/:
+    python -m benchmarks.upload_memory path/to/resume.pdf [path/to/resume.docx ...]
+"""
+import io
+import sys
+import tracemalloc
+from pathlib import Path
+
+import PyPDF2
+
+from modules.uploads import extract_text_from_upload
+
+
+class FakeUploadedFile(io.BytesIO):
+    """Stands in for streamlit's UploadedFile, which is a BytesIO subclass."""
+
+    def __init__(self, path):
+        super().__init__(Path(path).read_bytes())
+        self.name = Path(path).name
+        self.type = ""
+
+
+def legacy_extract(upload):
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(upload.getvalue()))
+    return "".join([page.extract_text() for page in pdf_reader.pages])
+
+
+def peak_kib(func, upload):
+    # Warm-up run so lazy imports and parser caches are not charged to either path
+    upload.seek(0)
+    func(upload)
+    upload.seek(0)
+    tracemalloc.start()
+    func(upload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(paths):
+    for path in paths:
+        upload = FakeUploadedFile(path)
+        size_kib = len(upload.getbuffer()) / 1024
+        adapter = peak_kib(extract_text_from_upload, upload)
+        line = f"{upload.name}: {size_kib:.0f} KiB file, adapter peak {adapter:.0f} KiB"
+        if upload.name.lower().endswith(".pdf"):
+            legacy = peak_kib(legacy_extract, upload)
+            line += f", legacy peak {legacy:.0f} KiB"
+        print(line)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    main(sys.argv[1:])
@@ -5,6 +5,7 @@ from mcp.types import TextContent, Tool
 # Import from modules package
 from modules.job_api import fetch_live_jobs
 from modules.embeddings import rank_jobs_by_query
+from modules.dedup import dedupe_jobs
 from modules.skill_gap import analyze_skill_gap
 
 app = Server("job-recommendation-mcp")
@@ -15,7 +16,7 @@ async def list_tools():
         Tool(
             name="fetch_jobs",
             description="Fetch and rank job postings",
-            inputSchema={"type":"object","required":["query"],"properties":{"query":{"type":"string"}}}
+            inputSchema={"type":"object","required":["query"],"properties":{"query":{"type":"string"},"min_salary":{"type":"number"},"locations":{"type":"array","items":{"type":"string"}}}}
         ),
         Tool(
             name="skill_gap",
@@ -29,8 +30,11 @@ async def call_tool(name: str, arguments: dict):
     if name == "fetch_jobs":
         query = arguments["query"]
         jobs = await asyncio.to_thread(fetch_live_jobs)
-        ranked = await asyncio.to_thread(rank_jobs_by_query, query, jobs)
-        return [TextContent(type="text", text=str(ranked[:5]))]
+        # Reposts of the same role are ranked once, with the copies listed under "duplicates"
+        jobs = await asyncio.to_thread(dedupe_jobs, jobs)
+        ranked = await asyncio.to_thread(rank_jobs_by_query, query, jobs,
+                                         arguments.get("min_salary"), arguments.get("locations"))
+        return [TextContent(type="text", text=str([job.to_dict() for job in ranked[:5]]))]
     elif name == "skill_gap":
         resume_text = arguments["resume_text"]
         jobs = arguments["jobs"]
@@ -2,4 +2,13 @@
 from .utils import extract_skills_from_resume
 from .skill_gap import analyze_skill_gap
 from .job_api import fetch_live_jobs
-from .embeddings import rank_jobs_by_query
\ No newline at end of file
+from .embeddings import rank_jobs_by_query
+from .uploads import extract_text_from_upload, open_upload
+from .resume_sections import get_resume_profile, segment_resume
+from .document import Document, as_document
+from .skill_matcher import match_skills
+from .main_content import extract_job_text
+from .dedup import dedupe_jobs
+from .job_posting import JobPosting, as_job_posting
+from .job_table import JobTable
+from .salary import parse_salary, parse_salaries
@@ -0,0 +1,179 @@
+# modules/batch.py
+"""
+Batch resume ingestion: parse a folder of PDF/DOCX resumes in a process pool,
+extract skills, score them against a job description and append one JSON line
+per resume to a results file.
+
+Completed file hashes are recorded in a manifest next to the results, so an
+interrupted run picks up where it left off. A failed file is retried on the
+next run and its error line replaced; a file with the same content as another
+gets a line pointing at the original ("duplicate_of") instead of being parsed.
+
+Run from job-agent-mcp/:
+    python -m modules.batch resumes/ --jd job_description.txt --out results.jsonl
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .utils import extract_skills_from_resume, extract_skills_from_text
+
+RESUME_SUFFIXES = (".pdf", ".docx")
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Returns the SHA-256 of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_resumes(folder, recursive=False):
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        p for p in Path(folder).glob(pattern)
+        if p.is_file() and p.suffix.lower() in RESUME_SUFFIXES
+    )
+
+
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return set()
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def load_results(out_path):
+    """
+    Returns the records already in the results file, in order.
+    """
+    if not os.path.exists(out_path):
+        return []
+    with open(out_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _drop_error_records(out_path, records):
+    """
+    Rewrites the results file without its error records (their files are about to be retried).
+    """
+    kept = [record for record in records if "error" not in record]
+    if len(kept) == len(records):
+        return kept
+    tmp_path = f"{out_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for record in kept:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, out_path)
+    return kept
+
+
+def _unique(words):
+    return list(dict.fromkeys(words))
+
+
+def process_resume(path, digest, jd_skills):
+    """
+    Parses one resume and scores it against the job description skills.
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    record = {"file": str(path), "sha256": digest}
+    try:
+        skills = _unique(extract_skills_from_resume(path))
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    resume_skills = {s.lower() for s in skills}
+    matched = [s for s in jd_skills if s.lower() in resume_skills]
+    missing = [s for s in jd_skills if s.lower() not in resume_skills]
+    record.update({
+        "skills": skills,
+        "matched_skills": matched,
+        "missing_skills": missing,
+        "score": round(len(matched) / len(jd_skills), 4) if jd_skills else 0.0,
+    })
+    return record
+
+
+def run_batch(folder, jd_text, out_path, manifest_path=None, workers=None, recursive=False):
+    """
+    Processes every resume in `folder` not already listed in the manifest (files
+    that failed are not listed, so they are retried and their error line is
+    replaced). Files whose content matches an earlier file get a "duplicate_of"
+    line instead. Returns the number of resumes parsed successfully in this run.
+    """
+    manifest_path = manifest_path or f"{out_path}.manifest"
+    done = load_manifest(manifest_path)
+    jd_skills = _unique(extract_skills_from_text(jd_text)) if jd_text else []
+    records = _drop_error_records(out_path, load_results(out_path))
+    listed = {(record["file"], record["sha256"]) for record in records}
+    originals = {record["sha256"]: record["file"] for record in records if "duplicate_of" not in record}
+
+    pending, duplicates = [], []
+    for path in find_resumes(folder, recursive):
+        digest = file_hash(path)
+        if (str(path), digest) in listed:
+            continue
+        if digest in originals:
+            duplicates.append({"file": str(path), "sha256": digest, "duplicate_of": originals[digest]})
+        elif digest not in done:
+            pending.append((path, digest))
+            originals[digest] = str(path)  # identical copies in the folder are parsed once
+    if not pending and not duplicates:
+        return 0
+
+    processed = 0
+    with open(out_path, "a", encoding="utf-8") as out, \
+            open(manifest_path, "a", encoding="utf-8") as manifest:
+        if pending:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(process_resume, path, digest, jd_skills) for path, digest in pending]
+                for n, future in enumerate(as_completed(futures), 1):
+                    record = future.result()
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    # Only mark a file done once its result line is on disk; failed files are retried next run
+                    if "error" not in record:
+                        manifest.write(record["sha256"] + "\n")
+                        manifest.flush()
+                        processed += 1
+                    print(f"[{n}/{len(pending)}] {record['file']}"
+                          + (f" ERROR {record['error']}" if "error" in record else f" score={record['score']}"))
+        # Written after the originals, so a copy's line follows the line it points at
+        for record in duplicates:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            print(f"{record['file']} duplicate of {record['duplicate_of']}")
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse and score a folder of resumes against a job description.")
+    parser.add_argument("folder", help="Folder containing PDF/DOCX resumes")
+    parser.add_argument("--jd", help="Text file with the job description to score against")
+    parser.add_argument("--out", default="results.jsonl", help="JSONL results file (appended to)")
+    parser.add_argument("--manifest", help="Completed-hash manifest (default: <out>.manifest)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--recursive", action="store_true", help="Also scan sub-folders")
+    args = parser.parse_args(argv)
+
+    jd_text = ""
+    if args.jd:
+        with open(args.jd, "r", encoding="utf-8") as f:
+            jd_text = f.read()
+
+    processed = run_batch(args.folder, jd_text, args.out, args.manifest, args.workers, args.recursive)
+    print(f"Processed {processed} new resume(s); results in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# modules/compaction.py
+"""
+Prompt compaction: shrink resume and job description text before it is sent to
+the LLM, keeping only the parts the skills/gaps analysis needs.
+
+Job descriptions are deduplicated line by line, stripped of page boilerplate
+(cookie banners, navigation, share/apply links, footers) and reduced to their
+requirement/responsibility sections. Resumes are reduced to their summary,
+skills and experience sections. Both are then cut to a token budget.
+"""
+import re
+from dataclasses import dataclass
+
+from .llm_client import estimate_tokens
+from .resume_sections import get_resume_profile
+
+DEFAULT_TOKEN_BUDGET = 4000
+# Share of the budget reserved for the resume; whatever it leaves unused goes to the JD
+RESUME_BUDGET_SHARE = 0.4
+
+# In priority order: when the budget runs out, the end of this list is cut first
+RESUME_PROMPT_SECTIONS = ("summary", "skills", "experience", "projects", "certifications")
+# Longer lines (a DOCX paragraph, a whole resume section on one line) are split before budgeting
+MAX_LINE_CHARS = 400
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?;])\s+")
+
+# Page furniture that is dropped wherever it appears on a line
+_BOILERPLATE_RE = re.compile(
+    r"\b(cookies?|privacy (policy|notice|settings)|terms (of use|and conditions|& conditions)"
+    r"|all rights reserved|similar jobs|related jobs|recommended jobs|people also viewed|jobs you may like"
+    r"|report (this )?job|accept all( cookies)?|manage preferences)\b|©|\(c\) \d{4}\b",
+    re.IGNORECASE,
+)
+# Link and button labels; only dropped on short lines, since the same words occur in real sentences
+_NAV_RE = re.compile(
+    r"\b(sign in|log ?in|sign up|register now|create (an )?account|share (this|on)|follow us"
+    r"|subscribe|newsletter|back to (top|search|jobs))\b"
+    r"|^(home|menu|search|jobs|careers|apply|apply now|save|save job|share|next|previous|close|skip to .*)$",
+    re.IGNORECASE,
+)
+_NAV_MAX_CHARS = 60
+
+# Headings that open a section worth keeping, and headings that close it
+_KEEP_HEADING_RE = re.compile(
+    r"^(key |main |core )?(responsibilities|duties|requirements|qualifications|skills"
+    r"|what you('ll| will) do|what you('ll| will) bring|what we('re| are) looking for"
+    r"|who you are|about (the|this) (role|job|position)|the role|role overview|job description"
+    r"|job summary|minimum qualifications|preferred qualifications|must[- ]haves?|nice[- ]to[- ]haves?"
+    r"|your profile|your role|experience|technical skills|required skills)\b.{0,30}$",
+    re.IGNORECASE,
+)
+_DROP_HEADING_RE = re.compile(
+    r"^(about (us|the company)|who we are|our (company|culture|values|story)|benefits|perks"
+    r"|what we offer|why (join|work)|compensation( and| &) benefits|equal (employment )?opportunit"
+    r"|how to apply|application process|diversity|similar jobs|related jobs)\b(?!.*:\s*\S).{0,40}$",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CompactedPrompt:
+    resume_text: str
+    job_description_text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+def dedupe_lines(text: str) -> list:
+    """
+    Splits text into stripped, non-empty lines, dropping repeats (case and spacing insensitive).
+    """
+    seen = set()
+    lines = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        key = line.lower()
+        if line and key not in seen:
+            seen.add(key)
+            lines.append(line)
+    return lines
+
+
+def strip_boilerplate(lines: list) -> list:
+    return [line for line in lines
+            if not _BOILERPLATE_RE.search(line) and not (len(line) <= _NAV_MAX_CHARS and _NAV_RE.search(line))]
+
+
+def _cut_at_word(text: str, max_chars: int) -> str:
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars + 1)
+    return text[:cut if cut > 0 else max_chars].rstrip()
+
+
+def split_long_lines(lines: list, max_chars: int = MAX_LINE_CHARS) -> list:
+    """
+    Splits lines longer than `max_chars` into sentences, and sentences that are still
+    too long into chunks at word boundaries.
+    """
+    split = []
+    for line in lines:
+        if len(line) <= max_chars:
+            split.append(line)
+            continue
+        for sentence in _SENTENCE_END_RE.split(line):
+            while len(sentence) > max_chars:
+                chunk = _cut_at_word(sentence, max_chars)
+                split.append(chunk)
+                sentence = sentence[len(chunk):].lstrip()
+            if sentence:
+                split.append(sentence)
+    return split
+
+
+def _is_heading(line: str) -> bool:
+    return len(line) <= 60 and not line.endswith(".")
+
+
+def extract_requirement_sections(lines: list) -> list:
+    """
+    Keeps lines under requirement/responsibility headings. Returns all lines if no such
+    heading is found, so unusual page layouts are not emptied.
+    """
+    kept = []
+    keeping = False
+    found = False
+    for line in lines:
+        if _is_heading(line) and _KEEP_HEADING_RE.match(line):
+            keeping = found = True
+        elif _is_heading(line) and _DROP_HEADING_RE.match(line):
+            keeping = False
+            continue
+        if keeping:
+            kept.append(line)
+    return kept if found else lines
+
+
+def truncate_to_budget(lines: list, max_tokens: int) -> list:
+    """
+    Keeps leading lines until the token budget is used up; the line that overflows
+    it is cut at a word boundary to fill what is left.
+    """
+    kept = []
+    used = 0
+    for line in split_long_lines(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            # estimate_tokens counts four characters per token
+            rest = _cut_at_word(line, (max_tokens - used - 1) * 4)
+            if rest:
+                kept.append(rest)
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def compact_job_description(text: str) -> list:
+    return extract_requirement_sections(strip_boilerplate(dedupe_lines(text)))
+
+
+def compact_resume(text: str) -> list:
+    profile = get_resume_profile(text)
+    # Sections in RESUME_PROMPT_SECTIONS order, so budgeting cuts long experience before skills
+    relevant = "\n".join(filter(None, (profile.section_text(name) for name in RESUME_PROMPT_SECTIONS)))
+    return dedupe_lines(relevant or profile.relevant_text(RESUME_PROMPT_SECTIONS))
+
+
+def compact_prompt_inputs(resume_text: str, job_description_text: str,
+                          token_budget: int = DEFAULT_TOKEN_BUDGET) -> CompactedPrompt:
+    """
+    Compacts the resume and job description to fit `token_budget` and reports token
+    counts before and after.
+    """
+    tokens_before = estimate_tokens(resume_text) + estimate_tokens(job_description_text)
+
+    resume_lines = compact_resume(resume_text)
+    jd_lines = compact_job_description(job_description_text)
+
+    resume_lines = truncate_to_budget(resume_lines, int(token_budget * RESUME_BUDGET_SHARE))
+    resume_compacted = "\n".join(resume_lines)
+    jd_budget = token_budget - estimate_tokens(resume_compacted)
+    jd_compacted = "\n".join(truncate_to_budget(jd_lines, jd_budget))
+
+    tokens_after = estimate_tokens(resume_compacted) + estimate_tokens(jd_compacted)
+    return CompactedPrompt(resume_compacted, jd_compacted, tokens_before, tokens_after)
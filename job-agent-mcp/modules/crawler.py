@@ -0,0 +1,329 @@
+# modules/crawler.py
+"""
+Concurrent crawler for lists of job URLs (e.g. samples/job_URL.txt).
+
+AsyncCrawler fetches every URL on one aiohttp session, so a batch of job pages
+takes about as long as its slowest few pages rather than the sum of all of them,
+while staying polite to each site:
+
+- At most `max_concurrency` requests are in flight, and at most `per_host_limit`
+  to any one host.
+- robots.txt is fetched once per host (and kept for `robots_ttl` seconds);
+  disallowed URLs are not fetched, and the host's Crawl-delay / Request-rate (or
+  `politeness_delay` when it has none, capped at `max_delay`) spaces out the
+  requests to that host.
+- Redirect chains longer than `max_redirects` and bodies larger than `max_bytes`
+  are abandoned, as are responses of a content type that cannot hold a job
+  description (web_fetch.ALLOWED_CONTENT_TYPES); PDFs go to the PDF extractor.
+
+Pages go through the same on-disk HTTP cache and text extraction as
+web_fetch.PageFetcher, so fresh pages are not requested again and stale ones are
+revalidated, and snapshotted when a snapshots.SnapshotStore is given (offline, pages
+are served from the snapshots alone). crawl() is an async generator yielding a CrawlResult per URL as soon
+as it is done; fetch_all() collects them in input order.
+
+Run from job-agent-mcp/:
+    python -m modules.crawler samples/job_URL.txt
+"""
+import argparse
+import asyncio
+import sys
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import aiohttp
+
+from .main_content import JOB_TEXT_VERSION, extract_job_text
+from .web_fetch import (DEFAULT_HTTP_CACHE_PATH, DEFAULT_MAX_RESPONSE_BYTES, DEFAULT_USER_AGENT, BodyReader,
+                        FetchError, HTTPCache, ResponseTooLarge, page_text)
+
+# The token matched against robots.txt User-agent lines
+ROBOTS_USER_AGENT = "job-agent"
+
+_ROBOTS_MAX_BYTES = 512 * 1024
+
+
+@dataclass
+class CrawlResult:
+    url: str
+    text: str = ""
+    status: int = None
+    final_url: str = None
+    error: str = None
+    from_cache: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _Host:
+    """Per-host politeness state for one crawl."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+
+    async def wait_turn(self):
+        """Sleeps until `delay` seconds have passed since the previous request to this host started."""
+        if not self.delay:
+            return
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            wait = self.next_start - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.next_start = loop.time() + self.delay
+
+
+async def _read_capped(response, max_bytes: int) -> bytes:
+    """The response body, raising ResponseTooLarge as soon as it exceeds `max_bytes`."""
+    if response.content_length is not None and response.content_length > max_bytes:
+        raise ResponseTooLarge(f"response is {response.content_length} bytes, over the {max_bytes} byte limit")
+    chunks, size = [], 0
+    async for chunk in response.content.iter_chunked(64 * 1024):
+        size += len(chunk)
+        if size > max_bytes:
+            raise ResponseTooLarge(f"response is over the {max_bytes} byte limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class AsyncCrawler:
+    """
+    Fetches many pages concurrently with per-host limits, robots.txt and politeness
+    delays. One instance can run several crawls (one at a time or concurrently, each
+    in its own event loop or not); parsed robots.txt files are shared between them.
+    """
+
+    def __init__(self, cache: HTTPCache = None, cache_path: str = DEFAULT_HTTP_CACHE_PATH,
+                 max_concurrency: int = 32, per_host_limit: int = 4, timeout: float = 30,
+                 max_redirects: int = 5, max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+                 politeness_delay: float = 0.0, max_delay: float = 10.0,
+                 respect_robots: bool = True, robots_ttl: float = 3600,
+                 user_agent: str = DEFAULT_USER_AGENT, default_ttl: float = 3600,
+                 extractor=extract_job_text, extractor_version: str = JOB_TEXT_VERSION,
+                 snapshots=None, offline: bool = False):
+        if offline and snapshots is None:
+            raise ValueError("offline mode serves pages from snapshots; pass a snapshots.SnapshotStore")
+        self.snapshots = snapshots
+        self.offline = offline
+        self.cache = cache if cache is not None else HTTPCache(cache_path)
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.max_bytes = max_bytes
+        self.politeness_delay = politeness_delay
+        self.max_delay = max_delay
+        self.respect_robots = respect_robots
+        self.robots_ttl = robots_ttl
+        self.user_agent = user_agent
+        self.default_ttl = default_ttl
+        self.extractor = extractor
+        self.extractor_version = extractor_version
+        # origin -> (RobotFileParser, fetched_at)
+        self._robots = {}
+
+    # --- robots.txt ---
+
+    async def _fetch_robots(self, session, origin: str) -> RobotFileParser:
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            async with session.get(parser.url, max_redirects=self.max_redirects + 1) as response:
+                if response.status in (401, 403):
+                    parser.disallow_all = True
+                elif response.status >= 400:
+                    parser.allow_all = True
+                else:
+                    body = await _read_capped(response, _ROBOTS_MAX_BYTES)
+                    parser.parse(body.decode("utf-8", errors="replace").splitlines())
+        except (aiohttp.ClientError, asyncio.TimeoutError, ResponseTooLarge):
+            # No usable robots.txt: nothing is disallowed
+            parser.allow_all = True
+        return parser
+
+    async def _robots_for(self, session, origin: str, pending: dict) -> RobotFileParser:
+        """The origin's robots.txt, fetched at most once per `robots_ttl` even when many URLs ask at once."""
+        cached = self._robots.get(origin)
+        if cached is not None and time.time() - cached[1] < self.robots_ttl:
+            return cached[0]
+        if origin not in pending:
+            pending[origin] = asyncio.ensure_future(self._fetch_robots(session, origin))
+        parser = await pending[origin]
+        self._robots[origin] = (parser, time.time())
+        return parser
+
+    def _host_delay(self, robots: RobotFileParser) -> float:
+        delay = None
+        if robots is not None:
+            delay = robots.crawl_delay(ROBOTS_USER_AGENT)
+            rate = robots.request_rate(ROBOTS_USER_AGENT)
+            if delay is None and rate is not None and rate.requests:
+                delay = rate.seconds / rate.requests
+        if delay is None:
+            delay = self.politeness_delay
+        return min(float(delay), self.max_delay)
+
+    # --- fetching ---
+
+    def _extract(self, page, result: CrawlResult = None) -> str:
+        text = page_text(self.cache, page, self.extractor, self.extractor_version)
+        if self.snapshots is not None:
+            self.snapshots.record(page, text, self.extractor_version,
+                                  result.final_url if result else None, result.status if result else None)
+        return text
+
+    async def _extract_into(self, page, result: CrawlResult):
+        """
+        Sets result.text from `page` in a worker thread (PDF extraction in particular can
+        take a while). A page the extractor fails on, such as a corrupt PDF, only fails
+        its own result.
+        """
+        try:
+            result.text = await asyncio.to_thread(self._extract, page, result)
+        except Exception as e:
+            result.error = f"text extraction failed: {type(e).__name__}: {e}"
+
+    def _replay(self, url: str) -> CrawlResult:
+        """Offline: the URL's text from its latest snapshot."""
+        start = time.perf_counter()
+        result = CrawlResult(url, from_cache=True)
+        try:
+            result.text = self.snapshots.text(url, self.extractor, self.extractor_version)
+        except FetchError as e:
+            result.error = str(e)
+        except Exception as e:
+            result.error = f"text extraction failed: {type(e).__name__}: {e}"
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def _fetch(self, session, url: str, hosts: dict, pending_robots: dict) -> CrawlResult:
+        start = time.perf_counter()
+        result = CrawlResult(url)
+        try:
+            now = time.time()
+            cached = self.cache.get(url)
+            if cached is not None and cached.is_fresh(now):
+                self.cache.touch(url)
+                result.from_cache = True
+                await self._extract_into(cached.page, result)
+                return result
+
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                result.error = "not an http(s) URL"
+                return result
+            origin = f"{parts.scheme}://{parts.netloc}"
+            robots = await self._robots_for(session, origin, pending_robots) if self.respect_robots else None
+            if robots is not None and not robots.can_fetch(ROBOTS_USER_AGENT, url):
+                result.error = "disallowed by robots.txt"
+                return result
+            if origin not in hosts:
+                hosts[origin] = _Host(self._host_delay(robots))
+            await hosts[origin].wait_turn()
+
+            headers = cached.validators() if cached is not None else {}
+            # aiohttp raises on the max_redirects-th redirect itself; +1 follows that many, as PageFetcher does
+            async with session.get(url, headers=headers, max_redirects=self.max_redirects + 1) as response:
+                result.status, result.final_url = response.status, str(response.url)
+                if response.status == 304 and cached is not None:
+                    self.cache.revalidated(cached, response.headers, now, self.default_ttl)
+                    page, result.from_cache = cached.page, True
+                elif response.status >= 400:
+                    result.error = f"HTTP {response.status} {response.reason}"
+                    return result
+                else:
+                    reader = BodyReader(url, response.headers.get("Content-Type", ""), self.max_bytes,
+                                        response.content_length)
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        reader.feed(chunk)
+                    page = reader.page()
+                    self.cache.store(page, response.headers, now, self.default_ttl)
+            await self._extract_into(page, result)
+        except aiohttp.TooManyRedirects:
+            result.error = f"more than {self.max_redirects} redirects"
+        except FetchError as e:
+            result.error = str(e)
+        except asyncio.TimeoutError:
+            result.error = f"timed out after {self.timeout}s"
+        except aiohttp.ClientError as e:
+            result.error = f"{type(e).__name__}: {e}"
+        finally:
+            result.elapsed = time.perf_counter() - start
+        return result
+
+    async def crawl(self, urls):
+        """Yields a CrawlResult for each distinct URL in `urls`, in the order they finish."""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        if self.offline:
+            for url in urls:
+                yield self._replay(url)
+            return
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit)
+        # Per connect and read rather than total, which would also count the wait for a free connection
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={"User-Agent": self.user_agent}) as session:
+            hosts, pending_robots = {}, {}
+            tasks = [asyncio.ensure_future(self._fetch(session, url, hosts, pending_robots)) for url in urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                # The consumer stopped early (or was cancelled): do not leave fetches running
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, *pending_robots.values(), return_exceptions=True)
+
+    async def fetch_all(self, urls) -> list:
+        """CrawlResults for `urls`, in input order (duplicates share one fetch)."""
+        results = {}
+        async for result in self.crawl(urls):
+            results[result.url] = result
+        return [results[url] for url in urls]
+
+
+def read_url_list(path: str) -> list:
+    """URLs from a text file, one per line; blank lines and # comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith("#")]
+
+
+async def _print_crawl(crawler: AsyncCrawler, urls):
+    start = time.perf_counter()
+    failed = 0
+    async for result in crawler.crawl(urls):
+        status = "cache" if result.from_cache else result.status
+        if result.ok:
+            print(f"{status}\t{result.elapsed:6.2f}s\t{len(result.text):>7} chars\t{result.url}")
+        else:
+            failed += 1
+            print(f"{status}\t{result.elapsed:6.2f}s\t{result.error}\t{result.url}")
+    print(f"{len(set(urls))} URLs in {time.perf_counter() - start:.2f}s, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch and extract a list of job pages concurrently.")
+    parser.add_argument("url_file", help="Text file with one job URL per line")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent requests per host")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Seconds between requests to a host whose robots.txt sets no Crawl-delay")
+    parser.add_argument("--ignore-robots", action="store_true", help="Do not fetch or obey robots.txt")
+    args = parser.parse_args(argv)
+
+    crawler = AsyncCrawler(per_host_limit=args.per_host, politeness_delay=args.delay,
+                           respect_robots=not args.ignore_robots)
+    return asyncio.run(_print_crawl(crawler, read_url_list(args.url_file)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
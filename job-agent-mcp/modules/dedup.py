@@ -0,0 +1,159 @@
+# modules/dedup.py
+"""
+Near-duplicate detection for job postings. The same role shows up many times in
+feeds and URL lists (reposts, agencies, one posting per location), and each copy
+would otherwise be ranked and sent to the LLM in full.
+
+Each description is reduced to a MinHash signature over its word 5-shingles: the
+fraction of signature positions two postings share estimates the Jaccard
+similarity of their shingle sets. Signatures are banded into an LSH index so only
+postings that agree on a whole band are compared, and pairs whose estimated
+similarity reaches `threshold` are merged into clusters (union-find). With the
+defaults (128 hashes, 16 bands of 8) pairs above ~0.7 similarity almost always
+become candidates, and the 0.8 threshold then decides.
+
+cluster_near_duplicates() returns clusters of indices; dedupe_jobs() keeps one
+representative JobPosting per cluster, with the others in its `duplicates`.
+
+Compare clusters with exact pairwise similarity using `python -m benchmarks.dedup`.
+"""
+import copy
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from .job_posting import as_job_posting
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+
+_WORD_RE = re.compile(r"\w+")
+# Odd multiplier combining a shingle's token hashes into one 64-bit value
+_SHINGLE_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Distinct 64-bit hashes of the word `size`-shingles of `text` (lowercased); empty if it has no words."""
+    tokens = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in _WORD_RE.findall(text.lower())),
+                         dtype=np.uint64)
+    if len(tokens) == 0:
+        return tokens
+    size = min(size, len(tokens))
+    count = len(tokens) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_MULTIPLIER + tokens[offset:offset + count]
+    return np.unique(hashes)
+
+
+class MinHasher:
+    """MinHash signatures with `num_perm` multiply-shift hash functions (seeded, so signatures are reproducible)."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1, shingle_size: int = SHINGLE_SIZE):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, 2 ** 63, size=(num_perm, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+
+    def signature(self, text: str):
+        """The text's signature (num_perm uint32 values), or None when it has no words."""
+        shingles = shingle_hashes(text or "", self.shingle_size)
+        if len(shingles) == 0:
+            return None
+        # Overflow wraps modulo 2**64; the high 32 bits are the hash value
+        return ((self._a * shingles + self._b) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def estimated_similarity(signature_a, signature_b) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(signature_a == signature_b)) / len(signature_a)
+
+
+class LSHIndex:
+    """Banded MinHash index: keys whose signatures are identical in any band are candidates."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.rows = num_perm // bands
+        self.bands = bands
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def candidates(self, signature) -> set:
+        found = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            found.update(bucket.get(key, ()))
+        return found
+
+    def add(self, key, signature):
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].append(key)
+
+
+def cluster_near_duplicates(texts, threshold: float = DEFAULT_THRESHOLD, hasher: MinHasher = None,
+                            bands: int = DEFAULT_BANDS) -> list:
+    """
+    Groups the indices of near-duplicate texts. Every index appears in exactly one
+    cluster; clusters and their members are in input order, so each cluster's first
+    index is its earliest text. Texts without words are never merged.
+    """
+    hasher = hasher or MinHasher()
+    index = LSHIndex(hasher.num_perm, bands)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    signatures = {}
+    for i, text in enumerate(texts):
+        signature = hasher.signature(text)
+        if signature is None:
+            continue
+        for j in index.candidates(signature):
+            if estimated_similarity(signature, signatures[j]) >= threshold:
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j:
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+        index.add(i, signature)
+        signatures[i] = signature
+
+    clusters = defaultdict(list)
+    for i in range(len(texts)):
+        clusters[find(i)].append(i)
+    return [clusters[root] for root in sorted(clusters)]
+
+
+def dedupe_jobs(jobs: list, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    One JobPosting per cluster of near-duplicate descriptions (the first in `jobs`),
+    in input order, with the other postings of its cluster in `duplicates`.
+    Job dicts are normalised to JobPostings. The returned postings are shallow
+    copies, so the caller's JobPostings are never modified.
+    """
+    jobs = [as_job_posting(job) for job in jobs]
+    representatives = []
+    for cluster in cluster_near_duplicates([job.description for job in jobs], threshold):
+        representative = copy.copy(jobs[cluster[0]])
+        # Members are copies without duplicates of their own, so to_dict() cannot recurse
+        representative.duplicates = tuple(_without_duplicates(jobs[i]) for i in cluster[1:])
+        representatives.append(representative)
+    return representatives
+
+
+def _without_duplicates(job):
+    if not job.duplicates:
+        return job
+    job = copy.copy(job)
+    job.duplicates = ()
+    return job
@@ -0,0 +1,191 @@
+# modules/document.py
+import re
+import weakref
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+# The same tokens with their original casing
+_CASED_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#.\-]*[A-Za-z0-9+#]|[A-Za-z0-9]")
+
+
+class SkillVocabulary:
+    """
+    Interns skill names to small integer ids so documents can be compared as id sets.
+
+    Multi-word skills ("machine learning") are matched as token n-grams.
+    """
+    __slots__ = ("_ids", "_cased_ids", "_name_ids", "_names", "_max_ngram", "__weakref__")
+
+    def __init__(self, skills=()):
+        self._ids = {}
+        self._cased_ids = {}
+        self._name_ids = {}
+        self._names = []
+        self._max_ngram = 1
+        for skill in skills:
+            self.add(skill)
+
+    def add(self, skill, aliases=(), cased_name=False):
+        """
+        Interns `skill` and returns its id. Each alias ("js" for "JavaScript") is
+        matched as the same skill. With cased_name=True the name itself is only
+        matched in text written as given (for names that are also common words:
+        "React" and "Excel", but not "react to incidents" or "excel at"); aliases
+        and id_for() stay case-insensitive.
+        """
+        key = tuple(tokenize(normalize(skill)))
+        if not key:
+            return None
+        skill_id = self._name_ids.get(key, self._ids.get(key))
+        if skill_id is None:
+            skill_id = len(self._names)
+            self._name_ids[key] = skill_id
+            self._names.append(skill.strip())
+        if cased_name:
+            self._cased_ids.setdefault(tuple(_CASED_TOKEN_RE.findall(skill)), skill_id)
+        else:
+            self._ids.setdefault(key, skill_id)
+        self._max_ngram = max(self._max_ngram, len(key))
+        for alias in aliases:
+            alias_key = tuple(tokenize(normalize(alias)))
+            if alias_key:
+                self._ids.setdefault(alias_key, skill_id)
+                self._max_ngram = max(self._max_ngram, len(alias_key))
+        return skill_id
+
+    def id_for(self, skill):
+        key = tuple(tokenize(normalize(skill)))
+        return self._ids.get(key, self._name_ids.get(key))
+
+    def name(self, skill_id):
+        return self._names[skill_id]
+
+    @property
+    def has_cased_names(self):
+        return bool(self._cased_ids)
+
+    def ids_in(self, tokens, cased_tokens=()):
+        """
+        Ids of the skills in `tokens` (lowercase) and, for names added with
+        cased_name=True, in `cased_tokens` (the same text with its original casing).
+        """
+        found = set()
+        for ids, words in ((self._ids, tokens), (self._cased_ids, cased_tokens)):
+            if not ids:
+                continue
+            for n in range(1, self._max_ngram + 1):
+                for i in range(len(words) - n + 1):
+                    skill_id = ids.get(tuple(words[i:i + n]))
+                    if skill_id is not None:
+                        found.add(skill_id)
+        return frozenset(found)
+
+    def __len__(self):
+        return len(self._names)
+
+
+def normalize(text):
+    """
+    Lowercases text and collapses runs of whitespace.
+    """
+    return " ".join(text.lower().split())
+
+
+def tokenize(normalized_text):
+    return _TOKEN_RE.findall(normalized_text)
+
+
+class Document:
+    """
+    A resume, job description or query whose normalised text, tokens and skill ids
+    are computed on first use and then reused by every stage it is passed to.
+    """
+    __slots__ = ("raw", "_words", "_normalized", "_tokens", "_cased_tokens", "_token_set", "_skill_ids")
+
+    def __init__(self, raw):
+        self.raw = raw or ""
+        self._words = None
+        self._normalized = None
+        self._tokens = None
+        self._cased_tokens = None
+        self._token_set = None
+        self._skill_ids = None
+
+    @property
+    def words(self):
+        """Whitespace-split words with their original casing."""
+        if self._words is None:
+            self._words = tuple(self.raw.split())
+        return self._words
+
+    @property
+    def normalized(self):
+        if self._normalized is None:
+            self._normalized = normalize(self.raw)
+        return self._normalized
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = tuple(tokenize(self.normalized))
+        return self._tokens
+
+    @property
+    def cased_tokens(self):
+        """`tokens` with their original casing."""
+        if self._cased_tokens is None:
+            self._cased_tokens = tuple(_CASED_TOKEN_RE.findall(self.raw))
+        return self._cased_tokens
+
+    @property
+    def token_set(self):
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    def skill_ids(self, vocabulary):
+        """
+        Returns the ids of vocabulary skills found in the document, memoised per
+        vocabulary (held weakly, so a freed vocabulary's ids are dropped with it).
+        """
+        if self._skill_ids is None:
+            self._skill_ids = weakref.WeakKeyDictionary()
+        ids = self._skill_ids.get(vocabulary)
+        if ids is None:
+            ids = vocabulary.ids_in(self.tokens, self.cased_tokens if vocabulary.has_cased_names else ())
+            self._skill_ids[vocabulary] = ids
+        return ids
+
+    def contains(self, phrase):
+        """
+        Case-insensitive phrase check on token boundaries: token membership for
+        single words, a contiguous token sequence otherwise ("Java" is not found
+        in "JavaScript", nor "SQL" in "NoSQL").
+        """
+        phrase_tokens = tokenize(normalize(phrase))
+        if not phrase_tokens:
+            return False
+        first = phrase_tokens[0]
+        if first not in self.token_set:
+            return False
+        if len(phrase_tokens) == 1:
+            return True
+        tokens, n = self.tokens, len(phrase_tokens)
+        return any(tokens[i] == first and list(tokens[i:i + n]) == phrase_tokens
+                   for i in range(len(tokens) - n + 1))
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        preview = self.raw[:40].replace("\n", " ")
+        return f"Document({preview!r}{'...' if len(self.raw) > 40 else ''})"
+
+
+def as_document(text):
+    """
+    Wraps text in a Document, passing existing Documents through unchanged.
+    """
+    return text if isinstance(text, Document) else Document(text)
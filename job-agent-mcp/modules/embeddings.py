@@ -1,18 +1,37 @@
-from sentence_transformers import SentenceTransformer, util
+from functools import lru_cache
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+import numpy as np
 
-def rank_jobs_by_query(query: str, jobs: list):
+from .job_table import JobTable
+
+
+@lru_cache(maxsize=1)
+def _get_model():
+    # Loaded on first use so importing the modules package stays cheap
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer('all-MiniLM-L6-v2')
+
+def rank_jobs_by_query(query: str, jobs: list, min_salary: float = None, locations=None):
+    """
+    JobPostings (job dicts are normalised) ranked by description similarity to `query`.
+    With `min_salary` and/or `locations`, only jobs whose salary range reaches
+    `min_salary` and whose location is one of `locations` are returned.
+    """
     if not jobs:
         return []
+    table = JobTable.from_postings(jobs)
+    mask = np.ones(len(table), dtype=bool)
+    if min_salary is not None:
+        mask &= table.salary_at_least(min_salary)
+    if locations:
+        mask &= table.location_in(locations)
+    rows = np.flatnonzero(mask)
+    if len(rows) == 0:
+        return []
 
-    query_vec = model.encode(query, convert_to_tensor=True)
-    job_vecs = model.encode([job['description'] for job in jobs], convert_to_tensor=True)
-
-    cosine_scores = util.cos_sim(query_vec, job_vecs)[0]
-    ranked_jobs = sorted(
-        zip(jobs, cosine_scores.tolist()),
-        key=lambda x: x[1],
-        reverse=True
-    )
-    return [job for job, score in ranked_jobs]
\ No newline at end of file
+    model = _get_model()
+    query_vec = model.encode(query)
+    # Only the jobs that pass the filters are embedded
+    job_vecs = model.encode([table.postings[row].description for row in rows])
+    scores = job_vecs @ query_vec / np.maximum(np.linalg.norm(job_vecs, axis=1) * np.linalg.norm(query_vec), 1e-12)
+    return table.jobs(JobTable.top_k(scores, len(rows), rows))
@@ -0,0 +1,154 @@
+# modules/html_text.py
+"""
+HTML to plain text for job description pages.
+
+html_to_text() is the original BeautifulSoup implementation, kept as the reference.
+html_to_text_fast() streams the page through lxml's parser (the stdlib HTMLParser
+when lxml is not installed) without building a tree: text is collected in one pass,
+skipping everything inside script, style, nav, footer and similar elements, and the
+line cleanup runs as one regex split instead of nested generators. With
+drop_tags=("script", "style") its output matches html_to_text(); on the lxml path,
+pages with stray end tags can still differ in how whitespace between text joins,
+since libxml2 ignores tags that html.parser reports.
+
+Compare the two on saved pages with `python -m benchmarks.html_text`.
+"""
+import re
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # lxml is optional; the stdlib parser is slower but streams the same way
+    etree = None
+
+# Part of the extracted-text cache key when html_to_text_fast is the extractor; bump when its output changes
+HTML_TEXT_VERSION = "2"
+
+# Elements whose text never belongs to the job description
+DROPPED_TAGS = frozenset({"script", "style", "noscript", "template", "nav", "footer"})
+
+_PRESERVE_WHITESPACE_TAGS = frozenset({"pre", "textarea"})
+_ASCII_SPACES = dict.fromkeys(map(ord, " \n\t\x0c\r"))
+
+# str.splitlines() boundaries, plus runs of two or more spaces (one "multi-headline" phrase each)
+_LINE_OR_PHRASE_BREAK = re.compile(r" {2,}|\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def clean_text_lines(text: str) -> str:
+    """One stripped line per text line or double-space separated phrase, blank lines dropped."""
+    return "\n".join(filter(None, map(str.strip, _LINE_OR_PHRASE_BREAK.split(text))))
+
+
+def html_to_text(html: str) -> str:
+    """
+    Visible text of an HTML page, one line per text block, without scripts, styles
+    or blank lines.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Remove script and style elements
+    for script_or_style in soup(['script', 'style']):
+        script_or_style.extract()
+
+    # Get text and clean it
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    return '\n'.join(chunk for chunk in chunks if chunk)
+
+
+class _TextCollector:
+    """
+    lxml parser target: collects text that is not inside a dropped element.
+
+    Like BeautifulSoup, a text node made only of ASCII whitespace collapses to a single
+    newline or space outside <pre>/<textarea>, so phrase splitting sees the same text.
+    """
+
+    def __init__(self, drop_tags):
+        self.drop_tags = drop_tags
+        self.depth = 0
+        self.preserve_depth = 0
+        self.parts = []
+        self._pending = []
+
+    def _flush(self):
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        if not self.preserve_depth and not text.translate(_ASCII_SPACES):
+            text = "\n" if "\n" in text else " "
+        self.parts.append(text)
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag in self.drop_tags:
+            self.depth += 1
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth += 1
+
+    def end(self, tag):
+        self._flush()
+        if self.depth and tag in self.drop_tags:
+            self.depth -= 1
+        if self.preserve_depth and tag in _PRESERVE_WHITESPACE_TAGS:
+            self.preserve_depth -= 1
+
+    def data(self, text):
+        if not self.depth:
+            self._pending.append(text)
+
+    def comment(self, text):
+        # Comments separate text nodes
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return "".join(self.parts)
+
+
+class _StdlibTextCollector(HTMLParser):
+    """The same collector on html.parser, used when lxml is not installed."""
+
+    def __init__(self, drop_tags):
+        super().__init__(convert_charrefs=True)
+        self.target = _TextCollector(drop_tags)
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, attrs)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+    def handle_comment(self, data):
+        self.target.comment(data)
+
+
+def _collect_text(html: str, drop_tags) -> str:
+    if etree is not None:
+        target = _TextCollector(drop_tags)
+        parser = etree.HTMLParser(target=target)
+        parser.feed(html)
+        return parser.close()
+    parser = _StdlibTextCollector(drop_tags)
+    parser.feed(html)
+    parser.close()
+    return parser.target.close()
+
+
+def html_to_text_fast(html: str, drop_tags=DROPPED_TAGS) -> str:
+    """
+    Visible text of an HTML page in one streaming pass, one line per text block,
+    without the text of `drop_tags` elements or blank lines.
+    """
+    if not html:
+        return ""
+    return clean_text_lines(_collect_text(html, drop_tags))
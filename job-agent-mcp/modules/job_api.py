@@ -1,5 +1,7 @@
 import requests
 
+from .job_posting import JobPosting
+
 FIND_SG_JOBS_API = "https://api.findsgjobs.gov.sg/v1/jobs"
 
 def fetch_live_jobs():
@@ -10,12 +12,5 @@ def fetch_live_jobs():
     except Exception:
         jobs_raw = []
 
-    jobs = []
-    for j in jobs_raw:
-        jobs.append({
-            'title': j.get('jobTitle', 'Unknown'),
-            'company': j.get('companyName', 'Unknown'),
-            'description': j.get('jobDescription', ''),
-            'skills': j.get('skills', [])
-        })
-    return jobs
\ No newline at end of file
+    # findsgjobs' jobTitle/companyName/jobDescription/skills map onto the shared record
+    return [JobPosting.from_dict(j) for j in jobs_raw]
@@ -0,0 +1,137 @@
+# modules/job_posting.py
+"""
+The canonical job record shared by every stage that handles job postings.
+
+Job sources name the same fields differently (findsgjobs' jobTitle/companyName,
+the V1/V2 job_search dicts' location/salary, schema.org JobPosting's
+hiringOrganization/baseSalary, the ADK tools' id). JobPosting.from_dict() maps all
+of them once, when a job enters the pipeline. Salary is parsed to annual amounts
+in the base currency (salary.parse_salary), company and location strings are
+interned (feeds repeat a few of each thousands of times), and the skill ids of
+the listed skills and the description are looked up once. Later stages read
+attributes instead of re-getting keys with defaults.
+"""
+import sys
+from datetime import datetime
+
+from .document import as_document
+from .salary import parse_salary
+from .skill_matcher import DEFAULT_VOCABULARY
+
+# Source keys for each field, in order of preference
+_FIELD_KEYS = {
+    "id": ("id", "job_id", "jobId", "uuid"),
+    "title": ("title", "jobTitle", "job_title", "name"),
+    "company": ("company", "companyName", "company_name", "hiringOrganization", "employer"),
+    "location": ("location", "jobLocation", "job_location", "city"),
+    "description": ("description", "jobDescription", "job_description"),
+    "url": ("url", "job_url", "link"),
+    "salary": ("salary", "baseSalary", "salary_text"),
+    "skills": ("skills", "skill_names"),
+    "posted_at": ("posted_at", "datePosted", "postedDate", "posted_date"),
+}
+
+
+def _first(raw: dict, keys):
+    for key in keys:
+        value = raw.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _text(value) -> str:
+    """A plain string from a field that may be a schema.org object ({"name": ...}) or a list of them."""
+    if isinstance(value, dict):
+        if "name" in value or "address" in value:
+            return _text(value.get("name") or value.get("address"))
+        return ", ".join(filter(None, (_text(value.get(key))
+                                       for key in ("addressLocality", "addressRegion", "addressCountry"))))
+    if isinstance(value, (list, tuple)):
+        return ", ".join(filter(None, map(_text, value)))
+    return "" if value is None else str(value).strip()
+
+
+def _posted_at(value):
+    """Epoch seconds from a timestamp or an ISO 8601 date, or None."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if value else ""
+
+
+class JobPosting:
+    """
+    One job posting, with salary parsed to annual base-currency amounts and skill ids precomputed
+    against the skill dictionary. Compact (__slots__), so long job lists stay small.
+    """
+    __slots__ = ("id", "title", "company", "location", "description", "url", "salary",
+                 "salary_min", "salary_max", "skills", "skill_ids", "posted_at", "duplicates")
+
+    def __init__(self, title="Unknown", company="Unknown", description="", location="", skills=(),
+                 salary="", url="", id="", posted_at=None, vocabulary=DEFAULT_VOCABULARY):
+        self.id = str(id) if id not in (None, "") else ""
+        self.title = title or "Unknown"
+        self.company = _intern(company or "Unknown")
+        self.location = _intern(location or "")
+        self.description = description or ""
+        self.url = url or ""
+        self.salary = "" if isinstance(salary, dict) else _text(salary)
+        self.salary_min, self.salary_max = parse_salary(salary)
+        self.skills = tuple(skill for skill in map(_text, skills or ()) if skill)
+        listed = (vocabulary.id_for(skill) for skill in self.skills)
+        self.skill_ids = frozenset(skill_id for skill_id in listed if skill_id is not None) \
+            | as_document(self.description).skill_ids(vocabulary)
+        self.posted_at = _posted_at(posted_at)
+        # Near-duplicate postings this one stands for (see dedup.dedupe_jobs)
+        self.duplicates = ()
+
+    @classmethod
+    def from_dict(cls, raw: dict, vocabulary=DEFAULT_VOCABULARY):
+        """Normalises a job dict from any of the known sources."""
+        fields = {name: _first(raw, keys) for name, keys in _FIELD_KEYS.items()}
+        skills = fields["skills"]
+        if isinstance(skills, str):
+            skills = [skill.strip() for skill in skills.split(",")]
+        return cls(
+            title=_text(fields["title"]),
+            company=_text(fields["company"]),
+            description=_text(fields["description"]),
+            location=_text(fields["location"]),
+            skills=skills or (),
+            salary=fields["salary"],
+            url=_text(fields["url"]),
+            id=fields["id"],
+            posted_at=fields["posted_at"],
+            vocabulary=vocabulary,
+        )
+
+    def to_dict(self) -> dict:
+        """The posting as a plain dict (title, company, description and skills always present)."""
+        job = {"title": self.title, "company": self.company, "description": self.description,
+               "skills": list(self.skills)}
+        for key in ("id", "location", "url", "salary", "salary_min", "salary_max", "posted_at"):
+            value = getattr(self, key)
+            if value not in (None, ""):
+                job[key] = value
+        if self.duplicates:
+            job["duplicates"] = [duplicate.to_dict() for duplicate in self.duplicates]
+        return job
+
+    def __repr__(self):
+        return f"JobPosting({self.title!r}, company={self.company!r}, location={self.location!r})"
+
+
+def as_job_posting(job, vocabulary=DEFAULT_VOCABULARY) -> JobPosting:
+    """
+    Normalises a job dict into a JobPosting, passing existing JobPostings through unchanged.
+    """
+    return job if isinstance(job, JobPosting) else JobPosting.from_dict(job, vocabulary)
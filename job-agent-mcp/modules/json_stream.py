@@ -0,0 +1,210 @@
+# modules/json_stream.py
+import json
+
+
+def strip_json_fence(report: str) -> str:
+    """
+    Removes a ```json ... ``` fence the model may wrap around its JSON output.
+    """
+    cleaned = report.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned[3:]
+        if cleaned.lower().startswith("json"):
+            cleaned = cleaned[4:]
+        if cleaned.rstrip().endswith("```"):
+            cleaned = cleaned.rstrip()[:-3]
+    return cleaned.strip()
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parses a streamed JSON object and reports each top-level field as soon as its value closes.
+
+        parser = IncrementalJSONObjectParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+
+    Anything before the opening brace (such as a ```json fence) is ignored. A field whose
+    value is malformed is skipped here; call `result()` at the end for the strict parse.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._phase = "start"  # start, key, colon, value_pending, value, after_value, done
+        self._value_kind = None  # string, container, literal
+        self._key_start = 0
+        self._value_start = 0
+        self._key = None
+        self.fields = {}
+
+    def feed(self, chunk: str) -> list:
+        self._text += chunk
+        completed = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._phase == "done":
+                break
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._phase == "key":
+                        self._key = json.loads(text[self._key_start:i + 1])
+                        self._phase = "colon"
+                    elif self._depth == 1 and self._phase == "value" and self._value_kind == "string":
+                        self._emit(text[self._value_start:i + 1], completed)
+                continue
+
+            if self._depth == 0:
+                if ch == "{" and self._phase == "start":
+                    self._depth = 1
+                    self._phase = "key"
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._phase == "key":
+                    self._key_start = i
+                elif self._depth == 1 and self._phase == "value_pending":
+                    self._start_value(i, "string")
+            elif ch in "{[":
+                if self._depth == 1 and self._phase == "value_pending":
+                    self._start_value(i, "container")
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._phase == "value" and self._value_kind == "container":
+                    self._emit(text[self._value_start:i + 1], completed)
+                elif self._depth == 0:
+                    if self._phase == "value" and self._value_kind == "literal":
+                        self._emit(text[self._value_start:i], completed)
+                    self._phase = "done"
+            elif self._depth == 1:
+                if ch == ":" and self._phase == "colon":
+                    self._phase = "value_pending"
+                elif ch == ",":
+                    if self._phase == "value" and self._value_kind == "literal":
+                        self._emit(text[self._value_start:i], completed)
+                    self._phase = "key"
+                elif self._phase == "value_pending" and not ch.isspace():
+                    self._start_value(i, "literal")
+        self._pos = len(text)
+        return completed
+
+    def _start_value(self, index, kind):
+        self._value_start = index
+        self._value_kind = kind
+        self._phase = "value"
+
+    def _emit(self, raw_value, completed):
+        self._phase = "after_value"
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def result(self):
+        """
+        Strictly parses everything fed so far; raises json.JSONDecodeError if it is not valid JSON.
+        """
+        return json.loads(strip_json_fence(self._text))
+
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+def repair_json(text: str) -> str:
+    """
+    Cheap fixes for near-valid JSON from a model: drops fences and text around the root
+    value, `#`/`//` comments, trailing commas and raw newlines in strings, maps Python
+    literals, and closes a truncated string, array or object.
+    """
+    text = strip_json_fence(text)
+    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return text
+    out = []
+    stack = []
+    in_string = escape = False
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            elif ch == "\n":
+                ch = "\\n"
+            out.append(ch)
+            i += 1
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch == "#" or text.startswith("//", i):
+            end = text.find("\n", i)
+            i = len(text) if end < 0 else end
+            continue
+        elif ch in _CLOSERS:
+            stack.append(_CLOSERS[ch])
+        elif ch in "}]":
+            while out and (out[-1].isspace() or out[-1] == ","):
+                out.pop()
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+            i += 1
+            continue
+        elif ch.isalpha():
+            j = i
+            while j < len(text) and text[j].isalnum():
+                j += 1
+            word = text[i:j]
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i = j
+            continue
+        out.append(ch)
+        i += 1
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    repaired = "".join(out).rstrip()
+    while repaired.endswith(","):
+        repaired = repaired[:-1].rstrip()
+    if repaired.endswith(":"):
+        repaired += " null"
+    return repaired + "".join(reversed(stack))
+
+
+def load_json_object(text: str):
+    """
+    Parses a model's JSON object output, falling back to repair_json().
+    Returns (value, repaired); raises json.JSONDecodeError if even the repaired text fails.
+    """
+    cleaned = strip_json_fence(text)
+    try:
+        return json.loads(cleaned), False
+    except json.JSONDecodeError:
+        return json.loads(repair_json(cleaned)), True
@@ -0,0 +1,99 @@
+# modules/llm_cache.py
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH", str(Path.home() / ".cache" / "job-agent" / "llm_responses.sqlite3")
+)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Disk-backed LLM response cache (SQLite) with TTL and size-based eviction.
+
+    Entries are keyed by model name, prompt template version and the hashes of
+    the texts that went into the prompt, so any change to one of them misses.
+    Least recently used entries are evicted once max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: float = 7 * 24 * 3600,
+                 max_entries: int = 2000, max_bytes: int = 50 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Streamlit reruns scripts on worker threads; access is serialised by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, *texts: str) -> str:
+        parts = [model, prompt_version] + [text_hash(t) for t in texts]
+        return text_hash("\x1f".join(parts))
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk from least recently used until both limits are met
+        freed_count, freed_bytes, doomed = 0, 0, []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if count - freed_count <= self.max_entries and total - freed_bytes <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed_count += 1
+            freed_bytes += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,640 @@
+# modules/llm_client.py
+"""
+Async LLM provider layer shared by the analyzer apps.
+
+Providers wrap the async clients of the Gemini (google-genai) and OpenAI SDKs
+(the latter also serves Groq's OpenAI-compatible endpoint) behind a `generate()`
+coroutine and a `stream()` async generator. FakeProvider answers locally with
+configurable latency and failures, for exercising the router without API keys. Every call
+goes through a RateLimiter (requests/minute and tokens/minute token buckets
+plus a max-in-flight cap) and is retried with exponential backoff when the
+provider answers 429 or a transient 5xx. Each call's tokens, latency, time to
+first token and retries are recorded in llm_metrics.
+
+Calls may pass a `prefix`: the stable leading part of the prompt (e.g. the resume)
+that repeats across calls. It is always sent ahead of the prompt, right after the
+system instructions, so OpenAI's automatic prompt-prefix caching applies; Gemini
+stores system instructions plus prefix as cached content, reused while its TTL
+lasts and extended as it is used.
+
+Streamlit drives each run with a fresh `asyncio.run()`, so nothing here is
+bound to a single event loop: the limiter uses plain counters guarded by a
+threading lock, and SDK clients are created once per event loop.
+"""
+import asyncio
+import hashlib
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+
+from .llm_metrics import METRICS, CallRecord
+
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class LLMResponse:
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt tokens served from a provider-side cache (a subset of prompt_tokens)
+    cached_tokens: int = 0
+
+
+@dataclass
+class StreamChunk:
+    """A piece of streamed output. Usage fields are set on the chunk that reports them."""
+    text: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    # Roughly four characters per token for English prose
+    return max(1, len(text) // 4)
+
+
+def prefix_key(system: str, prefix: str) -> str:
+    """Identifies a (system instructions, prefix) pair for provider-side caching."""
+    digest = hashlib.sha256()
+    for part in (system or "", prefix or ""):
+        digest.update(part.encode("utf-8", errors="replace"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ContextCacheTracker:
+    """
+    The prefix_key()s one session (a Streamlit session, or the whole process outside
+    Streamlit) has sent for its current resume. When the session moves on to another
+    resume, release() deletes the providers' cached contents for the old prefixes
+    rather than leaving them until their TTL runs out.
+    """
+
+    def __init__(self, system: str = None):
+        self.system = system
+        self.resume_digest = None
+        self.keys = set()
+
+    def track(self, prefix: str) -> str:
+        """Records a prefix sent for the current resume; returns it unchanged."""
+        self.keys.add(prefix_key(self.system, prefix))
+        return prefix
+
+    async def release(self, resume_digest: str, providers) -> int:
+        """
+        Makes `resume_digest` the current resume. If it differs from the previous one,
+        deletes the previous resume's cached contents on every provider that has
+        delete_context_caches(); returns the number of prefixes released.
+        """
+        released = 0
+        if self.resume_digest not in (None, resume_digest) and self.keys:
+            for provider in providers:
+                delete = getattr(provider, "delete_context_caches", None)
+                if delete is not None:
+                    await delete(self.keys)
+            released = len(self.keys)
+            self.keys.clear()
+        self.resume_digest = resume_digest
+        return released
+
+
+def join_prefix(prefix: str, prompt: str) -> str:
+    return f"{prefix}\n{prompt}" if prefix else prompt
+
+
+class TokenBucket:
+    """
+    Refills `rate_per_minute` units per minute up to `capacity`. The level may go
+    negative when actual usage turns out larger than estimated; later callers then wait.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def try_acquire(self, amount: float) -> float:
+        """Takes `amount` if available and returns 0, otherwise returns the seconds to wait."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._level >= amount:
+                self._level -= amount
+                return 0.0
+            return (amount - self._level) / self.rate_per_second
+
+    async def acquire(self, amount: float = 1):
+        while True:
+            wait = self.try_acquire(amount)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def adjust(self, delta: float):
+        """Debits (positive) or credits (negative) the bucket after the fact."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level - delta)
+
+
+class RateLimiter:
+    """
+    Combines a requests-per-minute bucket, a tokens-per-minute bucket and a cap on
+    concurrent in-flight calls. One limiter is normally shared by all calls to a provider.
+    """
+
+    def __init__(self, requests_per_minute: float = 60, tokens_per_minute: float = 250_000,
+                 max_in_flight: int = 4):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    async def _enter(self):
+        while True:
+            with self._lock:
+                if self._in_flight < self.max_in_flight:
+                    self._in_flight += 1
+                    return
+            await asyncio.sleep(0.05)
+
+    def _exit(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def acquire(self, estimated_tokens: int):
+        """Waits for request, token and concurrency budget. Pair with release()."""
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+        await self._enter()
+
+    def release(self, estimated_tokens: int, used_tokens: int = 0):
+        """Frees the in-flight slot and corrects the token estimate with actual usage."""
+        self._exit()
+        if used_tokens:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+
+    async def run(self, coro_factory, estimated_tokens: int):
+        """
+        Waits for budget, then awaits `coro_factory()`. The factory's result may expose
+        `prompt_tokens`/`completion_tokens`, which are used to correct the token estimate.
+        """
+        await self.acquire(estimated_tokens)
+        result = None
+        try:
+            result = await coro_factory()
+            return result
+        finally:
+            used = getattr(result, "prompt_tokens", 0) + getattr(result, "completion_tokens", 0)
+            self.release(estimated_tokens, used)
+
+
+def _status_code(exc: Exception):
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _retry_after(exc: Exception):
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class AsyncLLMProvider:
+    """
+    Base class: subclasses implement `_generate()` for one SDK.
+    """
+    name = "base"
+
+    def __init__(self, model: str, limiter: RateLimiter = None, max_retries: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 30.0, metrics=None):
+        self.model = model
+        self.limiter = limiter or RateLimiter()
+        self.metrics = metrics or METRICS
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._clients = weakref.WeakKeyDictionary()
+        self._locks = weakref.WeakKeyDictionary()
+
+    def _make_client(self):
+        raise NotImplementedError
+
+    def client(self):
+        """Returns the SDK client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._make_client()
+            self._clients[loop] = client
+        return client
+
+    def _loop_lock(self):
+        """An asyncio.Lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[loop] = lock
+        return lock
+
+    async def _generate(self, prompt: str, system: str = None, json_mode: bool = False,
+                        response_schema: dict = None, prefix: str = None) -> LLMResponse:
+        raise NotImplementedError
+
+    def _stream(self, prompt: str, system: str = None, json_mode: bool = False, response_schema: dict = None,
+                prefix: str = None):
+        """Async iterator of StreamChunk; subclasses override."""
+        raise NotImplementedError
+
+    def _retry_delay(self, exc: Exception, attempt: int):
+        """Seconds to wait before retrying, or None if the error should propagate."""
+        if _status_code(exc) not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+            return None
+        delay = _retry_after(exc)
+        if delay is None:
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+        return delay
+
+    async def generate(self, prompt: str, system: str = None, json_mode: bool = False,
+                       response_schema: dict = None, prefix: str = None) -> LLMResponse:
+        """
+        `json_mode` asks for a JSON object; `response_schema` (a JSON schema dict) also
+        constrains its shape where the provider supports it, and implies json_mode.
+        `prefix` is prompt text sent before `prompt` that the provider may cache.
+        """
+        estimated = estimate_tokens(join_prefix(prefix, prompt)) + estimate_tokens(system or "")
+        attempt = 0
+        start = time.monotonic()
+        status, response = "error", None
+        try:
+            while True:
+                try:
+                    response = await self.limiter.run(
+                        lambda: self._generate(prompt, system=system, json_mode=json_mode,
+                                               response_schema=response_schema, prefix=prefix), estimated
+                    )
+                    status = "ok"
+                    return response
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            self.metrics.record(CallRecord(
+                self.name, self.model, "generate", status, time.monotonic() - start,
+                prompt_tokens=getattr(response, "prompt_tokens", 0),
+                completion_tokens=getattr(response, "completion_tokens", 0),
+                cached_tokens=getattr(response, "cached_tokens", 0), retries=attempt,
+            ))
+
+    async def stream(self, prompt: str, system: str = None, json_mode: bool = False,
+                     response_schema: dict = None, prefix: str = None):
+        """
+        Yields the completion as text chunks while it is generated.
+
+        Rate limits apply as for generate(). A retryable error is only retried before the
+        first chunk arrives; after that, partial output has been consumed and it propagates.
+        """
+        estimated = estimate_tokens(join_prefix(prefix, prompt)) + estimate_tokens(system or "")
+        attempt = 0
+        start = time.monotonic()
+        status, first_token_at = "error", None
+        prompt_tokens = completion_tokens = cached_tokens = 0
+        try:
+            while True:
+                await self.limiter.acquire(estimated)
+                used = 0
+                try:
+                    async for chunk in self._stream(prompt, system=system, json_mode=json_mode,
+                                                    response_schema=response_schema, prefix=prefix):
+                        used += chunk.prompt_tokens + chunk.completion_tokens
+                        prompt_tokens += chunk.prompt_tokens
+                        completion_tokens += chunk.completion_tokens
+                        cached_tokens += chunk.cached_tokens
+                        if chunk.text:
+                            if first_token_at is None:
+                                first_token_at = time.monotonic()
+                            yield chunk.text
+                    status = "ok"
+                    return
+                except Exception as e:
+                    delay = None if first_token_at is not None else self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                finally:
+                    self.limiter.release(estimated, used)
+                attempt += 1
+                await asyncio.sleep(delay)
+        except (asyncio.CancelledError, GeneratorExit):
+            # The consumer stopped reading, e.g. a hedged call that lost
+            status = "cancelled"
+            raise
+        finally:
+            self.metrics.record(CallRecord(
+                self.name, self.model, "stream", status, time.monotonic() - start,
+                time_to_first_token=None if first_token_at is None else first_token_at - start,
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                cached_tokens=cached_tokens, retries=attempt,
+            ))
+
+
+class GeminiProvider(AsyncLLMProvider):
+    """
+    Gemini through google-genai. A call's system instructions and `prefix` are stored
+    as cached content once they reach `min_cache_tokens` (the API's minimum for
+    explicit caching), and later calls with the same pair only send the prompt.
+    Each cached content lives `context_cache_ttl` seconds; using it in the second half
+    of its life extends it, so it lasts as long as the session keeps asking.
+    """
+    name = "gemini"
+
+    def __init__(self, model: str = "gemini-2.5-flash", api_key: str = None,
+                 context_cache_ttl: float = 900.0, min_cache_tokens: int = 1024, **kwargs):
+        super().__init__(model, **kwargs)
+        self.api_key = api_key
+        self.context_cache_ttl = context_cache_ttl
+        self.min_cache_tokens = min_cache_tokens
+        # prefix_key -> (cached content name or None if it could not be created, expiry time)
+        self._context_caches = {}
+
+    def _make_client(self):
+        from google import genai
+        return genai.Client(api_key=self.api_key).aio
+
+    def _config(self, system, json_mode, response_schema, cached_content=None):
+        from google.genai import types
+        return types.GenerateContentConfig(
+            # Cached content already carries the system instructions
+            system_instruction=None if cached_content else system,
+            cached_content=cached_content,
+            response_mime_type="application/json" if json_mode or response_schema else None,
+            response_json_schema=response_schema,
+        )
+
+    async def _cached_content(self, system, prefix):
+        """Name of the cached content holding system + prefix, or None to send them inline."""
+        if not prefix or estimate_tokens(prefix) + estimate_tokens(system or "") < self.min_cache_tokens:
+            return None
+        from google.genai import types
+        key = prefix_key(system, prefix)
+        ttl = f"{int(self.context_cache_ttl)}s"
+        async with self._loop_lock():
+            now = time.time()
+            name, expires = self._context_caches.get(key, (None, 0.0))
+            if expires - now > self.context_cache_ttl / 2:
+                return name
+            if name is not None and expires - now > 5:
+                try:
+                    await self.client().caches.update(name=name, config=types.UpdateCachedContentConfig(ttl=ttl))
+                    self._context_caches[key] = (name, now + self.context_cache_ttl)
+                    return name
+                except Exception:
+                    pass
+            try:
+                cache = await self.client().caches.create(
+                    model=self.model,
+                    config=types.CreateCachedContentConfig(contents=[prefix], system_instruction=system, ttl=ttl),
+                )
+                name = cache.name
+            except Exception:
+                # Below the model's minimum size or caching unavailable: send inline until it would have expired
+                name = None
+            self._context_caches[key] = (name, now + self.context_cache_ttl)
+            return name
+
+    async def delete_context_caches(self, keys=None):
+        """
+        Deletes the cached contents this provider created for the prefix_key()s in
+        `keys` (all of them by default), e.g. when a session's resume changes or the
+        app shuts down. Otherwise they only expire after context_cache_ttl.
+        """
+        keys = list(self._context_caches) if keys is None else [key for key in keys if key in self._context_caches]
+        entries = [self._context_caches.pop(key) for key in keys]
+        for name, expires in entries:
+            if name is not None and expires > time.time():
+                try:
+                    await self.client().caches.delete(name=name)
+                except Exception:
+                    pass
+
+    async def _request(self, prompt, system, json_mode, response_schema, prefix):
+        cached_content = await self._cached_content(system, prefix)
+        contents = prompt if cached_content or not prefix else [prefix, prompt]
+        return {"model": self.model, "contents": contents,
+                "config": self._config(system, json_mode, response_schema, cached_content)}
+
+    async def _generate(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        response = await self.client().models.generate_content(
+            **await self._request(prompt, system, json_mode, response_schema, prefix)
+        )
+        usage = getattr(response, "usage_metadata", None)
+        return LLMResponse(
+            text=response.text or "",
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            completion_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+            cached_tokens=getattr(usage, "cached_content_token_count", 0) or 0,
+        )
+
+    async def _stream(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        prompt_tokens = completion_tokens = cached_tokens = 0
+        async for chunk in await self.client().models.generate_content_stream(
+            **await self._request(prompt, system, json_mode, response_schema, prefix)
+        ):
+            # Gemini reports cumulative usage on each chunk; only the last values count
+            usage = getattr(chunk, "usage_metadata", None)
+            if usage is not None:
+                prompt_tokens = getattr(usage, "prompt_token_count", 0) or prompt_tokens
+                completion_tokens = getattr(usage, "candidates_token_count", 0) or completion_tokens
+                cached_tokens = getattr(usage, "cached_content_token_count", 0) or cached_tokens
+            yield StreamChunk(text=chunk.text or "")
+        yield StreamChunk(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens)
+
+
+def _openai_cached_tokens(usage) -> int:
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+class OpenAIProvider(AsyncLLMProvider):
+    """
+    OpenAI chat completions. Prompts of 1024+ tokens are cached automatically by exact
+    prefix, so the prefix goes first in the user message and `prompt_cache_key` routes
+    calls sharing it to the same cache.
+    """
+    name = "openai"
+    supports_prompt_cache_key = True
+
+    def __init__(self, model: str = "gpt-4.1-mini", api_key: str = None, base_url: str = None, **kwargs):
+        super().__init__(model, **kwargs)
+        self.api_key = api_key
+        self.base_url = base_url
+
+    def _make_client(self):
+        from openai import AsyncOpenAI
+        # Retries are handled by generate(), not by the SDK
+        return AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+
+    def _response_format(self, json_mode, response_schema):
+        if response_schema:
+            return {"type": "json_schema",
+                    "json_schema": {"name": "response", "schema": response_schema, "strict": True}}
+        if json_mode:
+            return {"type": "json_object"}
+        return None
+
+    def _request_kwargs(self, prompt, system, json_mode, response_schema, prefix=None):
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": join_prefix(prefix, prompt)})
+        kwargs = {"model": self.model, "messages": messages}
+        response_format = self._response_format(json_mode, response_schema)
+        if response_format:
+            kwargs["response_format"] = response_format
+        if prefix and self.supports_prompt_cache_key:
+            kwargs["prompt_cache_key"] = prefix_key(system, prefix)[:32]
+        return kwargs
+
+    async def _generate(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        response = await self.client().chat.completions.create(
+            **self._request_kwargs(prompt, system, json_mode, response_schema, prefix)
+        )
+        usage = getattr(response, "usage", None)
+        return LLMResponse(
+            text=response.choices[0].message.content or "",
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            cached_tokens=_openai_cached_tokens(usage),
+        )
+
+    async def _stream(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        response = await self.client().chat.completions.create(
+            stream=True, stream_options={"include_usage": True},
+            **self._request_kwargs(prompt, system, json_mode, response_schema, prefix)
+        )
+        async for chunk in response:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            usage = getattr(chunk, "usage", None)
+            yield StreamChunk(
+                text=text or "",
+                prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+                completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+                cached_tokens=_openai_cached_tokens(usage),
+            )
+
+
+class GroqProvider(OpenAIProvider):
+    """Groq through its OpenAI-compatible endpoint."""
+    name = "groq"
+    # Groq caches prompt prefixes on its own and does not take the routing key
+    supports_prompt_cache_key = False
+
+    def __init__(self, model: str = "llama-3.3-70b-versatile", api_key: str = None,
+                 base_url: str = "https://api.groq.com/openai/v1", **kwargs):
+        super().__init__(model, api_key=api_key, base_url=base_url, **kwargs)
+
+    def _response_format(self, json_mode, response_schema):
+        # Strict json_schema output is not available on every Groq model; plain JSON mode is
+        if json_mode or response_schema:
+            return {"type": "json_object"}
+        return None
+
+
+class FakeProviderError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"fake provider error {status_code}")
+        self.status_code = status_code
+
+
+class FakeProvider(AsyncLLMProvider):
+    """
+    Local stand-in for a real provider. `latency` is seconds per call, or a callable
+    returning it; `error_rate` of calls fail with `error_status`. Retries are off by default
+    so injected failures reach the caller. Like a provider-side prompt cache, a
+    (system, prefix) pair seen before is reported as `cached_tokens`; `prefix_hits`
+    counts those calls, and delete_context_caches() forgets pairs (counted in
+    `prefix_deletions`).
+    """
+
+    def __init__(self, name: str = "fake", text: str = "{}", latency=0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: int = None, **kwargs):
+        kwargs.setdefault("max_retries", 0)
+        kwargs.setdefault("limiter", RateLimiter(requests_per_minute=1e9, tokens_per_minute=1e12, max_in_flight=1_000))
+        super().__init__(f"{name}-model", **kwargs)
+        self.name = name
+        self.text = text
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.calls = 0
+        self.prefix_hits = 0
+        self.prefix_deletions = 0
+        self._prefixes = set()
+        self._random = random.Random(seed)
+
+    def _make_client(self):
+        return None
+
+    async def _respond(self):
+        self.calls += 1
+        latency = self.latency() if callable(self.latency) else self.latency
+        await asyncio.sleep(latency)
+        if self._random.random() < self.error_rate:
+            raise FakeProviderError(self.error_status)
+
+    async def delete_context_caches(self, keys=None):
+        keys = set(self._prefixes) if keys is None else self._prefixes & set(keys)
+        self._prefixes -= keys
+        self.prefix_deletions += len(keys)
+
+    def _usage(self, prompt, system, prefix) -> dict:
+        cached_tokens = 0
+        if prefix:
+            key = prefix_key(system, prefix)
+            if key in self._prefixes:
+                self.prefix_hits += 1
+                cached_tokens = estimate_tokens(prefix) + estimate_tokens(system or "")
+            self._prefixes.add(key)
+        return {"prompt_tokens": estimate_tokens(join_prefix(prefix, prompt)) + estimate_tokens(system or ""),
+                "completion_tokens": estimate_tokens(self.text), "cached_tokens": cached_tokens}
+
+    async def _generate(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        await self._respond()
+        return LLMResponse(self.text, provider=self.name, model=self.model, **self._usage(prompt, system, prefix))
+
+    async def _stream(self, prompt, system=None, json_mode=False, response_schema=None, prefix=None):
+        await self._respond()
+        for i in range(0, len(self.text), 16):
+            yield StreamChunk(text=self.text[i:i + 16])
+        yield StreamChunk(**self._usage(prompt, system, prefix))
@@ -0,0 +1,234 @@
+# modules/llm_metrics.py
+"""
+In-process metrics for LLM calls: tokens (including provider-cached prompt tokens),
+time to first token, latency, retries, response-cache hits and estimated cost.
+
+Providers record every call into a MetricsRegistry (the module-level METRICS by
+default). The registry renders Prometheus text format, can serve it over HTTP,
+and collects per-run summaries:
+
+    with METRICS.run() as run:
+        asyncio.run(workflow())
+    print(run.prompt_tokens, run.cost_usd)
+
+Runs are tracked with a context variable, so calls made in asyncio tasks started
+inside the `with` block are attributed to the run.
+"""
+import contextvars
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# USD per million (prompt, completion) tokens; models not listed are costed at 0
+MODEL_PRICING = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+}
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICING.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+@dataclass
+class CallRecord:
+    provider: str
+    model: str
+    operation: str  # generate or stream
+    status: str  # ok, error or cancelled
+    latency: float
+    time_to_first_token: float = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # prompt tokens served from the provider's prompt cache
+    retries: int = 0
+
+    @property
+    def cost_usd(self) -> float:
+        return estimate_cost(self.model, self.prompt_tokens, self.completion_tokens)
+
+
+@dataclass
+class RunMetrics:
+    """Totals for the LLM calls made during one run (see MetricsRegistry.run)."""
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+    llm_seconds: float = 0.0
+    time_to_first_token: float = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    providers: set = field(default_factory=set)
+
+    def add(self, record: CallRecord):
+        self.calls += 1
+        self.errors += record.status == "error"
+        self.retries += record.retries
+        self.prompt_tokens += record.prompt_tokens
+        self.completion_tokens += record.completion_tokens
+        self.cached_tokens += record.cached_tokens
+        self.cost_usd += record.cost_usd
+        self.llm_seconds += record.latency
+        if record.time_to_first_token is not None and self.time_to_first_token is None:
+            self.time_to_first_token = record.time_to_first_token
+        self.providers.add(f"{record.provider}/{record.model}")
+
+    def summary_markdown(self) -> str:
+        """Short per-run report, e.g. for the Streamlit sidebar."""
+        lines = [
+            f"- LLM calls: {self.calls} ({self.errors} failed, {self.retries} retries)",
+            f"- Tokens: {self.prompt_tokens} prompt ({self.cached_tokens} cached) / {self.completion_tokens} completion",
+            f"- LLM time: {self.llm_seconds:.2f}s",
+            f"- Estimated cost: ${self.cost_usd:.4f}",
+        ]
+        if self.time_to_first_token is not None:
+            lines.insert(3, f"- Time to first token: {self.time_to_first_token:.2f}s")
+        if self.cache_hits or self.cache_misses:
+            lines.append(f"- Response cache: {self.cache_hits} hit(s), {self.cache_misses} miss(es)")
+        if self.providers:
+            lines.append(f"- Models: {', '.join(sorted(self.providers))}")
+        return "\n".join(lines)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+_current_run = contextvars.ContextVar("llm_metrics_run", default=None)
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)  # (provider, model, operation, status) -> count
+        self._tokens = defaultdict(int)  # (provider, model, kind) -> count
+        self._retries = defaultdict(int)  # (provider, model) -> count
+        self._cost = defaultdict(float)  # (provider, model) -> USD
+        self._latency = defaultdict(_Histogram)  # (provider, model) -> histogram
+        self._ttft = defaultdict(_Histogram)  # (provider, model) -> histogram
+        self._cache = defaultdict(int)  # hit/miss -> count
+
+    def record(self, record: CallRecord):
+        key = (record.provider, record.model)
+        with self._lock:
+            self._requests[key + (record.operation, record.status)] += 1
+            self._tokens[key + ("prompt",)] += record.prompt_tokens
+            self._tokens[key + ("completion",)] += record.completion_tokens
+            self._tokens[key + ("cached",)] += record.cached_tokens
+            self._retries[key] += record.retries
+            self._cost[key] += record.cost_usd
+            if record.status == "ok":
+                self._latency[key].observe(record.latency)
+                if record.time_to_first_token is not None:
+                    self._ttft[key].observe(record.time_to_first_token)
+        run = _current_run.get()
+        if run is not None:
+            run.add(record)
+
+    def record_cache_lookup(self, hit: bool):
+        with self._lock:
+            self._cache["hit" if hit else "miss"] += 1
+        run = _current_run.get()
+        if run is not None:
+            if hit:
+                run.cache_hits += 1
+            else:
+                run.cache_misses += 1
+
+    @contextmanager
+    def run(self):
+        """Collects a RunMetrics for the calls made inside the block."""
+        run = RunMetrics()
+        token = _current_run.set(run)
+        try:
+            yield run
+        finally:
+            _current_run.reset(token)
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            lines += ["# HELP llm_requests_total LLM calls by outcome.", "# TYPE llm_requests_total counter"]
+            for (provider, model, operation, status), count in sorted(self._requests.items()):
+                lines.append(f"llm_requests_total{_labels(provider=provider, model=model, operation=operation, status=status)} {count}")
+            lines += ["# HELP llm_tokens_total Tokens reported by the provider.", "# TYPE llm_tokens_total counter"]
+            for (provider, model, kind), count in sorted(self._tokens.items()):
+                lines.append(f"llm_tokens_total{_labels(provider=provider, model=model, type=kind)} {count}")
+            lines += ["# HELP llm_retries_total Retried attempts after 429/5xx responses.", "# TYPE llm_retries_total counter"]
+            for (provider, model), count in sorted(self._retries.items()):
+                lines.append(f"llm_retries_total{_labels(provider=provider, model=model)} {count}")
+            lines += ["# HELP llm_cost_usd_total Estimated spend from MODEL_PRICING.", "# TYPE llm_cost_usd_total counter"]
+            for (provider, model), cost in sorted(self._cost.items()):
+                lines.append(f"llm_cost_usd_total{_labels(provider=provider, model=model)} {cost:.6f}")
+            for name, help_text, histograms in (
+                ("llm_request_latency_seconds", "Latency of successful LLM calls.", self._latency),
+                ("llm_time_to_first_token_seconds", "Time to first streamed token.", self._ttft),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (provider, model), histogram in sorted(histograms.items()):
+                    for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                        lines.append(f"{name}_bucket{_labels(provider=provider, model=model, le=bound)} {count}")
+                    lines.append(f"{name}_bucket{_labels(provider=provider, model=model, le='+Inf')} {histogram.total}")
+                    lines.append(f"{name}_sum{_labels(provider=provider, model=model)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_labels(provider=provider, model=model)} {histogram.total}")
+            lines += ["# HELP llm_cache_lookups_total Response cache lookups.", "# TYPE llm_cache_lookups_total counter"]
+            for result, count in sorted(self._cache.items()):
+                lines.append(f"llm_cache_lookups_total{_labels(result=result)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """Serves to_prometheus() at /metrics from a daemon thread and returns the server."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="llm-metrics", daemon=True).start()
+        return server
+
+
+METRICS = MetricsRegistry()
@@ -0,0 +1,309 @@
+# modules/llm_router.py
+"""
+Routes LLM calls across several providers (Gemini, OpenAI, Groq) by their recent
+latency and error rate, with optional hedged requests.
+
+For each call the router ranks providers by a score built from rolling statistics
+(p95 latency of successful calls, inflated by the error rate) and sends the request
+to the best one. With hedging on, a second request goes to the next provider once the
+first has been outstanding longer than its own p95; whichever returns a valid
+response first wins and the other is cancelled. Failed or invalid responses fall
+through to the next provider. Statistics age out, so a provider that had a bad
+minute is tried again once its samples expire.
+
+Streams are hedged the same way on their time to first chunk: the first provider
+to start answering is streamed and the others are cancelled. Its assembled text
+is validated at the end; if it is invalid (or the stream fails part-way) the
+router yields STREAM_RESTART and streams the next provider's answer from the start.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+from .json_stream import load_json_object
+from .llm_client import GeminiProvider, GroqProvider, LLMResponse, OpenAIProvider, RateLimiter
+
+
+class ProviderStats:
+    """
+    Latency and outcome of a provider's recent calls, kept for `window_seconds`
+    (at most `max_samples`). Calls cancelled before finishing (hedge losers) are
+    censored samples: they only say the call took longer than their latency, so
+    they count towards neither the error rate nor the success percentiles.
+    """
+
+    def __init__(self, window_seconds: float = 300.0, max_samples: int = 100):
+        self.window_seconds = window_seconds
+        self._samples = deque(maxlen=max_samples)  # (timestamp, latency, ok); ok is None when censored
+
+    def record(self, latency: float, ok: bool):
+        self._samples.append((time.monotonic(), latency, ok))
+
+    def record_censored(self, latency: float):
+        self._samples.append((time.monotonic(), latency, None))
+
+    def _recent(self):
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return self._samples
+
+    def __len__(self):
+        """Recent calls that finished (successfully or not)."""
+        return sum(1 for _, _, ok in self._recent() if ok is not None)
+
+    def error_rate(self) -> float:
+        outcomes = [ok for _, _, ok in self._recent() if ok is not None]
+        if not outcomes:
+            return 0.0
+        return outcomes.count(False) / len(outcomes)
+
+    def p95(self):
+        """95th percentile latency of successful calls, or None without any."""
+        latencies = sorted(latency for _, latency, ok in self._recent() if ok)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def censored_floor(self) -> float:
+        """Longest recent cancelled call: the provider's latency is at least this. 0.0 without any."""
+        return max((latency for _, latency, ok in self._recent() if ok is None), default=0.0)
+
+
+class StreamRestart(str):
+    """Type of STREAM_RESTART."""
+
+
+# Yielded by ProviderRouter.stream() when it drops the output streamed so far (it failed
+# validation or the stream broke) and starts over on another provider. An empty string,
+# so consumers that do not look for it only see the chunks run together.
+STREAM_RESTART = StreamRestart()
+
+_STREAM_END = object()
+
+
+def is_json_response(response) -> bool:
+    """
+    Validator accepting responses whose text parses as a JSON object, directly or after
+    json_stream.repair_json(), so near-valid output does not trigger a fallback call.
+    """
+    try:
+        return isinstance(load_json_object(response.text)[0], dict)
+    except (json.JSONDecodeError, TypeError):
+        return False
+
+
+def cache_model_id(client) -> str:
+    """
+    Names whoever may answer through `client` for response cache keys: "provider:model",
+    or for a router every provider and model in its configured order, so an answer
+    served by a fallback is never replayed as the primary model's.
+    """
+    return "+".join(f"{provider.name}:{provider.model}" for provider in getattr(client, "providers", [client]))
+
+
+class ProviderRouter:
+    """
+    Drop-in replacement for a single provider: exposes the same `generate()` and
+    `stream()` calls and picks the provider per request.
+
+    `validator(response)` decides whether a response is usable (e.g. is_json_response);
+    invalid responses count as errors. `prior_latency` stands in for the p95 of a
+    provider with fewer than `min_samples` recent calls, and is also the hedge delay
+    until the chosen provider has enough samples. Streams keep a second set of
+    statistics, `first_chunk_stats`, for their time to first chunk.
+    """
+    name = "router"
+
+    def __init__(self, providers: list, hedge: bool = True, validator=None,
+                 prior_latency: float = 8.0, min_samples: int = 5, min_hedge_delay: float = 0.5,
+                 window_seconds: float = 300.0):
+        if not providers:
+            raise ValueError("ProviderRouter needs at least one provider")
+        self.providers = list(providers)
+        self.hedge = hedge
+        self.validator = validator
+        self.prior_latency = prior_latency
+        self.min_samples = min_samples
+        self.min_hedge_delay = min_hedge_delay
+        self.stats = {provider.name: ProviderStats(window_seconds) for provider in self.providers}
+        self.first_chunk_stats = {provider.name: ProviderStats(window_seconds) for provider in self.providers}
+
+    @property
+    def model(self) -> str:
+        return self.providers[0].model
+
+    def _latency_estimate(self, provider, stats=None) -> float:
+        stats = (self.stats if stats is None else stats)[provider.name]
+        p95 = stats.p95() if len(stats) >= self.min_samples else None
+        return max(p95 if p95 is not None else self.prior_latency, stats.censored_floor())
+
+    def score(self, provider) -> float:
+        """Lower is better: expected tail latency, inflated by the recent error rate."""
+        return self._latency_estimate(provider) * (1 + 10 * self.stats[provider.name].error_rate())
+
+    def ranked(self) -> list:
+        # sorted() is stable, so ties keep the configured order
+        return sorted(self.providers, key=self.score)
+
+    def _is_valid(self, response) -> bool:
+        return self.validator is None or self.validator(response)
+
+    async def generate(self, prompt: str, system: str = None, json_mode: bool = False,
+                       response_schema: dict = None, prefix: str = None):
+        candidates = self.ranked()
+        started = {}  # task -> (provider, start time)
+        last_error = None
+
+        def launch():
+            provider = candidates.pop(0)
+            task = asyncio.ensure_future(provider.generate(prompt, system=system, json_mode=json_mode,
+                                                           response_schema=response_schema, prefix=prefix))
+            started[task] = (provider, time.monotonic())
+
+        launch()
+        try:
+            while started:
+                timeout = None
+                if self.hedge and candidates and len(started) == 1:
+                    (provider, start), = started.values()
+                    hedge_delay = max(self.min_hedge_delay, self._latency_estimate(provider))
+                    timeout = max(0.0, start + hedge_delay - time.monotonic())
+                done, _ = await asyncio.wait(started, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Primary is slower than its usual p95: hedge on the next provider
+                    launch()
+                    continue
+                for task in done:
+                    provider, start = started.pop(task)
+                    latency = time.monotonic() - start
+                    if task.exception() is None and self._is_valid(task.result()):
+                        self.stats[provider.name].record(latency, True)
+                        return task.result()
+                    self.stats[provider.name].record(latency, False)
+                    last_error = task.exception() or ValueError(
+                        f"{provider.name} returned an invalid response"
+                    )
+                if not started and candidates:
+                    launch()
+        finally:
+            for task, (provider, start) in started.items():
+                # Losers only tell us the provider took at least this long
+                task.cancel()
+                self.stats[provider.name].record_censored(time.monotonic() - start)
+        raise last_error
+
+    async def _pump(self, provider, queue, **kwargs):
+        """Runs one provider's stream, putting (this task, chunk / _STREAM_END / exception) on `queue`."""
+        attempt = asyncio.current_task()
+        try:
+            async for chunk in provider.stream(**kwargs):
+                queue.put_nowait((attempt, chunk))
+        except Exception as e:
+            queue.put_nowait((attempt, e))
+        else:
+            queue.put_nowait((attempt, _STREAM_END))
+
+    async def stream(self, prompt: str, system: str = None, json_mode: bool = False,
+                     response_schema: dict = None, prefix: str = None):
+        """
+        Streams from the best ranked provider, hedged on time to first chunk: if no chunk
+        has arrived within the provider's usual first-chunk p95, the next provider is
+        started too, and whichever answers first is streamed while the other is cancelled.
+        The streamed text is validated once complete; when it is invalid, or the stream
+        fails, STREAM_RESTART is yielded and the next provider's answer follows.
+        """
+        candidates = self.ranked()
+        queue = asyncio.Queue()
+        active = {}  # task -> (provider, start time)
+        winner, parts = None, []
+        last_error = None
+
+        def launch():
+            provider = candidates.pop(0)
+            task = asyncio.ensure_future(self._pump(provider, queue, prompt=prompt, system=system, json_mode=json_mode,
+                                                    response_schema=response_schema, prefix=prefix))
+            active[task] = (provider, time.monotonic())
+
+        def cancel(task):
+            provider, start = active.pop(task)
+            task.cancel()
+            # As with generate(), a cancelled stream only says the provider was at least this slow
+            self.stats[provider.name].record_censored(time.monotonic() - start)
+            self.first_chunk_stats[provider.name].record_censored(time.monotonic() - start)
+
+        launch()
+        try:
+            while active:
+                timeout = None
+                if winner is None and self.hedge and candidates and len(active) == 1:
+                    (provider, start), = active.values()
+                    hedge_delay = max(self.min_hedge_delay, self._latency_estimate(provider, self.first_chunk_stats))
+                    timeout = max(0.0, start + hedge_delay - time.monotonic())
+                try:
+                    task, item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    # No first chunk within the provider's usual time: hedge on the next provider
+                    launch()
+                    continue
+                if task not in active:
+                    continue  # queued by a stream that has since been cancelled
+                provider, start = active[task]
+                if isinstance(item, str):
+                    if winner is None:
+                        winner, parts = task, []
+                        self.first_chunk_stats[provider.name].record(time.monotonic() - start, True)
+                        for other in [other for other in active if other is not task]:
+                            cancel(other)
+                    parts.append(item)
+                    yield item
+                    continue
+
+                del active[task]
+                latency = time.monotonic() - start
+                text = "".join(parts) if task is winner else ""
+                if item is _STREAM_END and self._is_valid(LLMResponse(text, provider=provider.name, model=provider.model)):
+                    self.stats[provider.name].record(latency, True)
+                    return
+                self.stats[provider.name].record(latency, False)
+                if task is not winner:
+                    self.first_chunk_stats[provider.name].record(latency, False)
+                last_error = item if isinstance(item, Exception) else ValueError(
+                    f"{provider.name} returned an invalid response"
+                )
+                if task is winner:
+                    winner = None
+                    yield STREAM_RESTART
+                if not active and candidates:
+                    launch()
+        finally:
+            for task in list(active):
+                cancel(task)
+        raise last_error
+
+
+def providers_from_env(exclude=(), environ=None) -> list:
+    """
+    Builds a provider for every API key present in the environment
+    (GOOGLE_API_KEY, OPENAI_API_KEY, GROQ_API_KEY), skipping names in `exclude`.
+    """
+    environ = os.environ if environ is None else environ
+    providers = []
+    if "gemini" not in exclude and environ.get("GOOGLE_API_KEY"):
+        providers.append(GeminiProvider(
+            model=environ.get("GEMINI_MODEL", "gemini-2.5-flash"), api_key=environ["GOOGLE_API_KEY"],
+            limiter=RateLimiter(requests_per_minute=60, tokens_per_minute=250_000, max_in_flight=4),
+        ))
+    if "openai" not in exclude and environ.get("OPENAI_API_KEY"):
+        providers.append(OpenAIProvider(
+            model=environ.get("OPENAI_MODEL", "gpt-4.1-mini"), api_key=environ["OPENAI_API_KEY"],
+            limiter=RateLimiter(requests_per_minute=60, tokens_per_minute=200_000, max_in_flight=4),
+        ))
+    if "groq" not in exclude and environ.get("GROQ_API_KEY"):
+        providers.append(GroqProvider(
+            model=environ.get("GROQ_MODEL", "llama-3.3-70b-versatile"), api_key=environ["GROQ_API_KEY"],
+            limiter=RateLimiter(requests_per_minute=30, tokens_per_minute=12_000, max_in_flight=2),
+        ))
+    return providers
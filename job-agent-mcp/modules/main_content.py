@@ -0,0 +1,313 @@
+# modules/main_content.py
+"""
+Main-content extraction for job posting pages: keep the posting body, drop menus,
+cookie banners, related-jobs lists and footers before the text reaches the LLM.
+
+extract_job_text() tries, in order:
+
+1. A schema.org JobPosting in the page's JSON-LD. Most job boards embed one for
+   search engines; its description is the posting body without any page chrome.
+2. Readability-style block scoring. Elements that are unlikely to hold content
+   (by tag, role, class or id) are removed, every text block (p, li, td, ...) with a
+   low link density scores its ancestors, and the best-scoring container, with any
+   similarly scored siblings, is taken as the posting. Link-heavy blocks such as
+   related-jobs lists score nothing.
+3. The whole page's text (html_text.html_to_text_fast) when neither finds enough.
+
+Compare page text with and without it using `python -m benchmarks.main_content`.
+"""
+import html as html_lib
+import json
+import re
+
+from .html_text import DROPPED_TAGS, clean_text_lines, html_to_text_fast
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # Without lxml only the JSON-LD step and the full-text fallback run
+    lxml = etree = None
+
+# Part of the extracted-text cache key in web_fetch; bump when extract_job_text's output changes
+JOB_TEXT_VERSION = "main-content-1"
+
+# Extracted posting bodies shorter than this are not trusted; the next strategy runs instead
+MIN_CONTENT_CHARS = 200
+
+_REMOVED_TAGS = DROPPED_TAGS | {"header", "aside", "form", "button", "select", "iframe", "svg", "dialog"}
+_UNLIKELY_ROLES = {"navigation", "banner", "contentinfo", "complementary", "dialog", "alertdialog", "menu", "search"}
+_UNLIKELY_RE = re.compile(
+    r"cookie|consent|gdpr|banner|nav|menu|breadcrumb|footer|header|sidebar|social|share|related|similar"
+    r"|recommend|subscribe|newsletter|popup|modal|promo|advert|\bads?\b|sponsor|comment|login|signup|skip",
+    re.IGNORECASE,
+)
+_MAYBE_CONTENT_RE = re.compile(r"and|article|body|column|content|main|job|posting|description|detail", re.IGNORECASE)
+_POSITIVE_RE = re.compile(r"job|posting|vacanc|description|detail|article|content|main|body|text|entry|requirement", re.IGNORECASE)
+_NEGATIVE_RE = re.compile(
+    r"related|similar|recommend|sidebar|widget|footer|share|social|comment|meta|promo|sponsor|cookie|banner",
+    re.IGNORECASE,
+)
+
+_BLOCK_TAGS = ("p", "li", "td", "pre", "dd", "dt", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6")
+_TAG_SCORES = {"article": 10, "main": 10, "section": 5, "div": 5, "pre": 3, "td": 3, "blockquote": 3,
+               "ol": -3, "ul": -3, "dl": -3, "li": -3, "dd": -3, "dt": -3, "h1": -5, "h2": -5, "h3": -5,
+               "h4": -5, "h5": -5, "h6": -5, "th": -5}
+
+# Elements followed by a line break in extracted text; table cells by a space
+_LINE_BREAK_TAGS = ("p", "div", "li", "tr", "br", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article",
+                    "main", "ul", "ol", "dl", "dd", "dt", "table", "pre", "blockquote")
+_CELL_TAGS = ("td", "th")
+
+_JSON_LD_RE = re.compile(
+    r"<script[^>]*type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+
+
+# --- JSON-LD JobPosting ---
+
+def _json_ld_objects(data):
+    """Yields every object in a JSON-LD document, descending into lists and @graph."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _json_ld_objects(item)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _json_ld_objects(data["@graph"])
+
+
+def _is_job_posting(obj: dict) -> bool:
+    types = obj.get("@type")
+    types = types if isinstance(types, list) else [types]
+    return any(isinstance(t, str) and t.rsplit("/", 1)[-1] == "JobPosting" for t in types)
+
+
+def find_job_posting(html: str):
+    """The first schema.org JobPosting object in the page's JSON-LD scripts, or None."""
+    for match in _JSON_LD_RE.finditer(html or ""):
+        try:
+            data = json.loads(match.group(1).strip(), strict=False)
+        except ValueError:
+            continue
+        for obj in _json_ld_objects(data):
+            if _is_job_posting(obj):
+                return obj
+    return None
+
+
+def _name(value):
+    if isinstance(value, dict):
+        return value.get("name") or ""
+    return value if isinstance(value, str) else ""
+
+
+def _location(posting: dict) -> str:
+    if str(posting.get("jobLocationType", "")).upper() == "TELECOMMUTE":
+        return "Remote"
+    locations = posting.get("jobLocation")
+    places = []
+    for location in locations if isinstance(locations, list) else [locations]:
+        address = location.get("address") if isinstance(location, dict) else None
+        if isinstance(address, dict):
+            parts = [_name(address.get(key)) for key in ("addressLocality", "addressRegion", "addressCountry")]
+            places.append(", ".join(part for part in parts if part))
+        elif isinstance(address, str):
+            places.append(address)
+    return "; ".join(place for place in places if place)
+
+
+def _salary(posting: dict) -> str:
+    salary = posting.get("baseSalary")
+    if not isinstance(salary, dict):
+        return ""
+    value = salary.get("value")
+    unit = ""
+    if isinstance(value, dict):
+        unit = value.get("unitText") or ""
+        low, high = value.get("minValue"), value.get("maxValue")
+        amount = f"{low}-{high}" if low is not None and high is not None else value.get("value", low or high)
+    else:
+        amount = value
+    if amount is None:
+        return ""
+    return " ".join(str(part) for part in (salary.get("currency", ""), amount, unit.lower()) if part)
+
+
+def _rich_text(value) -> str:
+    """Text of a JobPosting field that may hold HTML, escaped HTML or a list of strings."""
+    if isinstance(value, list):
+        return "\n".join(_rich_text(item) for item in value)
+    if not isinstance(value, str):
+        return ""
+    if "<" not in value and "&lt;" in value:
+        value = html_lib.unescape(value)
+    if "<" not in value and "&" not in value:
+        return clean_text_lines(value)
+    if lxml is None:
+        return html_to_text_fast(value)
+    try:
+        return _block_text(lxml.html.fragment_fromstring(value, create_parent="div"))
+    except (etree.ParserError, ValueError):
+        return html_to_text_fast(value)
+
+
+def job_posting_text(posting: dict) -> str:
+    """Plain text of a JSON-LD JobPosting: title, key facts, then the description sections."""
+    lines = [_name(posting.get("title"))]
+    for label, value in (("Company", _name(posting.get("hiringOrganization"))),
+                         ("Location", _location(posting)),
+                         ("Employment type", ", ".join(posting["employmentType"]) if isinstance(posting.get("employmentType"), list)
+                          else _name(posting.get("employmentType"))),
+                         ("Salary", _salary(posting))):
+        if value:
+            lines.append(f"{label}: {value}")
+    description = _rich_text(posting.get("description"))
+    lines.append(description)
+    for label, key in (("Responsibilities", "responsibilities"), ("Qualifications", "qualifications"),
+                       ("Skills", "skills"), ("Experience", "experienceRequirements"),
+                       ("Education", "educationRequirements")):
+        text = _rich_text(posting.get(key))
+        # Boards often repeat these inside the description
+        if text and text not in description:
+            lines += [label, text]
+    return "\n".join(line for line in lines if line)
+
+
+# --- DOM block scoring ---
+
+def _block_text(element) -> str:
+    """Text of an element with a line break after each block, so headings and paragraphs do not run together."""
+    for block in element.iter(*_LINE_BREAK_TAGS):
+        block.tail = "\n" + (block.tail or "")
+    for cell in element.iter(*_CELL_TAGS):
+        cell.tail = " " + (cell.tail or "")
+    return clean_text_lines(element.text_content())
+
+def _text(element) -> str:
+    return " ".join(element.text_content().split())
+
+
+def _link_density(element, text_length: int) -> float:
+    if not text_length:
+        return 0.0
+    link_length = sum(len(" ".join(link.text_content().split())) for link in element.iter("a"))
+    return min(1.0, link_length / text_length)
+
+
+def _class_weight(element) -> int:
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0
+    if _POSITIVE_RE.search(names):
+        weight += 25
+    if _NEGATIVE_RE.search(names):
+        weight -= 25
+    return weight
+
+
+def _remove_unlikely(root):
+    for element in list(root.iter()):
+        if not isinstance(element.tag, str):  # comments and processing instructions
+            element.drop_tree()
+            continue
+        if element.tag in ("html", "body", "article", "main") or element.getparent() is None:
+            continue
+        names = f"{element.get('class', '')} {element.get('id', '')}"
+        if (element.tag in _REMOVED_TAGS
+                or element.get("role", "").lower() in _UNLIKELY_ROLES
+                or element.get("aria-hidden") == "true"
+                or (_UNLIKELY_RE.search(names) and not _MAYBE_CONTENT_RE.search(names))):
+            element.drop_tree()
+
+
+def _score_blocks(root) -> dict:
+    scores = {}
+    for block in root.iter(*_BLOCK_TAGS):
+        text = _text(block)
+        # List items are short ("5+ years of Python") but are the core of a job posting
+        if len(text) < (3 if block.tag == "li" else 25) or _link_density(block, len(text)) > 0.5:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        ancestor, level = block.getparent(), 0
+        while ancestor is not None and level < 5:
+            if ancestor not in scores:
+                scores[ancestor] = _TAG_SCORES.get(ancestor.tag, 0) + _class_weight(ancestor)
+            scores[ancestor] += score / (1 if level == 0 else 2 if level == 1 else level * 3)
+            ancestor, level = ancestor.getparent(), level + 1
+    # Weight by how much of each candidate is plain text rather than links
+    for element in scores:
+        scores[element] *= 1 - _link_density(element, len(_text(element)))
+    return scores
+
+
+def _top_candidate(scores: dict):
+    top = max(scores, key=scores.get)
+    # A parent scoring higher than its child holds more of the posting (e.g. sibling sections)
+    threshold, last_score, parent = scores[top] / 3, scores[top], top.getparent()
+    while parent is not None and parent.tag != "body":
+        if parent in scores:
+            if scores[parent] < threshold:
+                break
+            if scores[parent] > last_score:
+                top = parent
+                break
+            last_score = scores[parent]
+        parent = parent.getparent()
+    return top
+
+
+def extract_main_content(html: str) -> str:
+    """
+    Text of the page's main content block by readability-style scoring, or "" when
+    no block stands out (or lxml is not installed).
+    """
+    if lxml is None or not html or not html.strip():
+        return ""
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return ""
+    title = next((_text(h1) for h1 in root.iter("h1") if _text(h1)), "")
+    _remove_unlikely(root)
+    scores = _score_blocks(root)
+    if not scores:
+        return ""
+    top = _top_candidate(scores)
+
+    # Keep siblings that score close to the top candidate (e.g. a separate requirements block),
+    # and unscored ones that are not link lists (e.g. a location/salary line)
+    threshold = max(3.0, scores[top] * 0.2)
+    parent = top.getparent()
+    kept = []
+    for sibling in (parent if parent is not None else [top]):
+        if sibling in scores:
+            keep = sibling is top or scores[sibling] >= threshold
+        else:
+            text = _text(sibling)
+            keep = bool(text) and _link_density(sibling, len(text)) < 0.25
+        if keep:
+            kept.append(sibling)
+    text = "\n".join(_block_text(element) for element in kept)
+    if title and title not in text:
+        text = f"{title}\n{text}"
+    return text
+
+
+def extract_job_content(html: str):
+    """
+    Posting body of a job page as (text, source), source being "json-ld", "main-content"
+    or "page" for the full-text fallback.
+    """
+    posting = find_job_posting(html)
+    if posting is not None:
+        text = job_posting_text(posting)
+        if len(text) >= MIN_CONTENT_CHARS:
+            return text, "json-ld"
+    text = extract_main_content(html)
+    if len(text) >= MIN_CONTENT_CHARS:
+        return text, "main-content"
+    return html_to_text_fast(html), "page"
+
+
+def extract_job_text(html: str) -> str:
+    """Posting body of a job page: JSON-LD JobPosting, else the main content block, else all page text."""
+    return extract_job_content(html)[0]
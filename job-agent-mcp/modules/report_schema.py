@@ -0,0 +1,198 @@
+# modules/report_schema.py
+"""
+The skill-gap report every analyzer app asks the LLM for, as a typed record and as
+the JSON schema handed to providers as their response schema.
+
+parse_report() takes raw model text to a SkillGapReport: strict JSON first, then
+the cheap repair in json_stream.repair_json(), then a validator that coerces
+near-miss values (a comma-separated string where a list is expected, numbers in
+a skill list; missing lists default to empty) instead of rejecting the whole response.
+"""
+import json
+from dataclasses import dataclass, field, fields
+
+from .json_stream import load_json_object
+
+SKILL_LIST_FIELDS = (
+    "matched_skills",
+    "missing_skills",
+    "candidate_skills",
+    "required_job_skills",
+    "additional_skills",
+)
+
+REPORT_FIELD_DESCRIPTIONS = {
+    "overall_fit_summary": "A brief summary of how well the candidate's skills align with the job requirements.",
+    "matched_skills": "Skills present in both the resume and the job description.",
+    "missing_skills": "Skills required by the job description but NOT found in the resume.",
+    "candidate_skills": "List of key technical and soft skills explicitly mentioned in the resume.",
+    "required_job_skills": "List of essential technical and soft skills mentioned in the job description.",
+    "additional_skills": "Skills present in the resume but not explicitly required by the job description.",
+}
+
+
+class ReportValidationError(ValueError):
+    pass
+
+
+@dataclass
+class SkillGapReport:
+    overall_fit_summary: str = ""
+    matched_skills: list = field(default_factory=list)
+    missing_skills: list = field(default_factory=list)
+    candidate_skills: list = field(default_factory=list)
+    required_job_skills: list = field(default_factory=list)
+    additional_skills: list = field(default_factory=list)
+    # Set when the raw output needed repair_json() or value coercion; not part of the report
+    repaired: bool = field(default=False, compare=False, repr=False)
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "repaired"}
+
+
+def _report_properties() -> dict:
+    properties = {"overall_fit_summary": {"type": "string", "description": REPORT_FIELD_DESCRIPTIONS["overall_fit_summary"]}}
+    for name in SKILL_LIST_FIELDS:
+        properties[name] = {"type": "array", "items": {"type": "string"}, "description": REPORT_FIELD_DESCRIPTIONS[name]}
+    return properties
+
+
+# Property order is the order the model writes fields in, so the summary streams first
+REPORT_JSON_SCHEMA = {
+    "type": "object",
+    "properties": _report_properties(),
+    "required": ["overall_fit_summary", *SKILL_LIST_FIELDS],
+    "additionalProperties": False,
+}
+
+# Used when the skill lists come from the local matcher and only the summary is asked for
+SUMMARY_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {"overall_fit_summary": _report_properties()["overall_fit_summary"]},
+    "required": ["overall_fit_summary"],
+    "additionalProperties": False,
+}
+
+def _batch_schema(entry_properties: dict, required: list) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "reports": {
+                "type": "array",
+                "description": "One entry per job description, in the same order.",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "job_index": {"type": "integer", "description": "Number of the job description this entry is about."},
+                        **entry_properties,
+                    },
+                    "required": ["job_index", *required],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["reports"],
+        "additionalProperties": False,
+    }
+
+
+BATCH_REPORT_JSON_SCHEMA = _batch_schema(_report_properties(), ["overall_fit_summary", *SKILL_LIST_FIELDS])
+# Batch counterpart of SUMMARY_JSON_SCHEMA: the skill lists of every job were matched locally
+BATCH_SUMMARY_JSON_SCHEMA = _batch_schema(SUMMARY_JSON_SCHEMA["properties"], ["overall_fit_summary"])
+
+
+def describe_report_fields() -> str:
+    """
+    One line per report field, for prompts sent to providers that only support plain JSON mode.
+    """
+    lines = [f'- "overall_fit_summary" (string): {REPORT_FIELD_DESCRIPTIONS["overall_fit_summary"]}']
+    lines += [f'- "{name}" (list of strings): {REPORT_FIELD_DESCRIPTIONS[name]}' for name in SKILL_LIST_FIELDS]
+    return "\n".join(lines)
+
+
+def _coerce_skill_list(value):
+    """Returns (list of strings, coerced?)."""
+    if value is None:
+        return [], False
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()], True
+    if not isinstance(value, list):
+        raise ReportValidationError(f"expected a list of strings, got {type(value).__name__}")
+    if all(isinstance(item, str) for item in value):
+        return value, False
+    return [str(item).strip() for item in value if item is not None and str(item).strip()], True
+
+
+def validate_report(data) -> SkillGapReport:
+    """
+    Checks a decoded report against the schema, coercing near-miss values.
+    Raises ReportValidationError if it is not a report at all.
+    """
+    if not isinstance(data, dict):
+        raise ReportValidationError(f"expected a JSON object, got {type(data).__name__}")
+    if not any(name in data for name in REPORT_FIELD_DESCRIPTIONS):
+        raise ReportValidationError("no report fields in LLM output")
+    repaired = False
+    summary = data.get("overall_fit_summary")
+    if not isinstance(summary, str):
+        summary, repaired = ("" if summary is None else str(summary)), True
+    values = {}
+    for name in SKILL_LIST_FIELDS:
+        try:
+            values[name], coerced = _coerce_skill_list(data.get(name))
+        except ReportValidationError as e:
+            raise ReportValidationError(f"{name}: {e}") from None
+        repaired = repaired or coerced
+    return SkillGapReport(overall_fit_summary=summary, repaired=repaired, **values)
+
+
+def parse_report(text: str) -> SkillGapReport:
+    """
+    Parses raw model output into a SkillGapReport, repairing near-valid JSON.
+    Raises ReportValidationError when the output cannot be recovered.
+    """
+    try:
+        data, repaired = load_json_object(text)
+    except json.JSONDecodeError as e:
+        raise ReportValidationError(f"LLM output is not valid JSON: {e}") from None
+    report = validate_report(data)
+    report.repaired = report.repaired or repaired
+    return report
+
+
+def parse_batch_reports(text: str) -> dict:
+    """
+    Parses a batch response into {job_index: SkillGapReport}; entries that fail validation are left out.
+    """
+    try:
+        data, repaired = load_json_object(text)
+    except json.JSONDecodeError as e:
+        raise ReportValidationError(f"LLM output is not valid JSON: {e}") from None
+    entries = data.get("reports") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ReportValidationError("LLM output has no reports list")
+    reports = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("job_index"), int):
+            continue
+        try:
+            report = validate_report(entry)
+        except ReportValidationError:
+            continue
+        report.repaired = report.repaired or repaired
+        reports[entry["job_index"]] = report
+    return reports
+
+
+def coerce_report_field(name: str, value):
+    """
+    Coerces one streamed field the way validate_report() would; unknown fields pass through.
+    """
+    if name == "overall_fit_summary" and not isinstance(value, str):
+        return "" if value is None else str(value)
+    if name in SKILL_LIST_FIELDS:
+        try:
+            return _coerce_skill_list(value)[0]
+        except ReportValidationError:
+            return []
+    return value
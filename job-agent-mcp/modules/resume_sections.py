@@ -0,0 +1,129 @@
+# modules/resume_sections.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+# Canonical section name -> headings that introduce it (lowercase, no punctuation)
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile",
+                "objective", "career objective", "about me", "overview"),
+    "experience": ("experience", "work experience", "professional experience",
+                   "employment", "employment history", "work history", "career history"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies",
+               "competencies", "technologies", "tools", "skills and tools"),
+    "education": ("education", "academic background", "qualifications",
+                  "education and qualifications"),
+    "projects": ("projects", "key projects", "selected projects"),
+    "certifications": ("certifications", "certificates", "licenses and certifications"),
+    "other": ("awards", "honors", "publications", "research interests", "interests",
+              "hobbies", "references", "languages", "volunteering", "working papers"),
+}
+
+# Sections worth sending to matching/prompting; contact details and "other" are dropped
+RELEVANT_SECTIONS = ("summary", "experience", "skills", "projects", "certifications", "education")
+
+_HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+
+def _alternation(headings):
+    return "|".join(re.escape(h).replace(r"\ ", r"\s+") for h in sorted(headings, key=len, reverse=True))
+
+
+_ALTERNATION = _alternation(_HEADING_TO_SECTION)
+# A heading on its own line, optionally followed by a colon
+_LINE_HEADING_RE = re.compile(rf"^[ \t]*({_ALTERNATION})[ \t]*:?[ \t]*$", re.IGNORECASE | re.MULTILINE)
+# Flattened text (e.g. DOCX paragraphs joined by spaces): only trust ALL-CAPS headings
+_INLINE_HEADING_RE = re.compile(rf"(?<!\S)({_alternation(h.upper() for h in _HEADING_TO_SECTION)})(?!\S)")
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    heading: str
+    start: int  # offset of the section body in the resume text
+    end: int
+
+
+@dataclass
+class ResumeProfile:
+    """
+    A resume split into canonical sections with character offsets into `text`.
+    """
+    text: str
+    digest: str
+    sections: list = field(default_factory=list)
+
+    def section_text(self, *names):
+        """
+        Returns the joined text of the named sections, in document order.
+        """
+        return "\n".join(
+            self.text[s.start:s.end].strip() for s in self.sections if s.name in names
+        ).strip()
+
+    def relevant_text(self, names=RELEVANT_SECTIONS):
+        """
+        Returns only the sections useful for matching, or the full text if none were found.
+        """
+        return self.section_text(*names) or self.text
+
+
+def resume_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _normalise_heading(heading: str) -> str:
+    return " ".join(heading.lower().split())
+
+
+def segment_resume(text: str, digest: str = None) -> ResumeProfile:
+    """
+    Splits resume text into sections at recognised headings.
+
+    Text before the first heading is kept as a "header" section (name, contact details).
+    """
+    matches = list(_LINE_HEADING_RE.finditer(text))
+    if len(matches) < 2:
+        matches = list(_INLINE_HEADING_RE.finditer(text)) or matches
+
+    sections = []
+    if matches and matches[0].start() > 0:
+        sections.append(Section("header", "", 0, matches[0].start()))
+    elif not matches:
+        sections.append(Section("header", "", 0, len(text)))
+
+    for i, match in enumerate(matches):
+        heading = match.group(1)
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        name = _HEADING_TO_SECTION[_normalise_heading(heading)]
+        sections.append(Section(name, heading.strip(), match.end(), end))
+
+    return ResumeProfile(text=text, digest=digest or resume_hash(text), sections=sections)
+
+
+_PROFILE_CACHE_SIZE = 128
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+
+def get_resume_profile(text: str) -> ResumeProfile:
+    """
+    Returns the structured profile for a resume, segmenting it at most once per resume hash.
+    """
+    digest = resume_hash(text)
+    with _profile_cache_lock:
+        profile = _profile_cache.get(digest)
+        if profile is not None:
+            _profile_cache.move_to_end(digest)
+            return profile
+
+    profile = segment_resume(text, digest)
+    with _profile_cache_lock:
+        _profile_cache[digest] = profile
+        if len(_profile_cache) > _PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
@@ -0,0 +1,225 @@
+# modules/salary.py
+"""
+Salary parsing to annual amounts in one base currency.
+
+Job feeds write salaries as "$120k–$150k", "SGD 8,000/month", "£45 per hour",
+"USD 90,000 - 110,000 a year" or schema.org MonetaryAmount objects. parse_salary()
+turns each into (annual_min, annual_max) in BASE_CURRENCY (SALARY_BASE_CURRENCY,
+default SGD), so salary filters compare like with like:
+
+- ranges: two amounts joined by "-", "–" or "to" are the bounds; a k/m suffix on
+  the upper bound also applies to a bare lower bound ("120-150k"). "Up to" or "max"
+  before a single amount makes it the maximum only, with no minimum
+- which amount: the first amount or range with a currency, k/m suffix or pay period
+  next to it ("3-5 years experience, $6,000/month" is the $6,000); without one, only
+  a lone amount ("85000") counts. Other numbers ("+ 10% bonus", "401k match") are
+  ignored, and "60.000" (a dot before exactly three digits) is sixty thousand
+- currencies: ISO codes and symbols (S$, US$, €, £, ...) are converted with the
+  static CURRENCY_PER_USD table; a bare "$", or no currency, is `default_currency`
+- periods: hourly, daily, weekly and monthly amounts are annualised with
+  PERIOD_FACTORS, using the period word nearest the amounts; amounts without a
+  period are `default_period` (annual)
+
+Patterns are compiled once and results are cached per distinct string, since a
+feed repeats a handful of formats. parse_salaries() parses a whole column into
+NumPy arrays (NaN where there is no salary), parsing each distinct string once.
+
+Time it on a synthetic column with `python -m benchmarks.salary`.
+"""
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+
+BASE_CURRENCY = os.getenv("SALARY_BASE_CURRENCY", "SGD").upper()
+
+# Approximate units of each currency per US dollar. Static on purpose: salary
+# filters need a stable ordering, not today's exchange rate.
+CURRENCY_PER_USD = {
+    "USD": 1.0, "SGD": 1.35, "EUR": 0.92, "GBP": 0.79, "AUD": 1.52, "CAD": 1.37,
+    "NZD": 1.65, "HKD": 7.8, "JPY": 150.0, "CNY": 7.2, "INR": 83.0, "MYR": 4.7,
+    "IDR": 15700.0, "PHP": 56.0, "THB": 36.0, "VND": 25000.0, "KRW": 1350.0, "CHF": 0.88,
+    "SEK": 10.5, "NOK": 10.6, "DKK": 6.9, "PLN": 4.0, "AED": 3.67, "ZAR": 18.5,
+}
+
+# Symbols and local names -> ISO code; longer symbols are matched before "$"
+CURRENCY_SYMBOLS = {
+    "s$": "SGD", "us$": "USD", "a$": "AUD", "au$": "AUD", "c$": "CAD", "ca$": "CAD",
+    "nz$": "NZD", "hk$": "HKD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR",
+    "rm": "MYR", "rp": "IDR", "₱": "PHP", "฿": "THB", "₩": "KRW",
+}
+
+# Multipliers to an annual amount (40-hour weeks, 260 working days)
+PERIOD_FACTORS = {"hour": 2080, "day": 260, "week": 52, "month": 12, "year": 1}
+
+_CURRENCY_WORDS = [code.lower() for code in CURRENCY_PER_USD] + [name for name in CURRENCY_SYMBOLS if name.isalpha()]
+_CURRENCY_PATTERN = (
+    r"(?<![a-z])(" + "|".join(_CURRENCY_WORDS) + r")(?![a-z])"
+    r"|(" + "|".join(re.escape(symbol) for symbol in sorted(CURRENCY_SYMBOLS, key=len, reverse=True)
+                     if not symbol.isalpha()) + r"|\$)"
+)
+_CURRENCY_RE = re.compile(_CURRENCY_PATTERN)
+_AMOUNT_RE = re.compile(r"(\d[\d,]*(?:\.\d+)*)\s*(k|m|mn|million|thousand)?(?![a-z\d])")
+# "60.000", "60.000,50": a dot before exactly three digits separates thousands
+_DOT_THOUSANDS_RE = re.compile(r"\d{1,3}(?:\.\d{3})+(?:,\d{1,2})?")
+# What may separate a range's bounds: "120k-150k", "S$5,000 - S$7,000", "4,500 to 6,000"
+_RANGE_JOIN_RE = re.compile(r"\s*(?:-|to)\s*(?:" + _CURRENCY_PATTERN + r")?\s*$")
+# A currency or pay period right next to an amount marks it as a salary ("3-5 years" is not one)
+_CURRENCY_BEFORE_RE = re.compile(r"(?:" + _CURRENCY_PATTERN + r")\s*$")
+_CURRENCY_AFTER_RE = re.compile(r"\s*(?:" + _CURRENCY_PATTERN + r")")
+_RATE_AFTER_RE = re.compile(
+    r"\s*(?:/\s*(?:h|hr|hour|d|day|w|wk|week|m|mth|mo|month|y|yr|year|annum)\b"
+    r"|(?:per|an?|each)\s+(?:hour|hr|day|week|wk|month|mth|year|yr|annum)\b"
+    r"|(?:hourly|daily|weekly|monthly|yearly|annually)\b|p\.?[ahdwm]\b)"
+)
+_UP_TO_RE = re.compile(r"\b(?:up\s*to|max(?:imum)?\.?|not\s+more\s+than)\s*:?\s*(?:" + _CURRENCY_PATTERN + r")?\s*$")
+_PERIOD_RE = re.compile(
+    r"(?P<hour>\b(?:hour|hr|hourly)s?\b|/\s*h\b|\bp\.?h\b)"
+    r"|(?P<day>\b(?:day|daily)\b|/\s*d\b|\bp\.?d\b)"
+    r"|(?P<week>\b(?:week|wk|weekly)s?\b|/\s*w\b|\bp\.?w\b)"
+    r"|(?P<month>\b(?:month|mth|mo|monthly)s?\b|/\s*m\b|\bp\.?m\b)"
+    r"|(?P<year>\b(?:year|yr|annum|annual|annually|yearly)s?\b|/\s*y\b|\bp\.?a\b)"
+)
+_SCALE = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6}
+_SCHEMA_PERIODS = {"HOUR": "hour", "DAY": "day", "WEEK": "week", "MONTH": "month", "YEAR": "year"}
+
+
+def convert_currency(amount: float, currency: str, base: str = BASE_CURRENCY) -> float:
+    """`amount` in `currency` expressed in `base`; unknown currencies are treated as `base`."""
+    rate_from = CURRENCY_PER_USD.get(currency.upper())
+    rate_to = CURRENCY_PER_USD.get(base.upper())
+    if rate_from is None or rate_to is None or rate_from == rate_to:
+        return amount
+    return amount * rate_to / rate_from
+
+
+def _currency(text: str, default: str) -> str:
+    match = _CURRENCY_RE.search(text)
+    if match is None:
+        return default
+    name = match.group(1) or match.group(2)
+    return CURRENCY_SYMBOLS.get(name) or (name.upper() if match.group(1) else default)
+
+
+def _period(text: str, span: tuple, default: str) -> str:
+    """The period named nearest to the amounts at `span` ("5 days work week" after a monthly rate is not one)."""
+    start, end = span
+    nearest, distance = default, None
+    for match in _PERIOD_RE.finditer(text):
+        gap = max(match.start() - end, start - match.end(), 0)
+        if distance is None or gap < distance:
+            nearest, distance = match.lastgroup, gap
+    return nearest
+
+
+def _number(digits: str):
+    """The value of an amount's digits, or None when they are not one number ("1.2.3")."""
+    if "." not in digits:
+        return float(digits.replace(",", ""))
+    if _DOT_THOUSANDS_RE.fullmatch(digits):
+        whole, _, fraction = digits.replace(".", "").partition(",")
+        return float(f"{whole}.{fraction or 0}")
+    return float(digits.replace(",", "")) if digits.count(".") == 1 else None
+
+
+def _is_marked(text: str, match) -> bool:
+    """Whether an amount carries a k/m suffix, or has a currency or pay period right next to it."""
+    return bool(match.group(2) or _CURRENCY_BEFORE_RE.search(text, max(0, match.start() - 8), match.start())
+                or _CURRENCY_AFTER_RE.match(text, match.end()) or _RATE_AFTER_RE.match(text, match.end()))
+
+
+def _amounts(text: str):
+    """
+    The salary amounts in `text`, scaled by their k/m suffixes, their span, and whether
+    they are only an upper bound ("up to $150,000"). Amounts joined by "-" or "to" form
+    a range; the salary is the first amount or range with a currency, k/m suffix or pay
+    period next to it ("3-5 years experience, $6,000/month" is the $6,000), or the only
+    amount in `text` when none has one. Percentages ("10% bonus") are skipped.
+    """
+    found = []  # (match, number)
+    for match in _AMOUNT_RE.finditer(text):
+        if text[match.end():].lstrip().startswith("%") or match.group(0) == "401k":  # the retirement plan
+            continue
+        number = _number(match.group(1))
+        if number is not None:
+            found.append((match, number))
+    groups, i = [], 0
+    while i < len(found):
+        joined = i + 1 < len(found) and _RANGE_JOIN_RE.match(text[found[i][0].end():found[i + 1][0].start()])
+        groups.append(found[i:i + 2] if joined else found[i:i + 1])
+        i += len(groups[-1])
+    bounds = next((group for group in groups if any(_is_marked(text, match) for match, _ in group)),
+                  found if len(found) == 1 else None)
+    if not bounds:
+        return [], (0, 0), False
+    amounts = [(number, _SCALE.get(match.group(2), 1.0)) for match, number in bounds]
+    if len(amounts) == 2 and amounts[0][1] == 1.0 and amounts[1][1] != 1.0 and amounts[0][0] < 1000:
+        amounts[0] = (amounts[0][0], amounts[1][1])  # "120-150k"
+    start, end = bounds[0][0].start(), bounds[-1][0].end()
+    upper_only = len(bounds) == 1 and bool(_UP_TO_RE.search(text, max(0, start - 24), start))
+    return [number * scale for number, scale in amounts], (start, end), upper_only
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str, default_currency: str, default_period: str, base: str):
+    text = text.lower().replace("–", "-").replace("—", "-")
+    amounts, span, upper_only = _amounts(text)
+    if not amounts:
+        return None, None
+    factor = PERIOD_FACTORS[_period(text, span, default_period)]
+    currency = _currency(text, default_currency)
+    low, high = (convert_currency(amount * factor, currency, base) for amount in (min(amounts), max(amounts)))
+    return (None if upper_only else low), high
+
+
+def parse_salary(value, default_currency: str = BASE_CURRENCY, default_period: str = "year",
+                 base: str = BASE_CURRENCY):
+    """
+    (annual_min, annual_max) in `base` currency from a salary string, a number or a
+    schema.org MonetaryAmount dict; (None, None) when there is no amount.
+    """
+    if value is None or isinstance(value, bool):
+        return None, None
+    if isinstance(value, (int, float)):
+        amount = convert_currency(float(value) * PERIOD_FACTORS[default_period], default_currency, base)
+        return amount, amount
+    if isinstance(value, dict):  # schema.org MonetaryAmount / QuantitativeValue
+        currency = value.get("currency") or default_currency
+        inner = value.get("value", value)
+        unit = inner.get("unitText") if isinstance(inner, dict) else value.get("unitText")
+        period = _SCHEMA_PERIODS.get(str(unit or "").upper(), default_period)
+        if not isinstance(inner, dict):
+            return parse_salary(inner, currency, period, base)
+        low, high = inner.get("minValue", inner.get("value")), inner.get("maxValue", inner.get("value"))
+        bounds = [parse_salary(amount, currency, period, base)[0] for amount in (low, high) if amount is not None]
+        bounds = [amount for amount in bounds if amount is not None]
+        return (min(bounds), max(bounds)) if bounds else (None, None)
+    if isinstance(value, (list, tuple)):
+        value = " - ".join(map(str, value))
+    return _parse_text(str(value).strip(), default_currency.upper(), default_period, base.upper())
+
+
+def parse_salaries(values, default_currency: str = BASE_CURRENCY, default_period: str = "year",
+                   base: str = BASE_CURRENCY):
+    """
+    Parses a column of salaries into (annual_min, annual_max) float64 arrays, NaN
+    where there is no amount. Each distinct string is parsed once.
+    """
+    values = list(values)
+    salary_min = np.full(len(values), np.nan)
+    salary_max = np.full(len(values), np.nan)
+    parsed = {}
+    for row, value in enumerate(values):
+        key = value if isinstance(value, (str, int, float)) else None
+        bounds = parsed.get(key) if key is not None else None
+        if bounds is None:
+            bounds = parse_salary(value, default_currency, default_period, base)
+            if key is not None:
+                parsed[key] = bounds
+        low, high = bounds
+        if low is not None:
+            salary_min[row] = low
+        if high is not None:
+            salary_max[row] = high
+    return salary_min, salary_max
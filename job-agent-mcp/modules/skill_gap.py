@@ -1,7 +1,16 @@
 # modules/skill_gap.py
 # Use relative import
-from .utils import extract_skills_from_resume
+from .document import as_document
+from .job_posting import as_job_posting
 
 def analyze_skill_gap(resume_text, jobs):
-    # your existing logic
-    return extract_skills_from_resume(resume_text)  # example placeholder
\ No newline at end of file
+    """
+    Lists, per job title, the job's skills that the resume does not mention.
+    Accepts resume text or a Document, so the resume is tokenised once per request,
+    and JobPostings or job dicts.
+    """
+    resume = as_document(resume_text)
+    gaps = {}
+    for job in map(as_job_posting, jobs):
+        gaps[job.title] = [skill for skill in job.skills if not resume.contains(skill)]
+    return gaps
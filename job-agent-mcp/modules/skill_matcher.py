@@ -0,0 +1,168 @@
+# modules/skill_matcher.py
+"""
+Deterministic, dictionary-based skill matching between a resume and a job description.
+
+Computes the mechanical part of the skill-gap report (candidate, required, matched,
+missing and additional skills) locally in milliseconds, so the LLM is only needed
+for the narrative overall_fit_summary, or not at all in fast mode.
+"""
+from .compaction import compact_job_description
+from .document import SkillVocabulary, as_document
+from .report_schema import SkillGapReport
+
+# Canonical skill name -> aliases matched as the same skill. Aliases that are also
+# common English words ("go", "r", "c") are left out, and skills named by one are
+# listed under an unambiguous name ("Golang"), to avoid false matches. Names in
+# CASED_NAME_SKILLS are common words too ("I excel at", "swift delivery"), so they
+# are only matched when capitalised as a name ("React", "Excel"); their aliases are
+# matched in any case.
+SKILL_DICTIONARY = {
+    # Languages
+    "Python": ["python3"],
+    "Java": [],
+    "JavaScript": ["js", "ecmascript", "es6"],
+    "TypeScript": [],
+    "C++": ["cpp"],
+    "C#": ["csharp", "c sharp"],
+    "Golang": ["go programming", "go language"],
+    "Rust": ["rust programming", "rust language", "rustlang"],
+    "Ruby": [],
+    "PHP": [],
+    "Scala": [],
+    "Kotlin": [],
+    "Swift": ["swift programming", "swift language", "swiftui"],
+    "R programming": ["rstudio", "r language"],
+    "MATLAB": [],
+    "SQL": ["t-sql", "pl/sql", "plsql"],
+    "Bash": ["shell scripting", "shell script"],
+    "HTML": ["html5"],
+    "CSS": ["css3", "sass", "scss"],
+    # Web and backend
+    "React": ["react.js", "reactjs", "react native"],
+    "Angular": ["angularjs"],
+    "Vue.js": ["vue", "vuejs"],
+    "Node.js": ["nodejs", "node js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    "Spring Boot": ["spring framework"],
+    ".NET": ["dotnet", "asp.net"],
+    "REST APIs": ["restful", "rest api", "rest apis", "restful apis"],
+    "GraphQL": [],
+    "Microservices": ["microservice", "microservice architecture"],
+    # Data stores
+    "PostgreSQL": ["postgres"],
+    "MySQL": [],
+    "SQL Server": ["mssql", "microsoft sql server"],
+    "Oracle": ["oracle database", "oracle db", "oracle sql"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Elasticsearch": ["elastic search", "opensearch"],
+    "Cassandra": [],
+    "DynamoDB": [],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+    # Data and ML
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "Natural Language Processing": ["nlp"],
+    "Computer Vision": [],
+    "Generative AI": ["genai", "gen ai"],
+    "Large Language Models": ["llm", "llms"],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "Keras": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "Spark": ["apache spark", "pyspark", "spark sql", "spark streaming"],
+    "Hadoop": [],
+    "Kafka": ["apache kafka"],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "ETL": ["elt", "data pipelines", "data pipeline"],
+    "Data Analysis": ["data analytics"],
+    "Data Visualization": [],
+    "Statistics": ["statistical analysis", "statistical modeling"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["microsoft excel", "ms excel", "advanced excel", "excel vba", "excel spreadsheets"],
+    # Cloud and DevOps
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": ["containers", "containerization"],
+    "Kubernetes": ["k8s"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "CI/CD": ["continuous integration", "continuous delivery", "continuous deployment"],
+    "GitHub Actions": [],
+    "Git": ["github", "gitlab", "version control"],
+    "Linux": ["unix"],
+    "Serverless": ["aws lambda", "lambda functions"],
+    "Monitoring": ["observability", "prometheus", "grafana", "datadog", "system monitoring", "monitoring tools"],
+    # Practices
+    "Agile": ["scrum", "kanban"],
+    "Test Automation": ["automated testing", "unit testing", "pytest", "junit", "selenium"],
+    "System Design": ["distributed systems", "software architecture"],
+    "Security": ["cybersecurity", "information security", "application security", "network security",
+                 "security engineering"],
+    "Project Management": ["program management"],
+    "Product Management": [],
+    "UX Design": ["ux", "ui/ux", "user experience", "figma"],
+    "Jira": [],
+    # Soft skills
+    "Communication": ["communication skills", "written communication", "verbal communication"],
+    "Leadership": ["team leadership", "people management"],
+    "Collaboration": ["teamwork", "cross-functional collaboration"],
+    "Problem Solving": ["problem-solving", "analytical thinking", "analytical skills"],
+    "Stakeholder Management": ["stakeholder engagement"],
+    "Mentoring": ["coaching"],
+}
+
+CASED_NAME_SKILLS = frozenset({"Swift", "Rust", "React", "Oracle", "Spark", "Excel", "Monitoring", "Security"})
+
+DEFAULT_VOCABULARY = SkillVocabulary()
+for _skill, _aliases in SKILL_DICTIONARY.items():
+    DEFAULT_VOCABULARY.add(_skill, _aliases, cased_name=_skill in CASED_NAME_SKILLS)
+
+
+def _names(vocabulary, skill_ids) -> list:
+    # Ids follow dictionary order, which keeps output stable between runs
+    return [vocabulary.name(skill_id) for skill_id in sorted(skill_ids)]
+
+
+def summarize_fit(report: SkillGapReport) -> str:
+    """
+    Template summary used in fast mode, where no LLM writes one.
+    """
+    required = len(report.required_job_skills)
+    if not required:
+        return "No skills from the skill dictionary were found in the job description."
+    matched = len(report.matched_skills)
+    summary = f"The resume covers {matched} of {required} required skills ({matched / required:.0%})."
+    if report.missing_skills:
+        summary += f" Missing: {', '.join(report.missing_skills)}."
+    return summary
+
+
+def match_skills(resume_text, job_description_text, vocabulary: SkillVocabulary = DEFAULT_VOCABULARY) -> SkillGapReport:
+    """
+    Matches resume and job description skills against `vocabulary`. Accepts text or
+    Documents. Job description boilerplate and benefits sections are ignored.
+    The returned report's overall_fit_summary is the template from summarize_fit().
+    """
+    resume = as_document(resume_text)
+    job_description = as_document("\n".join(compact_job_description(str(job_description_text))))
+    candidate_ids = resume.skill_ids(vocabulary)
+    required_ids = job_description.skill_ids(vocabulary)
+    report = SkillGapReport(
+        candidate_skills=_names(vocabulary, candidate_ids),
+        required_job_skills=_names(vocabulary, required_ids),
+        matched_skills=_names(vocabulary, candidate_ids & required_ids),
+        missing_skills=_names(vocabulary, required_ids - candidate_ids),
+        additional_skills=_names(vocabulary, candidate_ids - required_ids),
+    )
+    report.overall_fit_summary = summarize_fit(report)
+    return report
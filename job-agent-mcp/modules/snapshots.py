@@ -0,0 +1,196 @@
+# modules/snapshots.py
+"""
+Content-addressed snapshots of fetched job pages, so analyses can be replayed and
+benchmarked without the network.
+
+Every page PageFetcher or AsyncCrawler fetches (from the network or the HTTP
+cache) is recorded here: the raw body and its extracted text are stored once each
+under their SHA-256 (gzip-compressed, under objects/), and a line of fetch metadata
+(URL, final URL, time, status, content type, encoding, body and text hashes,
+extractor version) is appended to the URL's history under urls/. A page that has
+not changed since its last snapshot adds nothing.
+
+In offline mode the fetchers serve text only from snapshots and never open a
+connection; a URL without one fails with SnapshotMissing. If the extractor has
+changed since a page was captured, its text is re-extracted from the stored body.
+`as_of` replays the pages as they were at an earlier time.
+
+Run from job-agent-mcp/:
+    python -m modules.snapshots capture samples/job_URL.txt
+    python -m modules.snapshots list
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from .crawler import AsyncCrawler, read_url_list
+from .main_content import JOB_TEXT_VERSION, extract_job_text
+from .web_fetch import FetchError, Page, page_text, text_version
+
+DEFAULT_SNAPSHOT_DIR = os.getenv(
+    "JOB_SNAPSHOT_DIR", str(Path.home() / ".cache" / "job-agent" / "snapshots")
+)
+
+
+class SnapshotMissing(FetchError):
+    """Offline mode was asked for a URL that has no snapshot."""
+
+
+@dataclass
+class Snapshot:
+    url: str
+    fetched_at: float
+    body_hash: str
+    text_hash: str
+    extractor_version: str
+    content_type: str = ""
+    encoding: str = None
+    final_url: str = None
+    status: int = None
+
+
+class SnapshotStore:
+    """
+    Snapshots under `root`. Safe to share across threads; writes are atomic, so
+    several processes may record into the same directory.
+    """
+
+    def __init__(self, root: str = DEFAULT_SNAPSHOT_DIR):
+        self.root = Path(root)
+        (self.root / "objects").mkdir(parents=True, exist_ok=True)
+        (self.root / "urls").mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    # --- content-addressed objects ---
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    def put_object(self, data: bytes) -> str:
+        """Stores `data` under its SHA-256 (once) and returns the hex digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)
+        return digest
+
+    def get_object(self, digest: str) -> bytes:
+        return gzip.decompress(self._object_path(digest).read_bytes())
+
+    # --- per-URL history ---
+
+    def _history_path(self, url: str) -> Path:
+        return self.root / "urls" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.jsonl"
+
+    def history(self, url: str) -> list:
+        """Snapshots of `url`, oldest first."""
+        path = self._history_path(url)
+        if not path.exists():
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [Snapshot(**json.loads(line)) for line in f if line.strip()]
+
+    def latest(self, url: str, as_of: float = None):
+        """The newest snapshot of `url` (taken at or before `as_of`), or None."""
+        snapshots = [s for s in self.history(url) if as_of is None or s.fetched_at <= as_of]
+        return snapshots[-1] if snapshots else None
+
+    def _append(self, snapshot: Snapshot):
+        with self._lock, open(self._history_path(snapshot.url), "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(snapshot)) + "\n")
+
+    def record(self, page: Page, text: str, extractor_version: str = JOB_TEXT_VERSION,
+               final_url: str = None, status: int = None) -> Snapshot:
+        """Snapshots a fetched page and its extracted text, unless the latest snapshot already has both."""
+        version = text_version(page, extractor_version)
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        latest = self.latest(page.url)
+        if (latest is not None and latest.body_hash == page.content_hash
+                and latest.text_hash == text_hash and latest.extractor_version == version):
+            return latest
+        snapshot = Snapshot(
+            url=page.url,
+            fetched_at=time.time(),
+            body_hash=self.put_object(page.body),
+            text_hash=self.put_object(text.encode("utf-8")),
+            extractor_version=version,
+            content_type=page.content_type,
+            encoding=page.encoding,
+            final_url=final_url,
+            status=status,
+        )
+        self._append(snapshot)
+        return snapshot
+
+    def page(self, snapshot: Snapshot) -> Page:
+        """The raw page a snapshot was taken of."""
+        return Page(snapshot.url, self.get_object(snapshot.body_hash), snapshot.encoding,
+                    snapshot.content_type, snapshot.body_hash, from_cache=True)
+
+    def text(self, url: str, extractor=extract_job_text, extractor_version: str = JOB_TEXT_VERSION,
+             as_of: float = None) -> str:
+        """
+        Extracted text of the latest snapshot of `url`. Raises SnapshotMissing when there
+        is none. Text from an older extractor is re-extracted from the stored page (and recorded).
+        """
+        snapshot = self.latest(url, as_of)
+        if snapshot is None:
+            raise SnapshotMissing(f"no snapshot of {url}")
+        page = self.page(snapshot)
+        if snapshot.extractor_version == text_version(page, extractor_version):
+            return self.get_object(snapshot.text_hash).decode("utf-8")
+        text = page_text(None, page, extractor, extractor_version)
+        if as_of is None:
+            self.record(page, text, extractor_version, snapshot.final_url, snapshot.status)
+        return text
+
+    def urls(self) -> list:
+        """Every URL with at least one snapshot."""
+        urls = []
+        for path in sorted((self.root / "urls").glob("*.jsonl")):
+            with open(path, encoding="utf-8") as f:
+                first = f.readline()
+            if first.strip():
+                urls.append(json.loads(first)["url"])
+        return urls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Capture and list job page snapshots.")
+    parser.add_argument("--dir", default=DEFAULT_SNAPSHOT_DIR, help="Snapshot directory (JOB_SNAPSHOT_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    capture = commands.add_parser("capture", help="Fetch a list of job URLs and snapshot them")
+    capture.add_argument("url_file", help="Text file with one job URL per line")
+    commands.add_parser("list", help="List snapshotted URLs")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.dir)
+    if args.command == "list":
+        for url in store.urls():
+            history = store.history(url)
+            fetched = time.strftime("%Y-%m-%d %H:%M", time.localtime(history[-1].fetched_at))
+            print(f"{fetched}\t{len(history)} snapshot(s)\t{url}")
+        return 0
+
+    crawler = AsyncCrawler(snapshots=store)
+    results = asyncio.run(crawler.fetch_all(read_url_list(args.url_file)))
+    for result in results:
+        print(f"{'ok' if result.ok else result.error}\t{result.url}")
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# modules/uploads.py
+import io
+import mmap
+from pathlib import Path
+
+from .utils import extract_text_from_pdf, extract_text_from_docx
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable stream over a bytes-like object.
+
+    Unlike io.BytesIO(data), wrapping a memoryview or mmap does not copy the
+    underlying buffer; only the slices a parser actually reads are materialised.
+    With close_buffer=True the buffer (an mmap open_upload created) is closed
+    together with the reader.
+    """
+
+    def __init__(self, buffer, close_buffer: bool = False):
+        self._buffer = buffer if close_buffer else None
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        chunk = self._view[self._pos:self._pos + len(b)]
+        n = len(chunk)
+        b[:n] = chunk
+        self._pos += n
+        return n
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            try:
+                self._view.release()
+            finally:
+                if self._buffer is not None:
+                    self._buffer.close()
+                    self._buffer = None
+        super().close()
+
+
+def open_upload(upload):
+    """
+    Returns a seekable binary stream over an uploaded resume without copying it.
+
+    Accepts a Streamlit UploadedFile (already an in-memory BytesIO), any
+    seekable file object, a SpooledTemporaryFile that has rolled over to disk
+    (memory-mapped), raw bytes/memoryview, or a file path.
+    """
+    if isinstance(upload, (str, Path)):
+        return open(upload, "rb")
+    if isinstance(upload, (bytes, bytearray, memoryview, mmap.mmap)):
+        return BufferReader(upload)
+
+    # SpooledTemporaryFile keeps small uploads in memory and large ones on disk
+    inner = getattr(upload, "_file", None)
+    if inner is not None and not isinstance(inner, io.BytesIO) and hasattr(inner, "fileno"):
+        inner.flush()
+        return BufferReader(mmap.mmap(inner.fileno(), 0, access=mmap.ACCESS_READ), close_buffer=True)
+    if isinstance(inner, io.BytesIO):
+        upload = inner
+
+    # Seekable file objects (UploadedFile included) are parsed in place
+    upload.seek(0)
+    return upload
+
+
+def _peek(upload, size: int) -> bytes:
+    """The first `size` bytes of a buffer or seekable stream, leaving a stream's position unchanged."""
+    if isinstance(upload, (bytes, bytearray, memoryview, mmap.mmap)):
+        return bytes(memoryview(upload)[:size])
+    if isinstance(upload, (str, Path)) or not hasattr(upload, "read"):
+        return b""
+    try:
+        if not upload.seekable():
+            return b""
+        position = upload.tell()
+        upload.seek(0)
+        head = upload.read(size)
+        upload.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return b""
+    return head if isinstance(head, bytes) else b""
+
+
+def upload_kind(upload):
+    """
+    Returns "pdf", "docx" or "txt" for an upload, judged by its name or MIME type
+    and, failing that, by the leading magic bytes of a buffer or seekable stream.
+    """
+    name = str(getattr(upload, "name", upload if isinstance(upload, (str, Path)) else "")).lower()
+    mime = getattr(upload, "type", "") or ""
+    if name.endswith(".pdf") or mime == "application/pdf":
+        return "pdf"
+    if name.endswith(".docx") or mime.endswith("wordprocessingml.document"):
+        return "docx"
+    magic = _peek(upload, 4)
+    if magic:
+        if magic == b"%PDF":
+            return "pdf"
+        if magic == b"PK\x03\x04":
+            return "docx"
+    return "txt"
+
+
+def extract_text_from_upload(upload):
+    """
+    Extracts resume text from an upload, handing its buffer straight to the PDF/DOCX parser.
+    """
+    kind = upload_kind(upload)
+    stream = open_upload(upload)
+    try:
+        if kind == "pdf":
+            return extract_text_from_pdf(stream)
+        if kind == "docx":
+            return extract_text_from_docx(stream)
+        return stream.read().decode("utf-8", errors="replace")
+    finally:
+        # Close only what open_upload opened, never the caller's file (or a SpooledTemporaryFile's inner one)
+        if stream is not upload and stream is not getattr(upload, "_file", None):
+            stream.close()
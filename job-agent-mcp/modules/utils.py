@@ -1,8 +1,16 @@
 # modules/utils.py
+import io
+import zipfile
+import xml.etree.ElementTree as ET
 import PyPDF2
-from docx import Document
 from pathlib import Path
 
+from .document import as_document
+from .resume_sections import get_resume_profile
+
+# WordprocessingML namespace used by word/document.xml
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
 def extract_text_from_pdf(file):
     """
     Extracts text from a PDF file object or path.
@@ -12,24 +20,64 @@ def extract_text_from_pdf(file):
     else:
         reader = PyPDF2.PdfReader(file)
     
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + " "
-    return text
+    return " ".join(page.extract_text() or "" for page in reader.pages)
 
-def extract_text_from_docx(file):
+def iter_docx_paragraphs(file, include_tables=True):
     """
-    Extracts text from a DOCX file object or path.
+    Lazily yields the text of each paragraph in a DOCX file object or path.
+
+    word/document.xml is parsed incrementally straight out of the zip
+    container, so a seekable upload buffer is read in place (no temp-file
+    copy) and finished body elements are discarded as soon as they have
+    been yielded. Table cells are included unless include_tables is False.
     """
-    if isinstance(file, (str, Path)):
-        doc = Document(str(file))
+    if not isinstance(file, (str, Path)):
+        if hasattr(file, "seek"):
+            file.seek(0)
+        if not (hasattr(file, "seekable") and file.seekable()):
+            # zipfile needs random access to read the central directory
+            file = io.BytesIO(file.read())
     else:
-        doc = Document(file)
-    
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + " "
-    return text
+        file = str(file)
+
+    with zipfile.ZipFile(file) as archive, archive.open("word/document.xml") as xml_stream:
+        depth = 0
+        table_depth = 0
+        body = None
+        parts = []
+        for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if elem.tag == _W + "body":
+                    body = elem
+                elif elem.tag == _W + "tbl":
+                    table_depth += 1
+                continue
+
+            depth -= 1
+            tag = elem.tag
+            if tag == _W + "t":
+                if elem.text:
+                    parts.append(elem.text)
+            elif tag == _W + "tab":
+                parts.append(" ")
+            elif tag == _W + "p":
+                if parts and (include_tables or not table_depth):
+                    yield "".join(parts)
+                parts = []
+                elem.clear()
+            elif tag == _W + "tbl":
+                table_depth -= 1
+
+            # Direct children of <w:body> are complete; drop them to bound memory
+            if body is not None and depth == 2:
+                body.clear()
+
+def extract_text_from_docx(file):
+    """
+    Extracts text from a DOCX file object or path, including table cells.
+    """
+    return " ".join(iter_docx_paragraphs(file))
 
 def extract_skills_from_resume(file):
     """
@@ -59,6 +107,14 @@ def extract_skills_from_resume(file):
         # Plain string
         text = str(file)
 
+    # Only look at skills/experience-type sections; contact details and references are noise
+    return extract_skills_from_text(get_resume_profile(text).relevant_text())
+
+def extract_skills_from_text(text):
+    """
+    Extracts capitalized words from plain text or a Document (resume or job description)
+    as a basic skill list.
+    """
     # Extract words starting with uppercase letters as skills
-    skills = [word.strip() for word in text.split() if word.istitle()]
+    skills = [word for word in as_document(text).words if word.istitle()]
     return skills
\ No newline at end of file
@@ -0,0 +1,477 @@
+# modules/web_fetch.py
+"""
+Shared fetcher for job description pages.
+
+PageFetcher keeps one pooled requests.Session (connections are reused across
+fetches and threads) and an on-disk HTTP cache (SQLite) that follows the
+response's caching headers:
+
+- Cache-Control max-age / Expires make a response fresh; fresh pages are served
+  without touching the network.
+- Stale pages with an ETag or Last-Modified are revalidated with a conditional
+  request; a 304 reuses the stored body.
+- no-store responses are never written; no-cache ones are always revalidated.
+- Responses without freshness information get a heuristic lifetime (10% of their
+  age per Last-Modified, else `default_ttl`), capped at `default_ttl`.
+
+fetch_text() also caches the extracted text, keyed by URL, the hash of the page
+body and the extractor version, so a page that has not changed is not parsed again.
+The cache itself is HTTPCache, which crawler.AsyncCrawler shares for batch fetches.
+With a snapshots.SnapshotStore, fetched pages are also snapshotted for offline replay.
+
+Bodies are streamed rather than read whole: responses whose Content-Type is not in
+ALLOWED_CONTENT_TYPES are dropped before any of the body is read, downloads stop
+as soon as they pass `max_response_bytes`, and HTML/text is decoded chunk by chunk
+as it arrives (charset from the Content-Type, else a BOM or <meta charset> in the
+first 1024 bytes, else UTF-8). PDF job descriptions go to the PDF text extractor
+instead of the HTML path.
+"""
+import codecs
+import email.utils
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .html_text import clean_text_lines
+from .main_content import JOB_TEXT_VERSION, extract_job_text
+from .uploads import BufferReader
+from .utils import extract_text_from_pdf
+
+DEFAULT_HTTP_CACHE_PATH = os.getenv(
+    "HTTP_CACHE_PATH", str(Path.home() / ".cache" / "job-agent" / "http_cache.sqlite3")
+)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+DEFAULT_MAX_RESPONSE_BYTES = 10 * 1024 * 1024
+
+HTML_CONTENT_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+TEXT_CONTENT_TYPES = frozenset({"text/plain"})
+PDF_CONTENT_TYPES = frozenset({"application/pdf", "application/x-pdf"})
+ALLOWED_CONTENT_TYPES = HTML_CONTENT_TYPES | TEXT_CONTENT_TYPES | PDF_CONTENT_TYPES
+
+# Cache keys for text extracted from non-HTML pages; bump when their extraction changes
+PDF_TEXT_VERSION = "pdf-1"
+PLAIN_TEXT_VERSION = "plain-1"
+
+_SNIFF_BYTES = 1024
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class FetchError(requests.exceptions.RequestException):
+    """A response that was received but is not fetched as a job page."""
+
+
+class ResponseTooLarge(FetchError):
+    pass
+
+
+class UnsupportedContentType(FetchError):
+    pass
+
+
+def parse_cache_control(value: str) -> dict:
+    """Cache-Control directives as {name: value or True}, names lowercased."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if arg else True
+    return directives
+
+
+def _http_date(value: str):
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness_lifetime(headers, now: float, default_ttl: float) -> float:
+    """Seconds a response with these headers may be served from cache without revalidation."""
+    directives = parse_cache_control(headers.get("Cache-Control"))
+    if "no-cache" in directives:
+        return 0.0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return max(0.0, float(max_age))
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("Date")) or now
+    expires = headers.get("Expires")
+    if expires is not None:
+        # An invalid Expires (e.g. "0") means already expired
+        expires_at = _http_date(expires)
+        return max(0.0, expires_at - date) if expires_at else 0.0
+    last_modified = _http_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        return min(default_ttl, max(0.0, 0.1 * (date - last_modified)))
+    return default_ttl
+
+
+@dataclass
+class Page:
+    url: str
+    body: bytes
+    encoding: str
+    content_type: str
+    content_hash: str
+    from_cache: bool = False
+    # Set when the body was decoded while streaming, so it is not decoded again
+    decoded: str = field(default=None, repr=False)
+
+    @property
+    def kind(self) -> str:
+        """"pdf", "text" or "html" (also for pages without a usable Content-Type)."""
+        media_type = _media_type(self.content_type)
+        if media_type in PDF_CONTENT_TYPES or self.body[:5] == b"%PDF-":
+            return "pdf"
+        return "text" if media_type in TEXT_CONTENT_TYPES else "html"
+
+    @property
+    def text(self) -> str:
+        if self.decoded is None:
+            self.decoded = self.body.decode(self.encoding or "utf-8", errors="replace")
+        return self.decoded
+
+
+def _media_type(content_type: str) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def _charset(content_type: str):
+    for param in (content_type or "").split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"\'')
+    return None
+
+
+def _known_encoding(name):
+    try:
+        return codecs.lookup(name).name if name else None
+    except LookupError:
+        return None
+
+
+def sniff_encoding(head: bytes):
+    """Encoding from a byte order mark or a <meta charset> in the first bytes of a page, or None."""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _META_CHARSET_RE.search(head[:_SNIFF_BYTES])
+    return _known_encoding(match.group(1).decode("ascii")) if match else None
+
+
+def check_content_type(content_type: str):
+    """Raises UnsupportedContentType unless the response may hold a job description."""
+    media_type = _media_type(content_type)
+    # Servers without a type, or with a generic binary one, still get a chance: the body is sniffed
+    if media_type and media_type not in ALLOWED_CONTENT_TYPES and media_type != "application/octet-stream":
+        raise UnsupportedContentType(f"unsupported content type {media_type!r}")
+
+
+class BodyReader:
+    """
+    Collects a response body as it streams in: enforces the size limit, hashes the
+    bytes and decodes HTML/text incrementally, so nothing is read or decoded twice.
+    """
+
+    def __init__(self, url: str, content_type: str, max_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+                 content_length=None):
+        check_content_type(content_type)
+        if content_length is not None and int(content_length) > max_bytes:
+            raise ResponseTooLarge(f"response is {content_length} bytes, over the {max_bytes} byte limit")
+        self.url = url
+        self.content_type = content_type or ""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.encoding = _known_encoding(_charset(content_type))
+        self._binary = None  # decided from the first bytes
+        self._chunks = []
+        self._head = b""
+        self._decoder = None
+        self._parts = []
+        self._hash = hashlib.sha256()
+
+    def _start(self, head: bytes):
+        """Decides from the first bytes whether the body is a PDF or text, and how to decode it."""
+        media_type = _media_type(self.content_type)
+        self._binary = media_type in PDF_CONTENT_TYPES or head[:5] == b"%PDF-"
+        if media_type == "application/octet-stream" and not self._binary:
+            raise UnsupportedContentType("unsupported content type 'application/octet-stream'")
+        if not self._binary:
+            self.encoding = self.encoding or sniff_encoding(head) or "utf-8"
+            self._decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+            self._parts.append(self._decoder.decode(head))
+
+    def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise ResponseTooLarge(f"response is over the {self.max_bytes} byte limit")
+        self._chunks.append(chunk)
+        self._hash.update(chunk)
+        if self._binary is None:
+            self._head += chunk
+            if len(self._head) >= _SNIFF_BYTES:
+                self._start(self._head)
+        elif self._decoder is not None:
+            self._parts.append(self._decoder.decode(chunk))
+
+    def page(self) -> Page:
+        if self._binary is None:
+            self._start(self._head)
+        decoded = None
+        if self._decoder is not None:
+            self._parts.append(self._decoder.decode(b"", final=True))
+            decoded = "".join(self._parts)
+        return Page(self.url, b"".join(self._chunks), self.encoding, self.content_type,
+                    self._hash.hexdigest(), decoded=decoded)
+
+
+def text_version(page: Page, extractor_version: str = JOB_TEXT_VERSION) -> str:
+    """The version of the extractor page_text() uses for `page`: PDF, plain text or `extractor_version`."""
+    return {"pdf": PDF_TEXT_VERSION, "text": PLAIN_TEXT_VERSION}.get(page.kind, extractor_version)
+
+
+def page_text(cache, page: Page, extractor=extract_job_text, extractor_version: str = JOB_TEXT_VERSION) -> str:
+    """
+    Extracted text of `page` (the HTML extractor, the PDF text extractor or plain text
+    cleanup, by kind), reused from `cache` (if given) if this page body was extracted before.
+    """
+    kind = page.kind
+    version = text_version(page, extractor_version)
+    text = cache.get_text(page, version) if cache is not None else None
+    if text is None:
+        if kind == "pdf":
+            text = clean_text_lines(extract_text_from_pdf(BufferReader(page.body)))
+        elif kind == "text":
+            text = clean_text_lines(page.text)
+        else:
+            text = extractor(page.text)
+        if cache is not None:
+            cache.put_text(page, version, text)
+    return text
+
+
+@dataclass
+class CachedPage:
+    page: Page
+    etag: str
+    last_modified: str
+    fresh_until: float
+
+    def is_fresh(self, now: float) -> bool:
+        return self.fresh_until > now
+
+    def validators(self) -> dict:
+        """Conditional request headers that revalidate this page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    The on-disk page and extracted-text cache (SQLite), shared by PageFetcher and
+    crawler.AsyncCrawler. Safe to share across threads; access is serialised by a lock.
+    Least recently used pages are evicted once the stored bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, path: str = DEFAULT_HTTP_CACHE_PATH, max_bytes: int = 200 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, body BLOB NOT NULL, encoding TEXT, content_type TEXT,"
+            " etag TEXT, last_modified TEXT, content_hash TEXT NOT NULL, fresh_until REAL NOT NULL,"
+            " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS texts ("
+            " url TEXT NOT NULL, content_hash TEXT NOT NULL, extractor TEXT NOT NULL, text TEXT NOT NULL,"
+            " PRIMARY KEY (url, content_hash, extractor))"
+        )
+
+    def get(self, url: str):
+        """The cached page for `url` with its validators and freshness, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, encoding, content_type, etag, last_modified, content_hash, fresh_until"
+                " FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        body, encoding, content_type, etag, last_modified, content_hash, fresh_until = row
+        return CachedPage(Page(url, body, encoding, content_type, content_hash, from_cache=True),
+                          etag, last_modified, fresh_until)
+
+    def store(self, page: Page, headers, now: float, default_ttl: float):
+        """Stores a fetched page under its response headers' freshness, unless they say no-store."""
+        if "no-store" in parse_cache_control(headers.get("Cache-Control")):
+            return
+        fresh_until = now + freshness_lifetime(headers, now, default_ttl)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, encoding, content_type, etag, last_modified,"
+                " content_hash, fresh_until, size, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (page.url, page.body, page.encoding, page.content_type, headers.get("ETag"),
+                 headers.get("Last-Modified"), page.content_hash, fresh_until, len(page.body), time.time()),
+            )
+            # Text extracted from an older version of the page is no longer needed
+            self._conn.execute("DELETE FROM texts WHERE url = ? AND content_hash != ?", (page.url, page.content_hash))
+            self._evict()
+
+    def revalidated(self, cached: CachedPage, headers, now: float, default_ttl: float):
+        """Records a 304 for `cached`: the stored body is kept, with the new freshness information."""
+        headers = CaseInsensitiveDict(headers)
+        if cached.last_modified:
+            headers.setdefault("Last-Modified", cached.last_modified)
+        self.touch(cached.page.url, now + freshness_lifetime(headers, now, default_ttl))
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", doomed)
+        self._conn.executemany("DELETE FROM texts WHERE url = ?", doomed)
+
+    def touch(self, url: str, fresh_until: float = None):
+        with self._lock:
+            if fresh_until is None:
+                self._conn.execute("UPDATE pages SET accessed = ? WHERE url = ?", (time.time(), url))
+            else:
+                self._conn.execute("UPDATE pages SET accessed = ?, fresh_until = ? WHERE url = ?",
+                                   (time.time(), fresh_until, url))
+
+    def get_text(self, page: Page, extractor_version: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text FROM texts WHERE url = ? AND content_hash = ? AND extractor = ?",
+                (page.url, page.content_hash, extractor_version),
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def put_text(self, page: Page, extractor_version: str, text: str):
+        with self._lock:
+            # Only kept alongside a cached page, so it is evicted with it
+            self._conn.execute(
+                "INSERT OR REPLACE INTO texts (url, content_hash, extractor, text)"
+                " SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM pages WHERE url = ? AND content_hash = ?)",
+                (page.url, page.content_hash, extractor_version, text, page.url, page.content_hash),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM texts")
+
+
+class PageFetcher:
+    """
+    Fetches pages through a pooled session and the on-disk HTTP cache. Safe to share
+    across threads.
+    """
+
+    def __init__(self, cache_path: str = DEFAULT_HTTP_CACHE_PATH, timeout: float = 30,
+                 user_agent: str = DEFAULT_USER_AGENT, default_ttl: float = 3600,
+                 pool_maxsize: int = 16, max_bytes: int = 200 * 1024 * 1024,
+                 extractor=extract_job_text, extractor_version: str = JOB_TEXT_VERSION,
+                 cache: HTTPCache = None, max_response_bytes: int = DEFAULT_MAX_RESPONSE_BYTES,
+                 snapshots=None, offline: bool = False):
+        if offline and snapshots is None:
+            raise ValueError("offline mode serves pages from snapshots; pass a snapshots.SnapshotStore")
+        self.timeout = timeout
+        self.snapshots = snapshots
+        self.offline = offline
+        self.max_response_bytes = max_response_bytes
+        self.default_ttl = default_ttl
+        self.extractor = extractor
+        self.extractor_version = extractor_version
+        self.cache = cache if cache is not None else HTTPCache(cache_path, max_bytes)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> Page:
+        """
+        Returns the page at `url`, from the cache when it is fresh or revalidates.
+        Raises requests.exceptions.RequestException on network errors and 4xx/5xx responses,
+        and its FetchError subclasses for bodies over `max_response_bytes` or of a content
+        type that cannot hold a job description.
+        """
+        now = time.time()
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.is_fresh(now):
+                self.cache.touch(url)
+                return cached.page
+            headers = cached.validators()
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                # Unchanged: keep the stored body, take the new freshness information
+                self.cache.revalidated(cached, response.headers, now, self.default_ttl)
+                return cached.page
+            response.raise_for_status()  # Raise an HTTPError for bad responses (4xx or 5xx)
+
+            reader = BodyReader(url, response.headers.get("Content-Type", ""), self.max_response_bytes,
+                                response.headers.get("Content-Length"))
+            for chunk in response.iter_content(64 * 1024):
+                reader.feed(chunk)
+            page = reader.page()
+        self.cache.store(page, response.headers, now, self.default_ttl)
+        return page
+
+    def extract(self, page: Page) -> str:
+        """Extracted text of `page`, reused from the cache if this page body was extracted before."""
+        return page_text(self.cache, page, self.extractor, self.extractor_version)
+
+    def fetch_text(self, url: str) -> str:
+        """
+        Fetches `url` and returns its extracted text, reusing the text if the page is unchanged,
+        and snapshots the page. Offline, the text comes from the latest snapshot instead.
+        """
+        if self.offline:
+            return self.snapshots.text(url, self.extractor, self.extractor_version)
+        page = self.fetch(url)
+        text = self.extract(page)
+        if self.snapshots is not None:
+            self.snapshots.record(page, text, self.extractor_version)
+        return text
+
+    def clear(self):
+        self.cache.clear()
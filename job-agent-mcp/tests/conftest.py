@@ -0,0 +1,7 @@
+# tests/conftest.py
+# Tests import the shared package as `modules`, as the apps and benchmarks do; run from job-agent-mcp/:
+#     python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
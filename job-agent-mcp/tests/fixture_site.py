@@ -0,0 +1,84 @@
+# tests/fixture_site.py
+"""
+Local job site for crawler tests and benchmarks: an HTTP server on its own
+localhost port serving saved job pages with a delay, a robots.txt, a redirect
+loop, a redirect chain, an oversized page and a disallowed path. The server
+counts requests per path, the most /jobs/ requests it had in flight at once,
+and when each /jobs/ request arrived, so tests can check what the crawler
+actually sent.
+"""
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROBOTS_TXT = b"User-agent: *\nDisallow: /private/\n"
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handler):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = threading.Lock()
+        self.hits = Counter()  # path -> requests
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.job_request_times = []  # time.monotonic() as each /jobs/ request arrived
+
+    def handle_error(self, request, client_address):
+        pass  # clients dropping oversized or abandoned responses
+
+
+def start_fixture_site(pages, delays, oversize_bytes, robots_txt=ROBOTS_TXT):
+    """Serves /jobs/<n> (pages[n] after delays[n] seconds) and the edge cases; returns (server, base URL)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body=b"", headers=()):
+            self.send_response(status)
+            for name, value in headers:
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _serve_job(self, n):
+            server = self.server
+            with server.lock:
+                server.job_request_times.append(time.monotonic())
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            try:
+                time.sleep(delays[n])
+            finally:
+                with server.lock:
+                    server.in_flight -= 1
+            self._send(200, pages[n].encode("utf-8"), [("Content-Type", "text/html; charset=utf-8")])
+
+        def do_GET(self):
+            with self.server.lock:
+                self.server.hits[self.path] += 1
+            if self.path == "/robots.txt":
+                self._send(200, robots_txt, [("Content-Type", "text/plain")])
+            elif self.path.startswith("/jobs/"):
+                self._serve_job(int(self.path.rsplit("/", 1)[-1]))
+            elif self.path.startswith("/loop/"):
+                n = int(self.path.rsplit("/", 1)[-1])
+                self._send(302, headers=[("Location", f"/loop/{n + 1}")])
+            elif self.path.startswith("/hops/"):
+                # /hops/<k> reaches /jobs/0 after k redirects
+                k = int(self.path.rsplit("/", 1)[-1])
+                self._send(302, headers=[("Location", f"/hops/{k - 1}" if k > 1 else "/jobs/0")])
+            elif self.path == "/huge":
+                self._send(200, b"<p>x</p>" * (oversize_bytes // 8 + 1), [("Content-Type", "text/html")])
+            else:
+                self._send(404)
+
+    server = FixtureServer(Handler)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
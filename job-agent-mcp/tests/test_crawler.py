@@ -0,0 +1,85 @@
+# tests/test_crawler.py
+import asyncio
+
+import pytest
+
+from modules.crawler import AsyncCrawler
+from modules.web_fetch import HTTPCache
+from tests.fixture_site import start_fixture_site
+
+PAGES = [f"<html><body>\n<h1>Job {n}</h1>\n<p>Python and SQL, posting {n}.</p>\n</body></html>" for n in range(12)]
+
+
+@pytest.fixture
+def site(request):
+    """A fixture site; tests pass (delay seconds, robots.txt) through indirect parametrisation."""
+    delay, robots_txt = getattr(request, "param", (0.0, None))
+    kwargs = {"robots_txt": robots_txt} if robots_txt is not None else {}
+    server, base_url = start_fixture_site(PAGES, [delay] * len(PAGES), oversize_bytes=64 * 1024, **kwargs)
+    yield server, base_url
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(urls, **kwargs):
+    crawler = AsyncCrawler(cache=HTTPCache(":memory:"), **kwargs)
+    return asyncio.run(crawler.fetch_all(urls))
+
+
+def test_fetches_pages_in_input_order(site):
+    server, base_url = site
+    results = crawl([f"{base_url}/jobs/{n}" for n in (2, 0, 1)])
+    assert [result.ok for result in results] == [True, True, True]
+    assert [result.text.splitlines()[0] for result in results] == ["Job 2", "Job 0", "Job 1"]
+
+
+def test_robots_disallowed_url_is_not_requested(site):
+    server, base_url = site
+    allowed, disallowed = crawl([f"{base_url}/jobs/0", f"{base_url}/private/jobs/0"])
+    assert allowed.ok
+    assert disallowed.error == "disallowed by robots.txt"
+    assert server.hits["/robots.txt"] == 1
+    assert not any(path.startswith("/private/") for path in server.hits)
+
+
+def test_redirect_loop_is_capped(site):
+    server, base_url = site
+    loop, three, four = crawl([f"{base_url}/loop/0", f"{base_url}/hops/3", f"{base_url}/hops/4"], max_redirects=3)
+    assert loop.error == "more than 3 redirects"
+    # The first request and three redirects; the fourth redirect is not followed
+    assert sum(hits for path, hits in server.hits.items() if path.startswith("/loop/")) == 4
+    assert three.ok and three.final_url == f"{base_url}/jobs/0"
+    assert four.error == "more than 3 redirects"
+
+
+def test_oversized_page_is_abandoned(site):
+    server, base_url = site
+    huge, small = crawl([f"{base_url}/huge", f"{base_url}/jobs/0"], max_bytes=32 * 1024)
+    assert not huge.ok and "32768 byte limit" in huge.error
+    assert huge.text == ""
+    assert small.ok
+
+
+@pytest.mark.parametrize("site", [(0.2, None)], indirect=True)
+def test_per_host_concurrency_is_limited(site):
+    server, base_url = site
+    results = crawl([f"{base_url}/jobs/{n}" for n in range(len(PAGES))], per_host_limit=4)
+    assert all(result.ok for result in results)
+    assert server.max_in_flight == 4
+
+
+@pytest.mark.parametrize("site", [(0.0, b"User-agent: *\nCrawl-delay: 1\n")], indirect=True)
+def test_crawl_delay_spaces_requests_to_a_host(site):
+    server, base_url = site
+    results = crawl([f"{base_url}/jobs/{n}" for n in range(3)], per_host_limit=4)
+    assert all(result.ok for result in results)
+    starts = server.job_request_times
+    assert len(starts) == 3
+    assert all(later - earlier >= 0.95 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_politeness_delay_applies_without_crawl_delay_and_is_capped(site):
+    server, base_url = site
+    crawl([f"{base_url}/jobs/{n}" for n in range(3)], politeness_delay=5.0, max_delay=0.3)
+    starts = server.job_request_times
+    assert all(0.25 <= later - earlier < 1.0 for earlier, later in zip(starts, starts[1:]))
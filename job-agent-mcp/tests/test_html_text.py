@@ -0,0 +1,70 @@
+# tests/test_html_text.py
+from pathlib import Path
+
+import pytest
+
+from modules import html_text
+from modules.html_text import html_to_text, html_to_text_fast
+
+PAGES = sorted((Path(__file__).parent / "pages").glob("*.html"))
+
+EDGE_CASES = {
+    "inline tags": "<p>Build <b>data</b> <i>pipelines</i> in <a href='#'>Python</a>, <code>SQL</code>and<span>Go</span>.</p>",
+    "entities": "<p>R&amp;D &lt;team&gt; &nbsp;caf&eacute; &#8211; &#x2014; &quot;quoted&quot; &#39;s &copy; AT&T</p>",
+    "br": "<div>Line one<br>Line two<br/>Line three<br><br>after blank</div>",
+    "nbsp runs": "<p>a&nbsp;&nbsp;&nbsp;b</p>",
+    "double-space phrases": "<p>Python   SQL  Go</p>",
+    "block tags": "<ul><li>Python</li><li>SQL <em>and</em> dbt</li></ul><table><tr><td>$5,000</td></tr></table>",
+    "pre": "<pre>  indented\n    code  block\n</pre><p>after   pre</p>",
+    "comments and scripts": "<p>visible<!-- hidden --> text</p><script>var x = '<p>no</p>';</script><style>p{}</style>",
+    "unclosed tags": "<p>one<p>two<li>three<div>four",
+    "whitespace only": "<div>   </div><p>\n\n</p>",
+    "text only": "just text & more",
+    "crlf": "<p>a\r\nb</p>\r\n<p>c</p>",
+}
+
+
+def _parity(html):
+    return html_to_text_fast(html, drop_tags=("script", "style"))
+
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def parser(request, monkeypatch):
+    if request.param == "lxml":
+        if html_text.etree is None:
+            pytest.skip("lxml is not installed")
+    else:
+        monkeypatch.setattr(html_text, "etree", None)
+    return request.param
+
+
+@pytest.mark.parametrize("page", PAGES, ids=lambda page: page.name)
+def test_fast_matches_reference_on_saved_pages(page, parser):
+    html = page.read_text(encoding="utf-8")
+    assert _parity(html) == html_to_text(html)
+
+
+@pytest.mark.parametrize("html", EDGE_CASES.values(), ids=EDGE_CASES.keys())
+def test_fast_matches_reference_on_edge_cases(html, parser):
+    assert _parity(html) == html_to_text(html)
+
+
+def test_inline_tags_entities_and_br():
+    assert html_to_text_fast(EDGE_CASES["inline tags"]) == "Build data pipelines in Python, SQLandGo."
+    assert html_to_text_fast(EDGE_CASES["entities"]) == "R&D <team> \xa0café – — \"quoted\" 's © AT&T"
+    # <br> adds no newline of its own, as with BeautifulSoup's get_text()
+    assert html_to_text_fast(EDGE_CASES["br"]) == "Line oneLine twoLine threeafter blank"
+
+
+def test_default_drops_page_chrome():
+    html = (Path(__file__).parent / "pages" / "job_board_listing.html").read_text(encoding="utf-8")
+    reference, text = html_to_text(html), html_to_text_fast(html)
+    assert "Senior Data Engineer" in text and "5+ years with Python and SQL" in text
+    # nav and footer text is dropped by default; the reference keeps it
+    for chrome in ("Find jobs", "All rights reserved"):
+        assert chrome in reference and chrome not in text
+    assert "dataLayer" not in reference and "dataLayer" not in text
+
+
+def test_empty_page():
+    assert html_to_text_fast("") == html_to_text("") == ""
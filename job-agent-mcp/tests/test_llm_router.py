@@ -0,0 +1,137 @@
+# tests/test_llm_router.py
+import asyncio
+import time
+
+import pytest
+
+from modules.llm_client import FakeProvider, FakeProviderError
+from modules.llm_router import STREAM_RESTART, ProviderRouter, ProviderStats, is_json_response
+
+REPORT = '{"overall_fit_summary": "ok", "matched_skills": ["Python"], "missing_skills": []}'
+
+
+def router(*providers, **kwargs):
+    kwargs.setdefault("validator", is_json_response)
+    kwargs.setdefault("prior_latency", 0.05)
+    kwargs.setdefault("min_hedge_delay", 0.01)
+    return ProviderRouter(list(providers), **kwargs)
+
+
+async def pending_tasks():
+    await asyncio.sleep(0)
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_hedge_wins_over_a_slow_primary_and_cancels_it():
+    slow = FakeProvider("slow", text=REPORT, latency=1.0)
+    fast = FakeProvider("fast", text=REPORT, latency=0.02)
+    client = router(slow, fast)
+
+    async def run():
+        start = time.monotonic()
+        response = await client.generate("prompt", json_mode=True)
+        return response, time.monotonic() - start, await pending_tasks()
+
+    response, elapsed, leftover = asyncio.run(run())
+    assert response.provider == "fast"
+    assert elapsed < 0.5
+    assert (slow.calls, fast.calls) == (1, 1)
+    assert leftover == []
+    # The cancelled primary is a censored sample: no error, no success latency, but a latency floor
+    assert len(client.stats["slow"]) == 0
+    assert client.stats["slow"].error_rate() == 0.0
+    assert client.stats["slow"].censored_floor() > 0.0
+    assert len(client.stats["fast"]) == 1
+
+
+def test_no_hedge_without_hedging():
+    slow = FakeProvider("slow", text=REPORT, latency=0.2)
+    fast = FakeProvider("fast", text=REPORT, latency=0.01)
+    response = asyncio.run(router(slow, fast, hedge=False).generate("prompt"))
+    assert response.provider == "slow"
+    assert fast.calls == 0
+
+
+def test_invalid_response_falls_back_to_next_provider():
+    broken = FakeProvider("broken", text="Sorry, I cannot help with that.")
+    good = FakeProvider("good", text=REPORT)
+    client = router(broken, good, hedge=False)
+    response = asyncio.run(client.generate("prompt", json_mode=True))
+    assert response.provider == "good"
+    assert client.stats["broken"].error_rate() == 1.0
+    # The failing provider now ranks last
+    assert client.ranked()[0] is good
+
+
+def test_failed_call_falls_back_and_last_error_is_raised():
+    failing = FakeProvider("failing", text=REPORT, error_rate=1.0)
+    good = FakeProvider("good", text=REPORT)
+    assert asyncio.run(router(failing, good, hedge=False).generate("prompt")).provider == "good"
+
+    also_failing = FakeProvider("also_failing", text=REPORT, error_rate=1.0)
+    with pytest.raises(FakeProviderError):
+        asyncio.run(router(failing, also_failing, hedge=False).generate("prompt"))
+
+
+def test_censored_samples_only_raise_the_latency_estimate():
+    stats = ProviderStats()
+    for latency in (0.1, 0.1, 0.2):
+        stats.record(latency, True)
+    stats.record(1.0, False)
+    stats.record_censored(3.0)
+    assert len(stats) == 4
+    assert stats.error_rate() == 0.25
+    assert stats.p95() == 0.2
+    assert stats.censored_floor() == 3.0
+
+    provider = FakeProvider("p")
+    client = router(provider, min_samples=1)
+    client.stats["p"] = stats
+    assert client._latency_estimate(provider) == 3.0
+
+
+def test_stream_hedges_on_first_chunk():
+    slow = FakeProvider("slow", text=REPORT, latency=1.0)
+    fast = FakeProvider("fast", text=REPORT, latency=0.02)
+    client = router(slow, fast)
+
+    async def run():
+        start = time.monotonic()
+        chunks = await collect(client.stream("prompt", json_mode=True))
+        return chunks, time.monotonic() - start, await pending_tasks()
+
+    chunks, elapsed, leftover = asyncio.run(run())
+    assert "".join(chunks) == REPORT
+    assert STREAM_RESTART not in chunks
+    assert elapsed < 0.5
+    assert leftover == []
+    assert client.first_chunk_stats["slow"].censored_floor() > 0.0
+    assert len(client.stats["fast"]) == 1 and client.stats["fast"].error_rate() == 0.0
+
+
+def test_stream_restarts_on_next_provider_when_output_is_invalid():
+    broken = FakeProvider("broken", text="I'm sorry, I can only answer in plain text here.")
+    good = FakeProvider("good", text=REPORT)
+    client = router(broken, good, hedge=False)
+    chunks = asyncio.run(collect(client.stream("prompt", json_mode=True)))
+    restart = next(i for i, chunk in enumerate(chunks) if chunk is STREAM_RESTART)
+    assert "".join(chunks[:restart]) == broken.text
+    assert "".join(chunks[restart + 1:]) == REPORT
+    assert client.stats["broken"].error_rate() == 1.0
+
+
+def test_stream_without_validator_is_passed_through():
+    plain = FakeProvider("plain", text="not json at all, and that is fine")
+    chunks = asyncio.run(collect(router(plain, validator=None).stream("prompt")))
+    assert "".join(chunks) == plain.text
+
+
+def test_stream_raises_when_every_provider_fails():
+    first = FakeProvider("first", text=REPORT, error_rate=1.0)
+    second = FakeProvider("second", text=REPORT, error_rate=1.0)
+    with pytest.raises(FakeProviderError):
+        asyncio.run(collect(router(first, second, hedge=False).stream("prompt")))
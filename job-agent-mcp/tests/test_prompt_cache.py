@@ -0,0 +1,62 @@
+# tests/test_prompt_cache.py
+import asyncio
+
+from modules.llm_client import ContextCacheTracker, FakeProvider
+from modules.resume_sections import resume_hash
+
+SYSTEM = "You are an expert HR analyst."
+
+
+async def analyse(provider, tracker, resume, job):
+    return await provider.generate(f"Job: {job}", system=SYSTEM, prefix=tracker.track(f"Resume: {resume}"))
+
+
+def test_repeated_resume_prefix_is_served_from_cache():
+    provider, tracker = FakeProvider("gemini"), ContextCacheTracker(SYSTEM)
+
+    async def run():
+        await tracker.release(resume_hash("resume A"), [provider])
+        return [await analyse(provider, tracker, "resume A", job) for job in ("job 1", "job 2", "job 3")]
+
+    first, second, third = asyncio.run(run())
+    assert provider.prefix_hits == 2
+    assert first.cached_tokens == 0
+    assert second.cached_tokens > 0 and third.cached_tokens == second.cached_tokens
+
+
+def test_changed_resume_deletes_the_previous_prefix():
+    provider, tracker = FakeProvider("gemini"), ContextCacheTracker(SYSTEM)
+
+    async def run():
+        assert await tracker.release(resume_hash("resume A"), [provider]) == 0
+        await analyse(provider, tracker, "resume A", "job 1")
+        # Same resume again: nothing to release
+        assert await tracker.release(resume_hash("resume A"), [provider]) == 0
+        await analyse(provider, tracker, "resume A", "job 2")
+        assert provider.prefix_hits == 1
+
+        assert await tracker.release(resume_hash("resume B"), [provider]) == 1
+        assert provider.prefix_deletions == 1
+        await analyse(provider, tracker, "resume B", "job 1")
+        # Resume A's cached prefix is gone: analysing it again is a miss
+        await tracker.release(resume_hash("resume A"), [provider])
+        response = await analyse(provider, tracker, "resume A", "job 1")
+        assert response.cached_tokens == 0
+        assert provider.prefix_deletions == 2
+
+    asyncio.run(run())
+
+
+def test_release_skips_providers_without_context_caches():
+    class NoCaches:
+        pass
+
+    tracker = ContextCacheTracker(SYSTEM)
+    tracker.track("Resume: A")
+
+    async def run():
+        await tracker.release("a", [NoCaches()])
+        return await tracker.release("b", [NoCaches()])
+
+    assert asyncio.run(run()) == 1
+    assert tracker.keys == set()
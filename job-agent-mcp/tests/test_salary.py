@@ -0,0 +1,45 @@
+# tests/test_salary.py
+import math
+
+import pytest
+
+from modules.salary import parse_salaries, parse_salary
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$120k–$150k", (120_000, 150_000)),
+    ("120-150k", (120_000, 150_000)),
+    ("S$5,000 - S$7,000 per month", (60_000, 84_000)),
+    ("SGD 4,500 to 6,000 monthly", (54_000, 72_000)),
+    ("From SGD 4,500 per month, 5 days work week", (54_000, 54_000)),
+    ("$100k plus 401k match", (100_000, 100_000)),
+    ("85000", (85_000, 85_000)),
+    ("Negotiable", (None, None)),
+])
+def test_parses_sgd_salaries(text, expected):
+    assert parse_salary(text, "SGD", base="SGD") == expected
+
+
+def test_numbers_without_a_currency_or_period_are_not_a_range():
+    assert parse_salary("3-5 years experience, $6,000/month", "SGD", base="SGD") == (72_000, 72_000)
+    assert parse_salary("3-5 years experience", "SGD", base="SGD") == (None, None)
+    assert parse_salary("Salary: 8000 - 10000", "SGD", base="SGD") == (None, None)
+
+
+def test_dot_before_three_digits_separates_thousands():
+    assert parse_salary("EUR 60.000 - 70.000", base="EUR") == (60_000, 70_000)
+    assert parse_salary("60.000 € p.a.", base="EUR") == (60_000, 60_000)
+    assert parse_salary("$45.50/hr", "USD", base="USD") == (45.5 * 2080, 45.5 * 2080)
+
+
+def test_up_to_has_no_minimum():
+    assert parse_salary("Up to $150,000", "SGD", base="SGD") == (None, 150_000)
+    assert parse_salary("Up to $150,000 + 10% bonus", "SGD", base="SGD") == (None, 150_000)
+    assert parse_salary("Max. S$7,000/month", base="SGD") == (None, 84_000)
+
+
+def test_parse_salaries_keeps_a_known_maximum_without_a_minimum():
+    salary_min, salary_max = parse_salaries(["Up to $150,000", "Negotiable", "SGD 8,000/month"], "SGD", base="SGD")
+    assert math.isnan(salary_min[0]) and salary_max[0] == 150_000
+    assert math.isnan(salary_min[1]) and math.isnan(salary_max[1])
+    assert (salary_min[2], salary_max[2]) == (96_000, 96_000)
@@ -0,0 +1,32 @@
+# tests/test_skill_matcher.py
+from modules.document import Document, SkillVocabulary
+from modules.skill_matcher import DEFAULT_VOCABULARY, match_skills
+
+
+def test_capitalised_common_word_skills_are_required():
+    report = match_skills("Skills\nPython, TypeScript", "5+ years with React and TypeScript / Spark or Kafka / Swift")
+    assert set(report.required_job_skills) == {"React", "TypeScript", "Spark", "Kafka", "Swift"}
+    assert report.matched_skills == ["TypeScript"]
+    assert set(report.missing_skills) == {"React", "Spark", "Kafka", "Swift"}
+
+
+def test_common_words_in_prose_are_not_skills():
+    resume = "I excel at swift delivery, react quickly to incidents and bring a spark of energy to security reviews."
+    assert match_skills(resume, "Python").candidate_skills == []
+
+
+def test_aliases_match_in_any_case():
+    report = match_skills("Built dashboards in advanced excel and reactjs", "Excel and React developer")
+    assert report.matched_skills == ["React", "Excel"]
+
+
+def test_cased_names_still_resolve_by_id():
+    assert DEFAULT_VOCABULARY.id_for("react") == DEFAULT_VOCABULARY.id_for("React") is not None
+
+
+def test_skill_ids_are_memoised_per_vocabulary():
+    document = Document("Rust and Go services")
+    first, second = SkillVocabulary(["Go"]), SkillVocabulary(["Rust"])
+    assert [first.name(i) for i in document.skill_ids(first)] == ["Go"]
+    assert [second.name(i) for i in document.skill_ids(second)] == ["Rust"]
+    assert document.skill_ids(first) is document.skill_ids(first)
@@ -5,6 +5,7 @@ from dotenv import load_dotenv
 from modules.job_api import fetch_live_jobs
 from modules.embeddings import rank_jobs_by_query
 from modules.skill_gap import analyze_skill_gap
+from modules.document import Document
 
 # Gemini SDK
 import google.generativeai as genai
@@ -18,12 +19,14 @@ async def run_agent(query: str, resume_text: str = None):
     jobs = await asyncio.to_thread(fetch_live_jobs)
 
     # Step 2: Rank jobs by relevance to query
-    ranked_jobs = await asyncio.to_thread(rank_jobs_by_query, query, jobs)
+    # Query and resume are normalised/tokenised once and shared by every stage
+    query_doc = Document(query)
+    ranked_jobs = await asyncio.to_thread(rank_jobs_by_query, query_doc, jobs)
 
     # Step 3: Analyze skill gaps if resume is provided
     gaps = None
     if resume_text:
-        gaps = await asyncio.to_thread(analyze_skill_gap, resume_text, ranked_jobs)
+        gaps = await asyncio.to_thread(analyze_skill_gap, Document(resume_text), ranked_jobs)
 
     # Step 4: Construct prompt
     prompt = f"Query: {query}\nTop Jobs: {ranked_jobs[:5]}"
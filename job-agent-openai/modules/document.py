@@ -0,0 +1,82 @@
+# modules/document.py
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def normalize(text):
+    """
+    Lowercases text and collapses runs of whitespace.
+    """
+    return " ".join(text.lower().split())
+
+
+def tokenize(normalized_text):
+    return _TOKEN_RE.findall(normalized_text)
+
+
+class Document:
+    """
+    A resume, job title or query whose normalised text and tokens are computed on
+    first use and then reused by every stage it is passed to.
+    """
+    __slots__ = ("raw", "_normalized", "_tokens", "_token_set")
+
+    def __init__(self, raw):
+        self.raw = raw or ""
+        self._normalized = None
+        self._tokens = None
+        self._token_set = None
+
+    @property
+    def normalized(self):
+        if self._normalized is None:
+            self._normalized = normalize(self.raw)
+        return self._normalized
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = tuple(tokenize(self.normalized))
+        return self._tokens
+
+    @property
+    def token_set(self):
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    def contains(self, phrase):
+        """
+        Case-insensitive phrase check on token boundaries: token membership for
+        single words, a contiguous token sequence otherwise ("Java" is not found
+        in "JavaScript", nor "SQL" in "NoSQL").
+        """
+        phrase_tokens = tokenize(normalize(phrase))
+        if not phrase_tokens:
+            return False
+        first = phrase_tokens[0]
+        if first not in self.token_set:
+            return False
+        if len(phrase_tokens) == 1:
+            return True
+        tokens, n = self.tokens, len(phrase_tokens)
+        return any(tokens[i] == first and list(tokens[i:i + n]) == phrase_tokens
+                   for i in range(len(tokens) - n + 1))
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        preview = self.raw[:40].replace("\n", " ")
+        return f"Document({preview!r}{'...' if len(self.raw) > 40 else ''})"
+
+
+def as_document(text):
+    """
+    Wraps text in a Document, passing existing Documents through unchanged.
+    """
+    return text if isinstance(text, Document) else Document(text)
@@ -1,5 +1,9 @@
 # modules/embeddings.py
+from .document import as_document
+
 def rank_jobs_by_query(query, jobs):
     # Example simple ranking: jobs containing query word first
-    ranked = sorted(jobs, key=lambda j: query.lower() in j["title"].lower(), reverse=True)
-    return ranked
\ No newline at end of file
+    query = as_document(query).normalized
+    titles = [as_document(j["title"]) for j in jobs]  # one Document per job, reusable by later checks
+    order = sorted(range(len(jobs)), key=lambda i: query in titles[i].normalized, reverse=True)
+    return [jobs[i] for i in order]
\ No newline at end of file
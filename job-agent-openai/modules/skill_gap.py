@@ -1,9 +1,12 @@
 # modules/skill_gap.py
+from .document import as_document
+
 def analyze_skill_gap(resume_text, jobs):
     # Simple comparison: list skills missing in resume
-    resume_skills = set(resume_text.lower().split())
+    # Accepts text or a Document, so a resume shared between stages is tokenised once
+    resume = as_document(resume_text)
     gaps = {}
     for job in jobs:
-        missing = [skill for skill in job["skills"] if skill.lower() not in resume_skills]
+        missing = [skill for skill in job["skills"] if not resume.contains(skill)]
         gaps[job["title"]] = missing
     return gaps
\ No newline at end of file